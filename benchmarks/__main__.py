@@ -0,0 +1,82 @@
+"""
+    run benchmark suite
+        python -m benchmarks                          # print results
+        python -m benchmarks --save baseline.json     # store baseline
+        python -m benchmarks --compare baseline.json  # fail on regressions
+"""
+import argparse
+import json
+import platform
+import sys
+from typing import Any, Dict
+
+from .suite import CASES, SCALING, measure, slope
+
+SIZES = (1000, 10000, 100000)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-k', '--filter', default='', help='run only cases containing this substring')
+    parser.add_argument('--save', metavar='FILE', help='store results as JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare results with JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.3, help='allowed slowdown ratio (default 1.3)')
+    parser.add_argument('--max-slope', type=float, default=1.2, help='allowed scaling exponent (default 1.2)')
+    parser.add_argument('--no-scaling', action='store_true', help='skip scaling checks')
+    args = parser.parse_args()
+
+    baseline = {}  # type: Dict[str, Any]
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    failed = False
+    results = {}  # type: Dict[str, Any]
+    print('%-36s %12s %12s %9s' % ('case', 'time', 'peak', 'ratio'))
+    for name, factory in CASES.items():
+        if args.filter not in name:
+            continue
+        result = measure(factory())
+        results[name] = result._asdict()
+        ratio = ''
+        if name in baseline:
+            value = result.time / baseline[name]['time']
+            ratio = '%.2fx' % value
+            if value > args.threshold:
+                ratio += ' !'
+                failed = True
+        print('%-36s %9.1f us %10d B %9s' % (name, result.time * 1e6, result.peak, ratio))
+
+    if not args.no_scaling:
+        print()
+        print('%-36s %12s' % ('scaling', 'exponent'))
+        for name, factory in SCALING.items():
+            if args.filter not in name:
+                continue
+            value = slope(factory, SIZES)
+            mark = ''
+            if value > args.max_slope:
+                mark = ' ! not linear'
+                failed = True
+            print('%-36s %12.2f%s' % (name, value, mark))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'results': results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+    if failed:
+        print('\nregressions found', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
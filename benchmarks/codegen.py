@@ -0,0 +1,37 @@
+"""
+    compares recursive check_type, closure checkers and generated source
+    run: python -m benchmarks.codegen
+"""
+from timeit import repeat
+from typing import Any, Callable
+
+from rtc import compile, compile_codegen
+from rtc.is_type import check_type
+
+from .schemas import Response, response
+
+
+def best(func: Callable[[], Any], number: int) -> float:
+    return min(repeat(func, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    closure = compile(Response).test
+    codegen = compile_codegen(Response).test
+    print('%8s %14s %14s %14s %8s' % ('items', 'check_type', 'closure', 'codegen', 'speedup'))
+    for size in (1, 10, 100, 1000):
+        payload = response(size)
+        number = max(10, 10000 // size)
+        assert check_type(payload, Response)[0] and closure(payload) and codegen(payload)
+        interp = best(lambda: check_type(payload, Response), number)
+        compiled = best(lambda: closure(payload), number)
+        generated = best(lambda: codegen(payload), number)
+        print(
+            '%8d %11.1f us %11.1f us %11.1f us %7.1fx' % (
+                size, interp * 1e6, compiled * 1e6, generated * 1e6, interp / generated,
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+from typing import List, Dict, Optional, Union, TypedDict
+
+
+class TextData(TypedDict):
+    text: Optional[str]
+
+
+class WeatherData(TypedDict):
+    time: int
+    loaction: Dict[str, float]
+    exrta: Optional[str]
+
+
+class Object(TypedDict):
+    object_id: str
+    data: Union[TextData, WeatherData]
+
+
+class Action(TypedDict, total=False):
+    action_id: str
+    title: str
+    color: Optional[str]
+    handable: bool
+
+
+class Session(TypedDict, total=False):
+    session_id: str
+    message_id: int
+    time_zone: Optional[str]
+
+
+class Response(TypedDict):
+    objects: List[Object]
+    actions: List[Action]
+    session: Session
+
+
+def response(size: int) -> Response:
+    return {
+        'objects': [
+            {'object_id': 'text-%d' % i, 'data': {'text': None if i % 2 else 'some text'}}
+            if i % 3 else
+            {'object_id': 'weather-%d' % i, 'data': {'time': i, 'loaction': {'lat': 1.0, 'lon': 2.0}, 'exrta': None}}
+            for i in range(size)
+        ],
+        'actions': [
+            {'action_id': 'action-%d' % i, 'title': 'ok', 'color': None, 'handable': True}
+            for i in range(size)
+        ],
+        'session': {'session_id': '-some-id-', 'message_id': 0},
+    }
@@ -0,0 +1,56 @@
+"""
+    compares construction time and memory of plain class and staticclass
+    run: python -m benchmarks.staticclass
+"""
+import tracemalloc
+from timeit import repeat
+from typing import Any, Callable, List, Optional
+
+from rtc import staticclass
+
+COUNT = 10000
+
+
+class Plain:
+
+    def __init__(self, a: int, b: str, c: Optional[List[int]], d: float = 0.0) -> None:
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+
+
+@staticclass
+class Static:
+    a: int
+    b: str
+    c: Optional[List[int]]
+    d: float = 0.0
+
+
+@staticclass(slots=True)
+class Slotted:
+    a: int
+    b: str
+    c: Optional[List[int]]
+    d: float = 0.0
+
+
+def memory(cls: Callable[..., Any]) -> float:
+    tracemalloc.start()
+    objects = [cls(1, 'b', [1, 2], 1.5) for _ in range(COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / COUNT
+
+
+def main() -> None:
+    print('%10s %14s %14s' % ('class', 'construct', 'memory'))
+    for cls in (Plain, Static, Slotted):
+        timing = min(repeat(lambda: cls(1, 'b', [1, 2], 1.5), number=COUNT, repeat=5)) / COUNT
+        print('%10s %11.2f us %8.0f B/obj' % (cls.__name__, timing * 1e6, memory(cls)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+    benchmark cases for is_type, is_subtype and staticclass
+"""
+import math
+import tracemalloc
+from timeit import Timer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from rtc import is_subtype, is_type, staticclass
+from rtc.is_type import check_type
+
+from .schemas import Action, Response, response
+
+Bench = Callable[[], Any]
+
+
+class Result(NamedTuple):
+    time: float
+    peak: int
+
+
+CASES = {}  # type: Dict[str, Callable[[], Bench]]
+SCALING = {}  # type: Dict[str, Callable[[int], Bench]]
+
+
+def case(name: str) -> Callable[[Callable[[], Bench]], Callable[[], Bench]]:
+    def register(factory: Callable[[], Bench]) -> Callable[[], Bench]:
+        CASES[name] = factory
+        return factory
+    return register
+
+
+def scaling(name: str) -> Callable[[Callable[[int], Bench]], Callable[[int], Bench]]:
+    def register(factory: Callable[[int], Bench]) -> Callable[[int], Bench]:
+        SCALING[name] = factory
+        return factory
+    return register
+
+
+def measure(bench: Bench, min_time: float = 0.2) -> Result:
+    """
+        best time of one call (timeit autorange, 5 repeats)
+        and peak memory allocated by one call (tracemalloc)
+    """
+    timer = Timer(bench)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    tracemalloc.start()
+    bench()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(best, peak)
+
+
+def slope(factory: Callable[[int], Bench], sizes: Tuple[int, ...]) -> float:
+    """
+        exponent k of time ~ size ** k fitted by least squares on log-log scale,
+        1.0 means linear growth
+    """
+    points = [(math.log(size), math.log(measure(factory(size), 0.05).time)) for size in sizes]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return (
+        sum((x - mean_x) * (y - mean_y) for x, y in points)
+        / sum((x - mean_x) ** 2 for x, _ in points)
+    )
+
+
+@case('typeddict.response.10')
+def response_10() -> Bench:
+    payload = response(10)
+    return lambda: is_type(payload, Response)
+
+
+@case('typeddict.response.1000')
+def response_1000() -> Bench:
+    payload = response(1000)
+    return lambda: is_type(payload, Response)
+
+
+@case('typeddict.response.1000.codegen')
+def response_1000_codegen() -> Bench:
+    payload = response(1000)
+    return lambda: is_type(payload, Response, engine='codegen')
+
+
+@case('typeddict.response.10.check_type')
+def response_10_check_type() -> Bench:
+    payload = response(10)
+    return lambda: check_type(payload, Response)
+
+
+@case('list.int.100000')
+def list_int() -> Bench:
+    payload = list(range(100000))
+    return lambda: is_type(payload, List[int])
+
+
+@case('list.optional_str.100000')
+def list_optional_str() -> Bench:
+    payload = [None if i % 2 else str(i) for i in range(100000)]
+    return lambda: is_type(payload, List[Optional[str]])
+
+
+@case('dict.str_float.100000')
+def dict_str_float() -> Bench:
+    payload = {str(i): float(i) for i in range(100000)}
+    return lambda: is_type(payload, Dict[str, float])
+
+
+@case('list.action.10000')
+def list_action() -> Bench:
+    payload = [{'action_id': str(i), 'title': 'ok', 'handable': bool(i % 2)} for i in range(10000)]
+    return lambda: is_type(payload, List[Action])
+
+
+UNION_ARMS = (int, str, bytes, float, complex, list, dict, set, frozenset, tuple, range, slice, bytearray, type(None))
+
+
+@case('union.14_arms.10000')
+def union_many_arms() -> Bench:
+    payload = [None] * 10000
+    return lambda: is_type(payload, List[Union[UNION_ARMS]])  # type: ignore
+
+
+SUBTYPES = [
+    int, bool, float, str, Any, List[int], List[bool], List[Any], Dict[str, int], Dict[str, Any],
+    Optional[int], Union[int, str, None], Tuple[int, ...], Tuple[int, str], Response, Action,
+]
+
+
+@case('subtype.matrix.cold')
+def subtype_matrix_cold() -> Bench:
+    def bench() -> None:
+        is_subtype.cache_clear()
+        for frst in SUBTYPES:
+            for scnd in SUBTYPES:
+                is_subtype(frst, scnd)
+    return bench
+
+
+@case('subtype.matrix.warm')
+def subtype_matrix_warm() -> Bench:
+    def bench() -> None:
+        for frst in SUBTYPES:
+            for scnd in SUBTYPES:
+                is_subtype(frst, scnd)
+    return bench
+
+
+@case('staticclass.construct')
+def staticclass_construct() -> Bench:
+    @staticclass
+    class Record:
+        a: int
+        b: str
+        c: Optional[List[int]]
+        d: float = 0.0
+    return lambda: Record(1, 'b', [1, 2], 1.5)
+
+
+@case('staticclass.construct.slots')
+def staticclass_construct_slots() -> Bench:
+    @staticclass(slots=True)
+    class Record:
+        a: int
+        b: str
+        c: Optional[List[int]]
+        d: float = 0.0
+    return lambda: Record(1, 'b', [1, 2], 1.5)
+
+
+@scaling('list.int')
+def scaling_list_int(size: int) -> Bench:
+    payload = list(range(size))
+    return lambda: is_type(payload, List[int])
+
+
+@scaling('dict.str_float')
+def scaling_dict(size: int) -> Bench:
+    payload = {str(i): float(i) for i in range(size)}
+    return lambda: is_type(payload, Dict[str, float])
+
+
+@scaling('typeddict.response')
+def scaling_response(size: int) -> Bench:
+    payload = response(size)
+    return lambda: is_type(payload, Response)
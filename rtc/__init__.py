@@ -1,9 +1,44 @@
-
 from .is_type import staticclass, is_type
-from .subtype import is_subtype
+from .subtype import SubtypeRegistry, is_subtype
+from .compiler import compile
+from .codegen import compile_codegen
+from .batch import is_type_many, check_many
+from .sampling import Sample, check_sample
+from .stream import check_stream, iter_stream
+from .tools import EnumValue
+from .aio import check_type_async
+from .parallel import is_type_parallel, check_parallel
+from .iterative import compile_iterative
+from .collect import check_all
+from .memo import check_type_cached
+from .metrics import instrumentation, stats
+from .functions import typechecked
+from .views import CheckedDict, CheckedList, checked
 
 __all__ = [
     'staticclass',
     'is_subtype',
+    'SubtypeRegistry',
     'is_type',
+    'compile',
+    'compile_codegen',
+    'is_type_many',
+    'check_many',
+    'Sample',
+    'check_sample',
+    'check_stream',
+    'iter_stream',
+    'EnumValue',
+    'check_type_async',
+    'is_type_parallel',
+    'check_parallel',
+    'compile_iterative',
+    'check_all',
+    'check_type_cached',
+    'instrumentation',
+    'stats',
+    'typechecked',
+    'CheckedDict',
+    'CheckedList',
+    'checked',
 ]
@@ -0,0 +1,324 @@
+import asyncio
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .compiler import Explanation, Predicate, always, compile, compile_dispatch
+from .errors import ErrorMessage
+from .is_type import CheckerType
+from .tools import TYPEDDICT, LRUCache, classify, is_typed_dict, typeddict_layout
+
+CONTAINERS = (list, tuple, dict)
+NONE_TYPE = type(None)
+
+Steps = Generator[None, None, CheckerType]
+
+
+Sizer = Callable[[Any, int], int]
+UnionPlan = Tuple[
+    Optional[Predicate],
+    List[Tuple[type, Any]],
+    Optional[Callable[[dict], Any]],
+    Tuple[Any, ...],
+]
+
+SIZER_CACHE = LRUCache(maxsize=1024)
+UNION_CACHE = LRUCache(maxsize=1024)
+_sizing = set()  # type: set
+
+
+def is_structural(value_type: Any) -> bool:
+    return (info := classify(value_type)).kind == TYPEDDICT or info.origin in (list, tuple, dict, Union)
+
+
+def length(value: Any, limit: int) -> int:
+    return len(value) if isinstance(value, CONTAINERS) else 0
+
+
+def weight(value: Any, limit: int) -> int:
+    """
+        number of elements in nested lists, tuples and dicts of 'value',
+        counting stops as soon as it is over 'limit'
+        Example:
+            weight([[1, 2], [3]], 1000) -> 5
+    """
+    if not isinstance(value, CONTAINERS) or (total := len(value)) > limit:
+        return length(value, limit)
+    for item in value.values() if isinstance(value, dict) else value:
+        if isinstance(item, CONTAINERS) and (total := total + weight(item, limit - total)) > limit:
+            break
+    return total
+
+
+def sizer(value_type: Any) -> Sizer:
+    """
+        function which counts elements of value in nested lists, tuples and dicts
+        walked into by 'value_type', like weight() but elements of leaf types are not scanned
+        sizers are kept in SIZER_CACHE (LRU) by id(), recursive types refer to themselves by lookup
+        Example:
+            sizer(List[List[int]])([[1, 2], [3]], 1000) -> 5
+    """
+    if (entry := SIZER_CACHE.get(id(value_type))) is not None and entry[0] is value_type:
+        return entry[1]
+    try:
+        if value_type in _sizing:
+            return partial(deferred, value_type)
+    except TypeError:
+        return build_sizer(value_type)
+    _sizing.add(value_type)
+    try:
+        result = build_sizer(value_type)
+    finally:
+        _sizing.discard(value_type)
+    SIZER_CACHE.put(id(value_type), (value_type, result))
+    return result
+
+
+def deferred(value_type: Any, value: Any, limit: int) -> int:
+    return sizer(value_type)(value, limit)
+
+
+def build_sizer(value_type: Any) -> Sizer:
+    if is_typed_dict(value_type):
+        fields = tuple(
+            (key, sizer(key_type))
+            for key, key_type in typeddict_layout(value_type).fields.items()
+            if is_structural(key_type)
+        )
+        return partial(typeddict_size, fields) if fields else length
+    origin, args = (info := classify(value_type)).origin, info.args
+    if origin is Union:
+        arms = [arg for arg in args if arg is not NONE_TYPE]
+        if len(arms) == 1:
+            return sizer(arms[0])
+        return weight if any(map(is_structural, arms)) else length
+    if origin is dict and args and is_structural(args[1]):
+        return partial(mapping_size, sizer(args[1]))
+    if origin in (list, tuple) and args and (origin is list or len(args) == 1 or (len(args) == 2 and args[1] is ...)):
+        return partial(sequence_size, origin, sizer(args[0])) if is_structural(args[0]) else length
+    if origin is tuple and args and any(map(is_structural, args)):
+        return partial(tuple_size, tuple(map(sizer, args)))
+    return length
+
+
+def typeddict_size(fields: Tuple[Tuple[Any, Sizer], ...], value: Any, limit: int) -> int:
+    if not isinstance(value, dict) or (total := len(value)) > limit:
+        return length(value, limit)
+    for key, size in fields:
+        if key in value and (total := total + size(value[key], limit - total)) > limit:
+            break
+    return total
+
+
+def mapping_size(size: Sizer, value: Any, limit: int) -> int:
+    if not isinstance(value, dict) or (total := len(value)) > limit:
+        return length(value, limit)
+    for item in value.values():
+        if (total := total + size(item, limit - total)) > limit:
+            break
+    return total
+
+
+def sequence_size(origin: type, size: Sizer, value: Any, limit: int) -> int:
+    if not isinstance(value, origin) or (total := len(value)) > limit:
+        return length(value, limit)
+    for item in value:
+        if (total := total + size(item, limit - total)) > limit:
+            break
+    return total
+
+
+def tuple_size(sizes: Tuple[Sizer, ...], value: Any, limit: int) -> int:
+    if not isinstance(value, tuple) or (total := len(value)) > limit:
+        return length(value, limit)
+    for item, size in zip(value, sizes):
+        if (total := total + size(item, limit - total)) > limit:
+            break
+    return total
+
+
+def union_plan(value_type: Any) -> UnionPlan:
+    """
+        split Union arms for Walker: test of arms which are checked at once
+        and (container, arm) pairs of arms which are walked into,
+        TypedDict arms are picked by dispatch from compile_dispatch() like in other engines
+        plans are kept in UNION_CACHE (LRU) by id()
+    """
+    if (entry := UNION_CACHE.get(id(value_type))) is not None and entry[0] is value_type:
+        return entry[1]
+    args = classify(value_type).args
+    flat = [arg for arg in args if not is_structural(arg)]
+    nested = [(classify(arg).origin or dict, arg) for arg in args if is_structural(arg)]
+    typeddicts = [arg for _, arg in nested if is_typed_dict(arg)]
+    dispatch, covered = compile_dispatch(typeddicts, {arg: arg for arg in typeddicts})
+    result = compile(Union[tuple(flat)]).test if flat else None, nested, dispatch, covered
+    UNION_CACHE.put(id(value_type), (value_type, result))
+    return result
+
+
+def no_sizes(chunk: List[Any]) -> List[int]:
+    return []
+
+
+def sizes_of(size: Sizer, limit: int, chunk: List[Any]) -> List[int]:
+    return [size(item, limit) for item in chunk]
+
+
+def item_sizes_of(size: Sizer, limit: int, chunk: List[Tuple[Any, Any]]) -> List[int]:
+    return [size(item, limit) for _, item in chunk]
+
+
+class Walker:
+    """
+        checks value in slices of about 'budget' elements,
+        check() is generator which yields between slices and returns check_type() result
+        TypedDict fields, tuple positions and Union arms are walked into,
+        elements of List and Dict with not more than 'budget' nested elements are checked at once with compiled checkers
+    """
+
+    def __init__(self, budget: int) -> None:
+        if budget < 1:
+            raise ValueError('budget must be positive, got %s' % budget)
+        self.budget = budget
+        self.spent = 0
+
+    def spend(self, cost: int) -> bool:
+        self.spent += cost
+        if self.spent < self.budget:
+            return False
+        self.spent %= self.budget
+        return True
+
+    def check(self, value: Any, value_type: Any) -> Steps:
+        if is_typed_dict(value_type):
+            return (yield from self.typeddict(value, value_type))
+        origin, args = (info := classify(value_type)).origin, info.args
+        if origin is Union:
+            return (yield from self.union(value, value_type))
+        elif origin in CONTAINERS and args:
+            if not isinstance(value, origin):
+                return False, ErrorMessage('expected "%s", got "%s"', value_type, type(value))
+            if origin is dict:
+                return (yield from self.mapping(value, *args))
+            if origin is list or len(args) == 1 or (len(args) == 2 and args[1] is ...):
+                return (yield from self.sequence(value, args[0]))
+            if len(args) != len(value):
+                return False, ErrorMessage('expected "%s", got "%s"', value_type, value)
+            for item, item_type in zip(value, args):
+                if not (res := (yield from self.field(item, item_type)))[0]:
+                    return res
+            return True, None
+        if compile(value_type).test(value):
+            return True, None
+        return False, Explanation(value, value_type)
+
+    def union(self, value: Any, value_type: Any) -> Steps:
+        flat_test, nested, dispatch, covered = union_plan(value_type)
+        if flat_test is not None and flat_test(value):
+            return True, None
+        chosen = dispatch(value) if dispatch is not None and isinstance(value, dict) else None
+        for container, arm in nested:
+            if isinstance(value, container) and (arm is chosen or arm not in covered):
+                if (yield from self.check(value, arm))[0]:
+                    return True, None
+        return False, ErrorMessage('expected value any type of [%s], got "%s"', classify(value_type).args, value)
+
+    def child(self, item: Any, item_type: Any, test: Predicate) -> Steps:
+        if (size := sizer(item_type)(item, self.budget)) > self.budget and is_structural(item_type):
+            return (yield from self.check(item, item_type))
+        if not test(item):
+            return False, Explanation(item, item_type)
+        if self.spend(size + 1):
+            yield
+        return True, None
+
+    def field(self, item: Any, item_type: Any) -> Steps:
+        if is_structural(item_type):
+            return (yield from self.check(item, item_type))
+        return (yield from self.child(item, item_type, compile(item_type).test))
+
+    def chunks(
+        self,
+        iterator: Iterator[Any],
+        sizes: Callable[[List[Any]], List[int]],
+    ) -> Iterator[Tuple[List[Any], int]]:
+        """
+            split elements into chunks of about 'budget' cost, element costs 1 + number of its nested elements,
+            chunk is yielded with cost or with -1 if it has element longer than 'budget'
+        """
+        step = self.budget
+        while chunk := list(islice(iterator, step)):
+            lengths = sizes(chunk)
+            if max(lengths, default=0) > self.budget:
+                yield chunk, -1
+                continue
+            cost = len(chunk) + sum(lengths)
+            step = max(1, self.budget * len(chunk) // cost)
+            yield chunk, cost
+
+    def sequence(self, value: Iterable[Any], item_type: Any) -> Steps:
+        if (test := compile(item_type).test) is always:
+            return True, None
+        sizes = partial(sizes_of, sizer(item_type), self.budget) if is_structural(item_type) else no_sizes
+        for chunk, cost in self.chunks(iter(value), sizes):
+            if cost < 0:
+                for item in chunk:
+                    if not (res := (yield from self.child(item, item_type, test)))[0]:
+                        return res
+            elif not all(map(test, chunk)):
+                return False, Explanation(next(i for i in chunk if not test(i)), item_type)
+            elif self.spend(cost):
+                yield
+        return True, None
+
+    def mapping(self, value: dict, key_type: Any, item_type: Any) -> Steps:
+        key_test, item_test = compile(key_type).test, compile(item_type).test
+        if key_test is always and item_test is always:
+            return True, None
+        sizes = partial(item_sizes_of, sizer(item_type), self.budget) if is_structural(item_type) else no_sizes
+        for chunk, cost in self.chunks(iter(value.items()), sizes):
+            if cost >= 0 and all(key_test(key) and item_test(item) for key, item in chunk):
+                if self.spend(cost):
+                    yield
+                continue
+            for key, item in chunk:
+                if not key_test(key):
+                    return False, ErrorMessage('key "%s", %s', key, Explanation(key, key_type))
+                if not (res := (yield from self.child(item, item_type, item_test)))[0]:
+                    return False, ErrorMessage('value for key "%s", %s', key, res[1])
+        return True, None
+
+    def typeddict(self, value: Any, value_type: Any) -> Steps:
+        if not isinstance(value, dict):
+            return False, ErrorMessage('expected dict, got "%s"', type(value))
+        layout = typeddict_layout(value_type)
+        if layout.closed and not value.keys() <= layout.keys:
+            key = next(key for key in value if key not in layout.keys)
+            return False, ErrorMessage('expected key "%s" type of "%s" in TypedDict', key, type(value[key]))
+        fields = layout.fields
+        for key, item in value.items():
+            if key in fields and not (res := (yield from self.field(item, fields[key])))[0]:
+                return False, ErrorMessage('%s in TypedDict["%s"]', res[1], key)
+        if not layout.required <= value.keys():
+            missed = layout.required - value.keys()
+            return False, ErrorMessage('fields "%s" missed in TypedDict', '","'.join(map(str, sorted(missed))))
+        return True, None
+
+
+async def check_type_async(value: Any, value_type: Any, budget: int = 1000) -> CheckerType:
+    """
+        same as check_type, but yields to event loop after every 'budget' checked elements,
+        values with fewer nested elements are checked at once by compiled checker
+        Example:
+            ok, error = await check_type_async(payload, Response, budget=5000)
+    """
+    walker = Walker(budget)
+    if sizer(value_type)(value, budget) <= budget:
+        return compile(value_type)(value)
+    steps = walker.check(value, value_type)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+        await asyncio.sleep(0)
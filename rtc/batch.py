@@ -0,0 +1,57 @@
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from .compiler import ENGINES, Explanation, compile
+from .parallel import find_invalid, mask_parallel
+
+
+def as_sequence(values: Iterable[Any], engine: Optional[str]) -> Sequence[Any]:
+    if engine is not None:
+        raise ValueError('parallel mode is supported by default engine only')
+    return values if isinstance(values, (list, tuple)) else list(values)
+
+
+def is_type_many(
+    values: Iterable[Any],
+    type: Any,
+    engine: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> bytearray:
+    """
+        check every value against one type
+        return mask with 1 for valid values and 0 for invalid ones
+        'workers' enables process pool for large inputs, see rtc.parallel
+        Example:
+            is_type_many([1, '2', 3], int) -> bytearray(b'\\x01\\x00\\x01')
+    """
+    if workers is not None:
+        return mask_parallel(as_sequence(values, engine), type, workers)
+    test = (compile if engine is None else ENGINES[engine])(type).test
+    return bytearray(map(test, values))
+
+
+def check_many(
+    values: Iterable[Any],
+    type: Any,
+    engine: Optional[str] = None,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[Tuple[int, Explanation]]:
+    """
+        check every value against one type
+        return list of (index, error) for invalid values,
+        stops after 'limit' errors if it's passed
+        'workers' enables process pool for large inputs, see rtc.parallel
+        Example:
+            check_many([1, '2', 3], int) -> [(1, 'for "2" expected type ...')]
+    """
+    if workers is not None:
+        values = as_sequence(values, engine)
+        return [(idx, Explanation(values[idx], type)) for idx in find_invalid(values, type, workers, limit=limit)]
+    test = (compile if engine is None else ENGINES[engine])(type).test
+    errors = (
+        (idx, Explanation(value, type))
+        for idx, value in enumerate(values)
+        if not test(value)
+    )
+    return list(errors if limit is None else islice(errors, limit))
@@ -0,0 +1,62 @@
+import array
+from typing import Any, Optional, Tuple
+
+from .tools import ANY, CLASS, TYPES, UNION, classify
+
+# array typecodes and struct formats -> python type of items
+ITEM_TYPES = {
+    **dict.fromkeys('bBhHiIlLqQnN', int),
+    **dict.fromkeys('efd', float),
+    '?': bool,
+    'c': bytes,
+    'u': str,
+}
+
+
+def buffer_item_type(value: Any) -> Optional[type]:
+    """
+        python type of every item of typed buffer,
+        read from typecode / format without touching items
+        None if value is not bytes, bytearray, array.array or flat memoryview of scalars
+        Example:
+            buffer_item_type(array.array('d', [1.0])) -> float
+    """
+    if (cls := type(value)) is bytes or cls is bytearray:
+        return int
+    if cls is array.array:
+        return ITEM_TYPES.get(value.typecode)
+    if cls is memoryview and value.ndim == 1:
+        return ITEM_TYPES.get(value.format.lstrip('@=<>!'))
+    return None
+
+
+def item_classes(item_type: Any) -> Optional[Tuple[type, ...]]:
+    """
+        classes items of 'item_type' must be instances of,
+        None if check of 'item_type' is more than isinstance()
+    """
+    info = classify(item_type)
+    if (kind := info.kind) == CLASS:
+        return item_type,
+    if kind == TYPES:
+        return item_type
+    if kind == ANY:
+        return object,
+    if kind == UNION:
+        classes = ()  # type: Tuple[type, ...]
+        for arg in info.args:
+            if (found := item_classes(arg)) is None:
+                return None
+            classes += found
+        return classes
+    return None
+
+
+def is_sequence(value: Any, origin: Any) -> bool:
+    """
+        isinstance(value, origin) which also accepts array.array,
+        memoryview is accepted only if it's flat view of scalars, since others can not be iterated
+    """
+    if (cls := type(value)) is memoryview:
+        return buffer_item_type(value) is not None and isinstance(value, origin)
+    return cls is array.array or isinstance(value, origin)
@@ -0,0 +1,308 @@
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
+
+from .compiler import ENGINES, Checker, always, compile, dispatch_table, literal_table
+from .is_type import SUPPORTED_ALIASES
+from .tools import LRUCache, classify, is_typed_dict, typeddict_layout
+
+MISSING = object()
+EXACT_TYPES = (bool, type(None))
+BUILTINS = {
+    'isinstance': isinstance,
+    'type': type,
+    'len': len,
+    'MISSING': MISSING,
+}
+
+
+class CodeGenerator:
+    """
+        translates type into python source of validation functions
+        functions return bool, unsupported nodes fall back to compiled checkers
+        completed functions and constants are bound as default args,
+        functions still being generated (recursive TypedDicts) are looked up as globals
+    """
+
+    def __init__(self) -> None:
+        self.namespace = dict(BUILTINS)  # type: Dict[str, Any]
+        self.sources = []  # type: List[str]
+        self._constants = []  # type: List[Tuple[Any, str]]
+        self._functions = []  # type: List[Tuple[Any, str]]
+        self._used = [set()]  # type: List[set]
+        self._done = set()  # type: Set[str]
+        self._vars = 0
+
+    def constant(self, obj: Any, prefix: str = 't') -> str:
+        for known, name in self._constants:
+            if known is obj:
+                break
+        else:
+            name = '%s%d' % (prefix, len(self._constants))
+            self._constants.append((obj, name))
+            self.namespace[name] = obj
+        return self.use(name)
+
+    def use(self, name: str) -> str:
+        self._used[-1].add(name)
+        return name
+
+    def var(self) -> str:
+        self._vars += 1
+        return 'v%d' % self._vars
+
+    def function(self, value_type: Any) -> str:
+        for known, name in self._functions:
+            if known is value_type:
+                return self.use(name)
+        name = 'check_%d' % len(self._functions)
+        self._functions.append((value_type, name))
+        self._used.append(set())
+        saved, self._vars = self._vars, 0
+        lines = []  # type: List[str]
+        self.statements(lines, 'value', value_type, 1)
+        self._vars = saved
+        used = {i for i in self._used.pop() if i in self.namespace or i in self._done}
+        self._done.add(name)
+        self.sources.append(
+            '\n'.join(
+                [
+                    'def %s(value%s):' % (name, ''.join(', %s=%s' % (i, i) for i in sorted(used))),
+                    *lines,
+                    '    return True',
+                ]
+            )
+        )
+        return self.use(name)
+
+    def expression(self, var: str, value_type: Any) -> Optional[str]:
+        if type(value_type) is tuple and len(value_type) == 1 and isinstance(value_type[0], type):
+            value_type = value_type[0]
+        if value_type in SUPPORTED_ALIASES:
+            return '%s(%s)' % (self.constant(compile(value_type).test, 'p'), var)
+        if isinstance(value_type, tuple) and all(isinstance(i, type) for i in value_type):
+            return '%s(%s, %s)' % (self.use('isinstance'), var, self.constant(value_type))
+        if isinstance(value_type, type) and not is_typed_dict(value_type):
+            if value_type is type(None):
+                return '%s is None' % var
+            if value_type in EXACT_TYPES:
+                return '%s(%s) is %s' % (self.use('type'), var, self.constant(value_type))
+            name = self.constant(value_type)
+            return '(%s(%s) is %s or %s(%s, %s))' % (
+                self.use('type'), var, name, self.use('isinstance'), var, name,
+            )
+        if (info := classify(value_type)).origin is Literal:
+            if len(table := literal_table(info.args)) != 1:
+                return '%s(%s)' % (self.constant(compile(value_type).test, 'p'), var)
+            (literal_type, values), = table.items()
+            return '(%s(%s) is %s and %s in %s)' % (
+                self.use('type'), var, self.constant(literal_type), var, self.constant(values),
+            )
+        if info.origin is Union:
+            if dispatch_table([arg for arg in info.args if is_typed_dict(arg)]) is not None:
+                return None  # TypedDict arms are dispatched by statements, see union()
+            arms = []
+            for arg in info.args:
+                if compile(arg).test is always:
+                    return None
+                if (arm := self.expression(var, arg)) is None:
+                    arm = '%s(%s)' % (self.function(arg), var)
+                arms.append(arm)
+            return '(%s)' % ' or '.join(arms)
+        return None
+
+    def check(self, var: str, value_type: Any) -> Optional[str]:
+        """
+            return expression which is True if 'var' matches 'value_type',
+            None if any value matches
+        """
+        if compile(value_type).test is always:
+            return None
+        if (expr := self.expression(var, value_type)) is not None:
+            return expr
+        return '%s(%s)' % (self.function(value_type), var)
+
+    @property
+    def names(self) -> Set[str]:
+        return {*self.namespace, *(name for _, name in self._functions)}
+
+    def statements(self, lines: List[str], var: str, value_type: Any, indent: int) -> None:
+        pad = '    ' * indent
+        if compile(value_type).test is always:
+            return
+        if (expr := self.expression(var, value_type)) is not None:
+            lines.append('%sif not %s:' % (pad, expr))
+            lines.append('%s    return False' % pad)
+            return
+        origin = classify(value_type).origin
+        if origin is list:
+            self.sequence(lines, var, value_type, indent, self.constant(origin))
+        elif origin is tuple:
+            self.tuple(lines, var, value_type, indent)
+        elif origin is dict:
+            self.mapping(lines, var, value_type, indent)
+        elif is_typed_dict(value_type) and var != 'value':
+            lines.append('%sif not %s(%s):' % (pad, self.function(value_type), var))
+            lines.append('%s    return False' % pad)
+        elif is_typed_dict(value_type):
+            self.typeddict(lines, var, value_type, indent)
+        elif origin is Union:
+            self.union(lines, var, value_type, indent)
+        else:
+            lines.append('%sif not %s(%s):' % (pad, self.constant(compile(value_type).test, 'p'), var))
+            lines.append('%s    return False' % pad)
+
+    def sequence(self, lines: List[str], var: str, item_type: Any, indent: int, origin: str) -> None:
+        pad = '    ' * indent
+        lines.append('%sif not %s(%s, %s):' % (pad, self.use('isinstance'), var, origin))
+        lines.append('%s    return False' % pad)
+        if not (args := classify(item_type).args):
+            return
+        body = []  # type: List[str]
+        item = self.var()
+        self.statements(body, item, args[0], indent + 1)
+        if body:
+            lines.append('%sfor %s in %s:' % (pad, item, var))
+            lines.extend(body)
+
+    def tuple(self, lines: List[str], var: str, value_type: Any, indent: int) -> None:
+        pad = '    ' * indent
+        args = classify(value_type).args
+        if not args or len(args) == 1 or (len(args) == 2 and args[1] is ...):
+            self.sequence(lines, var, value_type, indent, self.constant(tuple))
+            return
+        lines.append('%sif not %s(%s, %s) or %s(%s) != %d:' % (
+            pad, self.use('isinstance'), var, self.constant(tuple), self.use('len'), var, len(args),
+        ))
+        lines.append('%s    return False' % pad)
+        for idx, arg in enumerate(args):
+            body = []  # type: List[str]
+            item = self.var()
+            self.statements(body, item, arg, indent)
+            if body:
+                lines.append('%s%s = %s[%d]' % (pad, item, var, idx))
+                lines.extend(body)
+
+    def mapping(self, lines: List[str], var: str, value_type: Any, indent: int) -> None:
+        pad = '    ' * indent
+        info = classify(value_type)
+        lines.append('%sif not %s(%s, %s):' % (pad, self.use('isinstance'), var, self.constant(info.origin)))
+        lines.append('%s    return False' % pad)
+        if not info.args:
+            return
+        key, item = self.var(), self.var()
+        key_body, item_body = [], []  # type: List[str], List[str]
+        self.statements(key_body, key, info.args[0], indent + 1)
+        self.statements(item_body, item, info.args[1], indent + 1)
+        if key_body and item_body:
+            lines.append('%sfor %s, %s in %s.items():' % (pad, key, item, var))
+        elif key_body:
+            lines.append('%sfor %s in %s:' % (pad, key, var))
+        elif item_body:
+            lines.append('%sfor %s in %s.values():' % (pad, item, var))
+        lines.extend(key_body)
+        lines.extend(item_body)
+
+    def typeddict(self, lines: List[str], var: str, value_type: Any, indent: int) -> None:
+        pad = '    ' * indent
+        layout = typeddict_layout(value_type)
+        lines.append('%sif not %s(%s, %s):' % (pad, self.use('isinstance'), var, self.constant(dict)))
+        lines.append('%s    return False' % pad)
+        if layout.closed and not layout.optional:
+            lines.append('%sif %s(%s) != %d:' % (pad, self.use('len'), var, len(layout.fields)))
+            lines.append('%s    return False' % pad)
+        elif layout.closed:
+            lines.append('%sif not %s.keys() <= %s:' % (pad, var, self.constant(layout.keys)))
+            lines.append('%s    return False' % pad)
+        for key, key_type in layout.fields.items():
+            item = self.var()
+            body = []  # type: List[str]
+            if key in layout.required:
+                self.statements(body, item, key_type, indent)
+                lines.append('%s%s = %s.get(%r, %s)' % (pad, item, var, key, self.use('MISSING')))
+                lines.append('%sif %s is %s:' % (pad, item, self.use('MISSING')))
+                lines.append('%s    return False' % pad)
+                lines.extend(body)
+            else:
+                self.statements(body, item, key_type, indent + 1)
+                if body:
+                    lines.append('%s%s = %s.get(%r, %s)' % (pad, item, var, key, self.use('MISSING')))
+                    lines.append('%sif %s is not %s:' % (pad, item, self.use('MISSING')))
+                    lines.extend(body)
+
+    def union(self, lines: List[str], var: str, value_type: Any, indent: int) -> None:
+        """
+            Union with TypedDict arms which can be told apart by discriminator key or set of keys:
+            other arms are tried first, then the only TypedDict arm picked by index is checked,
+            dispatch is inlined into caller unless there are other arms
+        """
+        pad = '    ' * indent
+        args = classify(value_type).args
+        key, arms_index = dispatch_table([arg for arg in args if is_typed_dict(arg)])
+        covered = list(dict.fromkeys(arms_index.values()))
+        if (rest := [arg for arg in args if arg not in covered]) and var != 'value':
+            lines.append('%sif not %s(%s):' % (pad, self.function(value_type), var))
+            lines.append('%s    return False' % pad)
+            return
+        for arg in rest:
+            lines.append('%sif %s:' % (pad, self.check(var, arg)))
+            lines.append('%s    return True' % pad)
+        index = {tag: covered.index(arm) for tag, arm in arms_index.items()}
+        if key is None:
+            select = '%s.get(%s(%s))' % (self.constant(index), self.constant(frozenset), var)
+        else:
+            select = '%s.get(%s.get(%r, %s))' % (self.constant(index), var, key, self.use('MISSING'))
+        arm = self.var()
+        lines += [
+            '%sif not %s(%s, %s):' % (pad, self.use('isinstance'), var, self.constant(dict)),
+            '%s    return False' % pad,
+            '%stry:' % pad,
+            '%s    %s = %s' % (pad, arm, select),
+            '%sexcept %s:' % (pad, self.constant(TypeError)),
+            '%s    return False' % pad,
+            '%sif %s is None or not (%s,)[%s](%s):' % (
+                pad, arm, ', '.join(self.function(i) for i in covered), arm, var,
+            ),
+            '%s    return False' % pad,
+        ]
+
+    def build(self, value_type: Any) -> Any:
+        name = self.function(value_type)
+        exec('\n\n'.join(self.sources), self.namespace)
+        return self.namespace[name]
+
+
+def generate_source(value_type: Any) -> str:
+    """
+        return python source of validation functions generated for 'value_type'
+    """
+    generator = CodeGenerator()
+    generator.build(value_type)
+    return '\n\n'.join(generator.sources)
+
+
+CODEGEN_CACHE = LRUCache(maxsize=1024)
+
+
+def compile_codegen(value_type: Any) -> Checker:
+    """
+        same as rtc.compile(), but checker is generated python source
+        with inlined type checks and unrolled TypedDict keys,
+        checkers are kept in CODEGEN_CACHE (LRU)
+        Example:
+            checker = compile_codegen(Response)
+            checker.test(payload) -> bool
+    """
+    try:
+        checker = CODEGEN_CACHE.get(value_type)
+    except TypeError:
+        return Checker(value_type, CodeGenerator().build(value_type))
+    if checker is None:
+        checker = Checker(value_type, CodeGenerator().build(value_type))
+        CODEGEN_CACHE.put(value_type, checker)
+    return checker
+
+
+compile_codegen.cache_info = CODEGEN_CACHE.cache_info  # type: ignore
+compile_codegen.cache_clear = CODEGEN_CACHE.clear  # type: ignore
+
+
+ENGINES['codegen'] = compile_codegen
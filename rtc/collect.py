@@ -0,0 +1,145 @@
+from typing import Any, List, NamedTuple, Optional, Union
+
+from .compiler import Explanation, compile
+from .errors import ErrorMessage
+from .tools import is_typed_dict, typeddict_layout
+
+NONE_TYPE = type(None)
+
+
+class Path:
+    """
+        node of JSON pointer linked to its parent,
+        children of one container share the parent node,
+        string is built only when str() is called
+        Example:
+            str(Path(Path(Path(), 'objects'), 3)) -> '/objects/3'
+    """
+
+    __slots__ = ('parent', 'key')
+
+    def __init__(self, parent: Optional['Path'] = None, key: Any = None) -> None:
+        self.parent = parent
+        self.key = key
+
+    def parts(self) -> List[Any]:
+        parts = []
+        node = self  # type: Optional[Path]
+        while node is not None and node.parent is not None:
+            parts.append(node.key)
+            node = node.parent
+        parts.reverse()
+        return parts
+
+    def __str__(self) -> str:
+        return ''.join('/' + str(key).replace('~', '~0').replace('/', '~1') for key in self.parts())
+
+    def __repr__(self) -> str:
+        return 'Path(%r)' % str(self)
+
+
+class Violation(NamedTuple):
+    path: Path
+    message: ErrorMessage
+
+    def __str__(self) -> str:
+        return '%s: %s' % (self.path, self.message)
+
+
+def container(value_type: Any) -> Any:
+    if is_typed_dict(value_type):
+        return dict
+    if (origin := getattr(value_type, '__origin__', None)) in (list, tuple, dict):
+        return origin
+    return None
+
+
+class Collector:
+    """
+        walks only into invalid parts of value (valid ones are passed by compiled checkers)
+        and gathers violations until 'limit' is reached
+    """
+
+    def __init__(self, limit: Optional[int]) -> None:
+        self.limit = limit
+        self.violations = []  # type: List[Violation]
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and len(self.violations) >= self.limit
+
+    def add(self, path: Path, message: ErrorMessage) -> None:
+        if not self.full:
+            self.violations.append(Violation(path, message))
+
+    def check(self, value: Any, value_type: Any, path: Path) -> None:
+        if self.full or compile(value_type).test(value):
+            return
+        if is_typed_dict(value_type):
+            return self.typeddict(value, value_type, path)
+        origin = getattr(value_type, '__origin__', None)
+        args = getattr(value_type, '__args__', None) or ()
+        if origin is Union:
+            arms = [
+                arg
+                for arg in args
+                if (cls := container(arg)) is not None and isinstance(value, cls)
+            ]
+            if len(arms) == 1:
+                return self.check(value, arms[0], path)
+        elif origin in (list, tuple, dict) and args and isinstance(value, origin):
+            if origin is dict:
+                return self.mapping(value, args[0], args[1], path)
+            if origin is list or len(args) == 1 or (len(args) == 2 and args[1] is ...):
+                return self.sequence(value, args[0], path)
+            if len(args) == len(value):
+                for idx, (item, item_type) in enumerate(zip(value, args)):
+                    self.check(item, item_type, Path(path, idx))
+                return
+        self.add(path, Explanation(value, value_type))
+
+    def sequence(self, value: Any, item_type: Any, path: Path) -> None:
+        test = compile(item_type).test
+        for idx, item in enumerate(value):
+            if not test(item):
+                self.check(item, item_type, Path(path, idx))
+                if self.full:
+                    return
+
+    def mapping(self, value: dict, key_type: Any, item_type: Any, path: Path) -> None:
+        key_test, item_test = compile(key_type).test, compile(item_type).test
+        for key, item in value.items():
+            if not key_test(key):
+                self.add(Path(path, key), ErrorMessage('key "%s", %s', key, Explanation(key, key_type)))
+            if not item_test(item):
+                self.check(item, item_type, Path(path, key))
+            if self.full:
+                return
+
+    def typeddict(self, value: Any, value_type: Any, path: Path) -> None:
+        if not isinstance(value, dict):
+            return self.add(path, Explanation(value, value_type))
+        layout = typeddict_layout(value_type)
+        for key, item in value.items():
+            if key in layout.fields:
+                self.check(item, layout.fields[key], Path(path, key))
+            elif layout.closed:
+                self.add(Path(path, key), ErrorMessage('unexpected key "%s" in TypedDict', key))
+            if self.full:
+                return
+        for key in layout.fields:
+            if key in layout.required and key not in value:
+                self.add(Path(path, key), ErrorMessage('field "%s" missed in TypedDict', key))
+
+
+def check_all(value: Any, value_type: Any, limit: Optional[int] = 100) -> List[Violation]:
+    """
+        return all violations (up to 'limit') with JSON pointer paths,
+        empty list if value is valid
+        Example:
+            for violation in check_all(payload, Response):
+                print(violation.path, violation.message)  # /objects/3/data/time for "x" expected type ...
+    """
+    collector = Collector(limit)
+    collector.check(value, value_type, Path())
+    return collector.violations
@@ -0,0 +1,439 @@
+import threading
+import weakref
+from collections import abc
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+from .buffers import buffer_item_type, is_sequence, item_classes
+from .errors import ErrorMessage
+from .is_type import SUPPORTED_ALIASES, SUPPORTED_TYPOS, CheckerType, check_type
+from .tools import CLASS, OTHER, TYPEDDICT, TYPES, LRUCache, classify, is_typed_dict, typeddict_layout
+
+if TYPE_CHECKING:
+    from .sampling import Sample
+
+Predicate = Callable[[Any], bool]
+MAX_ACCEPTED = 64
+MISSING = object()
+
+
+class Explanation(ErrorMessage):
+    """
+        error message for failed compiled check
+        check_type is run only when message is read
+    """
+
+    __slots__ = ()
+
+    def __init__(self, value: Any, value_type: Any) -> None:
+        super().__init__('%s', value, value_type)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = str(check_type(*self.args)[1])
+        return self._text
+
+
+class Checker:
+    """
+        compiled checker for one type
+        checker.test(value) -> bool is the fast path,
+        checker(value) -> (bool, message) with lazy message
+    """
+
+    __slots__ = ('type', 'test', '__weakref__')
+
+    def __init__(self, value_type: Any, test: Predicate) -> None:
+        self.type = value_type
+        self.test = test
+
+    def __call__(self, value: Any) -> CheckerType:
+        if self.test(value):
+            return True, None
+        return False, Explanation(value, self.type)
+
+    def __repr__(self) -> str:
+        return 'Checker[%s]' % (self.type,)
+
+
+def always(value: Any) -> bool:
+    return True
+
+
+def find_discriminator(arms: List[Any]) -> Optional[Tuple[str, Dict[Any, Any]]]:
+    """
+        find key which is required in every TypedDict of 'arms'
+        and typed as Literal with disjoint values
+        return key and index {literal value: TypedDict}
+    """
+    layouts = [typeddict_layout(arm) for arm in arms]
+    for key in layouts[0].fields:
+        index = {}  # type: Dict[Any, Any]
+        for arm, layout in zip(arms, layouts):
+            if key not in layout.required:
+                break
+            key_type = layout.fields[key]
+            if (info := classify(key_type)).origin is not Literal:
+                break
+            try:
+                if any(type(tag) is bool or tag in index for tag in info.args):
+                    break
+                index.update(dict.fromkeys(info.args, arm))
+            except TypeError:
+                break
+        else:
+            return key, index
+    return None
+
+
+def dispatch_table(arms: List[Any]) -> Optional[Tuple[Optional[str], Dict[Any, Any]]]:
+    """
+        index which picks the only TypedDict from 'arms' that may match dict value:
+        (key, {literal value: TypedDict}) if arms have discriminator key,
+        (None, {frozenset of keys: TypedDict}) if closed arms without optional keys have distinct keys,
+        None if arms can not be told apart
+    """
+    if len(arms) < 2:
+        return None
+    if (found := find_discriminator(arms)) is not None:
+        return found
+    exact = [arm for arm in arms if (layout := typeddict_layout(arm)).closed and not layout.optional]
+    keysets = {typeddict_layout(arm).keys: arm for arm in exact}
+    if len(exact) < 2 or len(keysets) != len(exact):
+        return None
+    return None, keysets
+
+
+def compile_dispatch(
+    arms: List[Any],
+    tests: Dict[Any, Predicate],
+) -> Tuple[Optional[Callable[[dict], Optional[Predicate]]], Tuple[Any, ...]]:
+    """
+        build function which picks the only TypedDict from 'arms' that may match dict value
+        return the function and TypedDicts it covers
+    """
+    if (table := dispatch_table(arms)) is None:
+        return None, ()
+    key, arms_index = table
+    index = {tag: tests[arm] for tag, arm in arms_index.items()}
+    covered = tuple(dict.fromkeys(arms_index.values()))
+    if key is None:
+        return (lambda value: index.get(frozenset(value))), covered
+
+    def dispatch(value: dict) -> Optional[Predicate]:
+        try:
+            return index.get(value.get(key, MISSING))
+        except TypeError:
+            return None
+    return dispatch, covered
+
+
+def compile_union(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    tests = {arg: compile_predicate(arg, sample) for arg in classify(typo).args}
+    if always in tests.values():
+        return always
+    exact = frozenset(arg for arg in tests if isinstance(arg, type) and not is_typed_dict(arg))
+    dispatch, covered = compile_dispatch([arg for arg in tests if is_typed_dict(arg)], tests)
+    rest = tuple(test for arg, test in tests.items() if arg not in covered)
+
+    if dispatch is None:
+        if len(rest) == 2 and type(None) in exact:
+            test = rest[0] if rest[1] is tests[type(None)] else rest[1]
+            return lambda value: value is None or test(value)
+        return lambda value: type(value) in exact or any(test(value) for test in rest)
+
+    def test_indexed(value: Any) -> bool:
+        if type(value) in exact:
+            return True
+        if isinstance(value, dict) and (test := dispatch(value)) is not None and test(value):
+            return True
+        for test in rest:
+            if test(value):
+                return True
+        return False
+    return test_indexed
+
+
+def literal_table(values: Tuple[Any, ...]) -> Dict[type, Any]:
+    """
+        group Literal values by exact type: {type: frozenset of values},
+        so True does not match Literal[1] and 1.0 does not match Literal[1]
+        unhashable values are kept in tuples
+    """
+    groups = {}  # type: Dict[type, List[Any]]
+    for value in values:
+        groups.setdefault(type(value), []).append(value)
+    table = {}  # type: Dict[type, Any]
+    for value_type, group in groups.items():
+        try:
+            table[value_type] = frozenset(group)
+        except TypeError:
+            table[value_type] = tuple(group)
+    return table
+
+
+def compile_literal(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    table = literal_table(classify(typo).args)
+    if len(table) == 1:
+        (value_type, values), = table.items()
+        return lambda value: type(value) is value_type and value in values
+    return lambda value: (values := table.get(type(value))) is not None and value in values
+
+
+def compile_items(item_type: Any, sample: Optional['Sample'] = None) -> Optional[Predicate]:
+    """
+        build predicate for all items of iterable, None if any items match
+        items which must be instances of plain classes are checked by one scan of their types:
+        set(map(type, items)) runs in C and usually is a subset of types accepted before
+    """
+    if (test := compile_predicate(item_type, sample)) is always:
+        return None
+    if (classes := item_classes(item_type)) is None or not all(type(cls) is type for cls in classes):
+        return lambda items: all(map(test, items))
+    accepted = set()  # type: set
+
+    def check_types(items: Iterable[Any]) -> bool:
+        if (types := set(map(type, items))) <= accepted:
+            return True
+        for cls in types - accepted:
+            if not issubclass(cls, classes):
+                return False
+            if len(accepted) < MAX_ACCEPTED:
+                accepted.add(cls)
+        return True
+    return check_types
+
+
+def compile_list(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    origin, args = (info := classify(typo)).origin, info.args
+    if not args or (check := compile_items(args[0], sample)) is None:
+        return lambda value: isinstance(value, origin)
+    if sample is not None:
+        return lambda value: isinstance(value, origin) and check(sample.items(value))
+    return lambda value: isinstance(value, origin) and check(value)
+
+
+def compile_tuple(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    if not (args := classify(typo).args):
+        return lambda value: isinstance(value, tuple)
+    if len(args) == 1 or (len(args) == 2 and args[1] is ...):
+        return compile_list(typo, sample)
+    tests = tuple(compile_predicate(arg, sample) for arg in args)
+    size = len(tests)
+    return lambda value: (
+        isinstance(value, tuple) and len(value) == size and all(test(i) for test, i in zip(tests, value))
+    )
+
+
+def compile_sequence(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    """
+        typed buffers (bytes, array.array, memoryview) are checked by typecode in O(1)
+        if items must be instances of some classes
+    """
+    origin, args = (info := classify(typo)).origin, info.args
+    if not args or (check := compile_items(args[0], sample)) is None:
+        return lambda value: is_sequence(value, origin)
+    classes = item_classes(args[0])
+    items = (lambda value: value) if sample is None else sample.items
+
+    def test_sequence(value: Any) -> bool:
+        if not is_sequence(value, origin):
+            return False
+        if classes is not None and (item_type := buffer_item_type(value)) is not None:
+            return issubclass(item_type, classes) or not len(value)
+        return check(items(value))
+    return test_sequence
+
+
+def compile_collection(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    """
+        sets, Collection[T] and Iterable[T]
+        one-shot iterators are not consumed: only the iterator itself is checked
+    """
+    origin, args = (info := classify(typo)).origin, info.args
+    if not args or (check := compile_items(args[0], sample)) is None:
+        return lambda value: isinstance(value, origin)
+    if sample is None:
+        items = lambda value: value  # noqa: E731
+    else:
+        items = lambda value: sample.items(value) if hasattr(value, '__len__') else value  # noqa: E731
+    if origin is set or origin is frozenset:
+        return lambda value: isinstance(value, origin) and check(items(value))
+    return lambda value: isinstance(value, origin) and (iter(value) is value or check(items(value)))
+
+
+def compile_dict(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    origin, args = (info := classify(typo)).origin, info.args
+    if not args:
+        return lambda value: isinstance(value, origin)
+    key_check = compile_items(args[0], sample)
+    value_check = compile_items(args[1], sample)
+    items = (lambda value: value) if sample is None else sample.items
+    if key_check is None and value_check is None:
+        return lambda value: isinstance(value, origin)
+    if key_check is None:
+        return lambda value: isinstance(value, origin) and value_check(items(value.values()))
+    if value_check is None:
+        return lambda value: isinstance(value, origin) and key_check(items(value.keys()))
+    if sample is None:
+        return lambda value: isinstance(value, origin) and key_check(value.keys()) and value_check(value.values())
+    key_test = compile_predicate(args[0], sample)
+    value_test = compile_predicate(args[1], sample)
+    return lambda value: isinstance(value, origin) and all(
+        key_test(i) and value_test(j)
+        for i, j in items(value.items())
+    )
+
+
+def compile_typeddict(typo: Any, sample: Optional['Sample'] = None) -> Predicate:
+    layout = typeddict_layout(typo)
+    tests = {key: compile_predicate(key_type, sample) for key, key_type in layout.fields.items()}
+    if not layout.closed and not layout.required:
+        def test_partial(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for key, item in value.items():
+                if key in tests and not tests[key](item):
+                    return False
+            return True
+        return test_partial
+
+    size = len(tests)
+    if layout.closed and not layout.optional:
+        def test_total(value: Any) -> bool:
+            if not isinstance(value, dict) or len(value) != size:
+                return False
+            for key, item in value.items():
+                if key not in tests or not tests[key](item):
+                    return False
+            return True
+        return test_total
+
+    required, closed = layout.required, layout.closed
+
+    def test_layout(value: Any) -> bool:
+        if not isinstance(value, dict) or (closed and len(value) > size) or not required <= value.keys():
+            return False
+        for key, item in value.items():
+            if (test := tests.get(key)) is None:
+                if closed:
+                    return False
+            elif not test(item):
+                return False
+        return True
+    return test_layout
+
+
+def compile_fallback(typo: Any) -> Predicate:
+    handler = SUPPORTED_TYPOS[classify(typo).origin]
+    return lambda value: handler(value, typo)[0]
+
+
+COMPILERS = {
+    Union: compile_union,
+    Literal: compile_literal,
+    list: compile_list,
+    tuple: compile_tuple,
+    dict: compile_dict,
+    abc.Sequence: compile_sequence,
+    abc.MutableSequence: compile_sequence,
+    abc.Mapping: compile_dict,
+    abc.MutableMapping: compile_dict,
+    set: compile_collection,
+    frozenset: compile_collection,
+    abc.Set: compile_collection,
+    abc.MutableSet: compile_collection,
+    abc.Collection: compile_collection,
+    abc.Iterable: compile_collection,
+}  # type: Dict[Any, Callable[[Any, Optional[Sample]], Predicate]]
+
+
+def compile_type(value_type: Any, sample: Optional['Sample'] = None) -> Predicate:
+    info = classify(value_type)
+    if (kind := info.kind) == CLASS or kind == TYPES:
+        return lambda value: isinstance(value, value_type)
+    if info.origin is not None:
+        if (compiler := COMPILERS.get(info.origin)) is not None:
+            return compiler(value_type, sample)
+        if info.origin in SUPPORTED_TYPOS:
+            return compile_fallback(value_type)
+    elif kind == TYPEDDICT:
+        return compile_typeddict(value_type, sample)
+    elif kind == OTHER and value_type in SUPPORTED_ALIASES:
+        alias = SUPPORTED_ALIASES[value_type]
+        return lambda value: alias(value, value_type)[0]
+    return always
+
+
+CHECKER_CACHE = LRUCache(maxsize=4096)
+# the same checkers by id(type): found without hashing typing aliases,
+# referenced weakly, so checkers evicted from CHECKER_CACHE (and their types) can be collected
+_by_id = {}  # type: Dict[int, weakref.KeyedRef]
+_state = threading.local()
+
+
+def _forget_checker(ref: weakref.KeyedRef) -> None:
+    if _by_id.get(ref.key) is ref:
+        del _by_id[ref.key]
+
+
+def _remember(value_type: Any, checker: Checker) -> None:
+    _by_id[id(value_type)] = weakref.KeyedRef(checker, _forget_checker, id(value_type))
+
+
+def compile(value_type: Any, sample: Optional['Sample'] = None) -> Checker:
+    """
+        analyze 'value_type' once and return reusable Checker
+        results are memoized per type (and sampling policy) in CHECKER_CACHE (LRU),
+        see compile.cache_info() and compile.cache_clear(),
+        recursive TypedDicts refer to their own checker lazily
+        Example:
+            checker = compile(List[int])
+            checker.test([1, 2, 3]) -> True
+            checker(['1']) -> (False, 'for "1" expected type ...')
+    """
+    if (
+        sample is None and (ref := _by_id.get(id(value_type))) is not None
+        and (checker := ref()) is not None and checker.type is value_type
+    ):
+        return checker
+    key = value_type if sample is None else (value_type, sample)
+    try:
+        checker = CHECKER_CACHE.get(key)
+    except TypeError:
+        return Checker(value_type, compile_type(value_type, sample))
+    if checker is not None:
+        if sample is None:
+            _remember(value_type, checker)
+        return checker
+    if (building := getattr(_state, 'building', None)) is None:
+        building = _state.building = {}
+    if (cell := building.get(key)) is not None:
+        return Checker(value_type, lambda value: cell[0].test(value))
+    building[key] = cell = []
+    try:
+        checker = Checker(value_type, compile_type(value_type, sample))
+    finally:
+        del building[key]
+    cell.append(checker)
+    CHECKER_CACHE.put(key, checker)
+    if sample is None:
+        _remember(value_type, checker)
+    return checker
+
+
+def clear_cache() -> None:
+    CHECKER_CACHE.clear()
+    _by_id.clear()
+
+
+compile.cache_info = CHECKER_CACHE.cache_info  # type: ignore
+compile.cache_clear = clear_cache  # type: ignore
+
+
+def compile_predicate(value_type: Any, sample: Optional['Sample'] = None) -> Predicate:
+    return compile(value_type, sample).test
+
+
+ENGINES = {
+    'closure': compile,
+}  # type: Dict[str, Callable[[Any], Checker]]
@@ -0,0 +1,57 @@
+from reprlib import Repr
+from typing import Any, Optional, Tuple
+
+
+class ShortRepr(Repr):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.maxstring = 80
+        self.maxother = 80
+
+    def repr_str(self, x: str, level: int) -> str:
+        # only top level string is shown without quotes, nested ones are shown as repr() does
+        if level < self.maxlevel:
+            return super().repr_str(x, level)
+        if len(x) > self.maxstring:
+            i = max(0, (self.maxstring - 3) // 2)
+            j = max(0, self.maxstring - 3 - i)
+            return x[:i] + '...' + x[len(x) - j:]
+        return x
+
+
+short_repr = ShortRepr()
+
+
+class ErrorMessage:
+    """
+        lazy error message
+        formatting is postponed until str() is called,
+        large values are truncated in reprlib style
+    """
+
+    __slots__ = ('fmt', 'args', '_text')
+
+    def __init__(self, fmt: str, *args: Any) -> None:
+        self.fmt = fmt
+        self.args = args  # type: Tuple[Any, ...]
+        self._text = None  # type: Optional[str]
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.fmt % tuple(
+                str(arg) if isinstance(arg, ErrorMessage) else short_repr.repr(arg)
+                for arg in self.args
+            )
+        return self._text
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (str, ErrorMessage)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
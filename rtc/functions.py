@@ -0,0 +1,229 @@
+import inspect
+import random
+from collections import abc
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, get_type_hints
+
+from .compiler import Explanation, Predicate, always, compile
+from .errors import ErrorMessage
+
+GENERATORS = (abc.Generator, abc.Iterator, abc.Iterable, abc.AsyncGenerator, abc.AsyncIterator, abc.AsyncIterable)
+
+
+def annotations_of(func: Callable[..., Any]) -> Dict[str, Any]:
+    try:
+        return get_type_hints(func)
+    except Exception:
+        return getattr(func, '__annotations__', {})
+
+
+def generator_args(return_type: Any) -> Tuple[Any, Any, Any]:
+    """
+        (yield type, send type, return type) from Generator / Iterator / Iterable annotations,
+        Any for parts which are not annotated
+    """
+    if getattr(return_type, '__origin__', None) not in GENERATORS or not return_type.__args__:
+        return Any, Any, Any
+    args = return_type.__args__
+    return args[0], args[1] if len(args) > 1 else Any, args[2] if len(args) > 2 else Any
+
+
+def raise_error(fmt: str, value: Any, value_type: Any, *args: Any) -> None:
+    raise TypeError(ErrorMessage(fmt, *args, Explanation(value, value_type)))
+
+
+def checked_generator(
+    generator: Generator[Any, Any, Any],
+    yield_test: Predicate,
+    yield_type: Any,
+    send_test: Predicate,
+    send_type: Any,
+    return_test: Predicate,
+    return_type: Any,
+) -> Generator[Any, Any, Any]:
+    """
+        proxy 'generator' checking yielded, sent and returned values,
+        sent None is not checked since it's what iteration by next() sends
+    """
+    step = generator.send
+    sent = None
+    while True:
+        try:
+            item = step(sent)
+        except StopIteration as e:
+            if not return_test(e.value):
+                raise_error('return value, %s', e.value, return_type)
+            return e.value
+        if not yield_test(item):
+            raise_error('yielded value, %s', item, yield_type)
+        try:
+            sent = yield item
+        except GeneratorExit:
+            generator.close()
+            raise
+        except BaseException as e:
+            step, sent = generator.throw, e
+        else:
+            # next() sends None, so None is accepted whatever send type is
+            if sent is not None and not send_test(sent):
+                raise_error('sent value, %s', sent, send_type)
+            step = generator.send
+
+
+ASYNC_GENERATOR = '''
+    _rtc_agen = _rtc_func(%s)
+    _rtc_next = _rtc_agen.asend(None)
+    while True:
+        try:
+            _rtc_item = await _rtc_next
+        except StopAsyncIteration:
+            return
+        if _rtc_check and not _rtc_test_yield(_rtc_item):
+            _rtc_raise('yielded value, %%s', _rtc_item, _rtc_type_yield)
+        try:
+            _rtc_sent = yield _rtc_item
+        except GeneratorExit:
+            await _rtc_agen.aclose()
+            raise
+        except BaseException as _rtc_error:
+            _rtc_next = _rtc_agen.athrow(_rtc_error)
+        else:
+            if _rtc_check and _rtc_sent is not None and not _rtc_test_send(_rtc_sent):
+                _rtc_raise('sent value, %%s', _rtc_sent, _rtc_type_send)
+            _rtc_next = _rtc_agen.asend(_rtc_sent)
+'''
+
+
+def gen_wrapper(func: Callable[..., Any], sample_rate: float) -> Callable[..., Any]:
+    """
+        generate wrapper with the same parameters as 'func',
+        so arguments are bound by python itself instead of inspect.signature per call
+    """
+    hints = annotations_of(func)
+    namespace = {
+        '_rtc_func': func,
+        '_rtc_raise': raise_error,
+        '_rtc_random': random.random,
+        '_rtc_rate': sample_rate,
+    }  # type: Dict[str, Any]
+    params, call, checks = [], [], []  # type: List[str], List[str], List[str]
+    star = False
+    parameters = list(inspect.signature(func).parameters.values())
+    for idx, param in enumerate(parameters):
+        name = param.name
+        if param.kind is param.VAR_POSITIONAL:
+            params.append('*' + name)
+            call.append('*' + name)
+            star = True
+        elif param.kind is param.VAR_KEYWORD:
+            params.append('**' + name)
+            call.append('**' + name)
+        else:
+            if param.kind is param.KEYWORD_ONLY and not star:
+                params.append('*')
+                star = True
+            if param.default is param.empty:
+                params.append(name)
+            else:
+                namespace['_rtc_default_%d' % idx] = param.default
+                params.append('%s=_rtc_default_%d' % (name, idx))
+            call.append('%s=%s' % (name, name) if param.kind is param.KEYWORD_ONLY else name)
+            if param.kind is param.POSITIONAL_ONLY and (
+                idx + 1 == len(parameters) or parameters[idx + 1].kind is not param.POSITIONAL_ONLY
+            ):
+                params.append('/')
+        if name not in hints or (test := compile(hints[name]).test) is always:
+            continue
+        namespace['_rtc_test_%d' % idx] = test
+        namespace['_rtc_type_%d' % idx] = hints[name]
+        if param.kind is param.VAR_POSITIONAL:
+            checks += [
+                '    for _rtc_item in %s:' % name,
+                '        if not _rtc_test_%d(_rtc_item):' % idx,
+                '            _rtc_raise(\'arg "%%s", %%s\', _rtc_item, _rtc_type_%d, \'*%s\')' % (idx, name),
+            ]
+        elif param.kind is param.VAR_KEYWORD:
+            checks += [
+                '    for _rtc_key, _rtc_item in %s.items():' % name,
+                '        if not _rtc_test_%d(_rtc_item):' % idx,
+                '            _rtc_raise(\'arg "%%s", %%s\', _rtc_item, _rtc_type_%d, _rtc_key)' % idx,
+            ]
+        else:
+            condition = 'not _rtc_test_%d(%s)' % (idx, name)
+            if param.default is not param.empty:
+                condition = '%s is not _rtc_default_%d and %s' % (name, idx, condition)
+            checks += [
+                '    if %s:' % condition,
+                '        _rtc_raise(\'arg "%%s", %%s\', %s, _rtc_type_%d, %r)' % (name, idx, name),
+            ]
+
+    call_source = ', '.join(call)
+    return_type = hints.get('return', Any)
+    if inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func):
+        for part, part_type in zip(('yield', 'send', 'return'), generator_args(return_type)):
+            namespace['_rtc_test_' + part] = compile(part_type).test
+            namespace['_rtc_type_' + part] = part_type
+    else:
+        namespace['_rtc_test_return'] = compile(return_type).test
+        namespace['_rtc_type_return'] = return_type
+
+    if inspect.isasyncgenfunction(func):
+        header, body = 'async def', (ASYNC_GENERATOR % call_source).strip('\n').split('\n')
+        if sample_rate < 1:
+            checks = ['    _rtc_check = _rtc_random() < _rtc_rate', '    if _rtc_check:', *('    ' + i for i in checks)]
+            checks.append('        pass')
+        else:
+            checks.insert(0, '    _rtc_check = True')
+        skip = []  # type: List[str]
+    elif inspect.isgeneratorfunction(func):
+        namespace['_rtc_checked'] = checked_generator
+        header, body = 'def', [
+            '    return (yield from _rtc_checked(',
+            '        _rtc_func(%s),' % call_source,
+            '        _rtc_test_yield, _rtc_type_yield, _rtc_test_send, _rtc_type_send,',
+            '        _rtc_test_return, _rtc_type_return,',
+            '    ))',
+        ]
+        skip = ['        return (yield from _rtc_func(%s))' % call_source]
+    else:
+        header, result = 'def', '_rtc_func(%s)' % call_source
+        if inspect.iscoroutinefunction(func):
+            header, result = 'async def', 'await ' + result
+        body = ['    _rtc_result = %s' % result]
+        if namespace['_rtc_test_return'] is not always:
+            body += [
+                '    if not _rtc_test_return(_rtc_result):',
+                '        _rtc_raise(\'return value, %s\', _rtc_result, _rtc_type_return)',
+            ]
+        body.append('    return _rtc_result')
+        skip = ['        return %s' % result]
+
+    lines = ['%s _rtc_wrapper(%s):' % (header, ', '.join(params))]
+    if sample_rate < 1 and skip:
+        lines += ['    if _rtc_random() >= _rtc_rate:', *skip]
+    lines += checks + body
+    exec('\n'.join(lines), namespace)
+    return update_wrapper(namespace['_rtc_wrapper'], func)
+
+
+def typechecked(func: Optional[Callable[..., Any]] = None, /, sample_rate: float = 1.0) -> Any:
+    """
+        check annotated arguments and return value of function on every call
+        annotations are compiled once, wrapper has the same signature as function,
+        async functions, generators (yielded, sent and returned values) and async generators are supported
+        sample_rate=0.01 checks about 1% of calls, the rest are passed through as is
+        Example:
+            @typechecked(sample_rate=0.01)
+            def handle(event: Event, retries: int = 3) -> Optional[str]:
+                ...
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError('sample_rate must be in [0, 1], got %s' % sample_rate)
+
+    def wrap(func: Any) -> Any:
+        if isinstance(func, (classmethod, staticmethod)):
+            return type(func)(gen_wrapper(func.__func__, sample_rate))
+        return gen_wrapper(func, sample_rate)
+    if func is not None:
+        return wrap(func)
+    return wrap
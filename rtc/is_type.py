@@ -1,49 +1,68 @@
 
 import asyncio
-from typing import Tuple, List, Dict, Any, Optional, Union, Callable, TypeVar
+import inspect
+import keyword
+import weakref
+from copy import deepcopy
+from functools import partial
+from types import MemberDescriptorType, MethodType
+from typing import (
+    TYPE_CHECKING, Tuple, List, Dict, Any, NamedTuple, Optional, Union, Callable, TypeVar, Literal, get_type_hints,
+)
 from collections import abc
 
+from .buffers import buffer_item_type, is_sequence, item_classes
+from .errors import ErrorMessage
+from .metrics import instrumentation
 from .subtype import is_subtype
-from .tools import is_typed_dict
+from .tools import CLASS, OTHER, TYPEDDICT, TYPES, classify, forget, typeddict_layout
+
+if TYPE_CHECKING:
+    from .sampling import Sample
 
 T = TypeVar('T')
 
-CheckerType = Tuple[bool, Optional[str]]
+CheckerType = Tuple[bool, Optional[Union[str, ErrorMessage]]]
 
 
 def check_union(value: T, typo: Any) -> CheckerType:
-    for type_ in typo.__args__:
-        if check_type(value, type_)[0]:
-            return True, None
-    return False, 'expected value any type of [%s], got "%s"' % (typo.__args__, value)
+    if compile(typo).test(value):
+        return True, None
+    return False, ErrorMessage('expected value any type of [%s], got "%s"', typo.__args__, value)
+
+
+def check_literal(value: T, typo: Any) -> CheckerType:
+    if compile(typo).test(value):
+        return True, None
+    return False, ErrorMessage('expected one of %s, got "%s"', typo.__args__, value)
 
 
 def check_list(value: T, typo: Any) -> CheckerType:
     if isinstance(typo, type) and not isinstance(value, typo):
-        return False, 'expected "%s", got "%s"' % (typo, type(value))
+        return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
     if hasattr(typo, '__origin__'):
         if not isinstance(value, typo.__origin__):
-            return False, 'expected "%s", got "%s"' % (typo, type(value))
+            return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
         if typo.__args__:
             for i in value:
-                if not (res := check_type(i, typo.__args__))[0]:
+                if not (res := check_type(i, typo.__args__[0]))[0]:
                     return res
     return True, None
 
 
 def check_tuple(value: T, typo: Any) -> CheckerType:
     if isinstance(typo, type) and not isinstance(value, typo):
-        return False, 'expected "%s", got "%s"' % (typo, type(value))
+        return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
     if hasattr(typo, '__origin__'):
         if not isinstance(value, typo.__origin__):
-            return False, 'expected "%s", got "%s"' % (typo, type(value))
+            return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
         if typo.__args__:
-            if len(typo.__args__) == 1:
+            if len(typo.__args__) == 1 or (len(typo.__args__) == 2 and typo.__args__[1] is ...):
                 for i in value:
-                    if not (res := check_type(i, typo.__args__))[0]:
+                    if not (res := check_type(i, typo.__args__[0]))[0]:
                         return res
             elif len(typo.__args__) != len(value):
-                return False, 'expected "%s", got "%s"' % (typo, str(value))
+                return False, ErrorMessage('expected "%s", got "%s"', typo, value)
             else:
                 for i in range(len(value)):
                     if not (res := check_type(value[i], typo.__args__[i]))[0]:
@@ -51,156 +70,432 @@ def check_tuple(value: T, typo: Any) -> CheckerType:
     return True, None
 
 
+def check_sequence(value: T, typo: Any) -> CheckerType:
+    if not is_sequence(value, typo.__origin__):
+        return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
+    if not typo.__args__:
+        return True, None
+    item_type = typo.__args__[0]
+    if (buffer_type := buffer_item_type(value)) is not None and (classes := item_classes(item_type)) is not None:
+        if not len(value) or issubclass(buffer_type, classes):
+            return True, None
+        return False, ErrorMessage('expected "%s", got buffer of "%s"', typo, buffer_type)
+    for i in value:
+        if not (res := check_type(i, item_type))[0]:
+            return res
+    return True, None
+
+
+def check_collection(value: T, typo: Any) -> CheckerType:
+    if not isinstance(value, typo.__origin__):
+        return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
+    if typo.__args__ and iter(value) is not value:
+        for i in value:
+            if not (res := check_type(i, typo.__args__[0]))[0]:
+                return res
+    return True, None
+
+
 def check_dict(value: T, typo: Any) -> CheckerType:
     if isinstance(typo, type) and not isinstance(value, typo):
-        return False, 'expected "%s", got "%s"' % (typo, type(value))
+        return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
     elif hasattr(typo, '__origin__'):
         if not isinstance(value, typo.__origin__):
-            return False, 'expected "%s", got "%s"' % (typo, type(value))
+            return False, ErrorMessage('expected "%s", got "%s"', typo, type(value))
         for i, j in value.items():
             if not (res := check_type(i, typo.__args__[0]))[0]:
-                return False, 'key "%s", %s' % (i, res[1])
+                return False, ErrorMessage('key "%s", %s', i, res[1])
             if not (res := check_type(j, typo.__args__[1]))[0]:
-                return False, 'value for key "%s", %s' % (i, res[1])
+                return False, ErrorMessage('value for key "%s", %s', i, res[1])
     return True, None
 
 
+EMPTY = inspect.Parameter.empty
+
+
+class CallSignature(NamedTuple):
+    """
+        parameters of callable as they are matched with Callable[[...], R]:
+        positional - (name, annotation) of parameters which may be passed positionally,
+        required - how many of them have no default,
+        star - (name, annotation) of *args, if any,
+        keyword_required - there are keyword-only parameters without defaults,
+        annotations are EMPTY if parameter is not annotated
+    """
+    signature: inspect.Signature
+    positional: Tuple[Tuple[str, Any], ...]
+    required: int
+    star: Optional[Tuple[str, Any]]
+    keyword_required: bool
+    returns: Any
+
+
+def call_signature(value: Any) -> Optional[CallSignature]:
+    """
+        inspect.signature() of 'value' reduced to what Callable[...] can describe,
+        partials, bound methods and builtins are supported,
+        string annotations of python functions are resolved, unresolvable ones are treated as missing,
+        None if signature is not available (e.g. builtins like print)
+    """
+    try:
+        signature = inspect.signature(value)
+    except (TypeError, ValueError):
+        return None
+    hints = None  # type: Optional[Dict[str, Any]]
+
+    def annotation(name: str, raw: Any) -> Any:
+        nonlocal hints
+        if not isinstance(raw, str):
+            return raw
+        if hints is None:
+            target = value
+            while isinstance(target, partial):
+                target = target.func
+            try:
+                hints = get_type_hints(getattr(target, '__func__', target))
+            except Exception:
+                hints = {}
+        return hints.get(name, EMPTY)
+
+    positional, required, star, keyword_required = [], 0, None, False  # type: List[Tuple[str, Any]], int, Any, bool
+    for param in signature.parameters.values():
+        if param.kind is param.POSITIONAL_ONLY or param.kind is param.POSITIONAL_OR_KEYWORD:
+            positional.append((param.name, annotation(param.name, param.annotation)))
+            required += param.default is EMPTY
+        elif param.kind is param.VAR_POSITIONAL:
+            star = ('*' + param.name, annotation(param.name, param.annotation))
+        elif param.kind is param.KEYWORD_ONLY and param.default is EMPTY:
+            keyword_required = True
+    return CallSignature(
+        signature,
+        tuple(positional),
+        required,
+        star,
+        keyword_required,
+        annotation('return', signature.return_annotation),
+    )
+
+
+def check_signature(sig: CallSignature, typo: Any) -> CheckerType:
+    *arg_types, return_type = typo.__args__
+    if arg_types != [...]:
+        if (
+            sig.keyword_required
+            or len(arg_types) < sig.required
+            or (len(arg_types) > len(sig.positional) and sig.star is None)
+        ):
+            return False, ErrorMessage(
+                'signature "%s" does not accept %s positional args', sig.signature, len(arg_types),
+            )
+        for idx, arg_type in enumerate(arg_types):
+            name, arg_annotation = sig.positional[idx] if idx < len(sig.positional) else sig.star
+            if arg_annotation is not EMPTY and not is_subtype(arg_annotation, arg_type):
+                return False, ErrorMessage('arg "%s" is type of "%s", expected %s', name, arg_annotation, arg_type)
+    if sig.returns is not EMPTY and not is_subtype(sig.returns, return_type):
+        return False, ErrorMessage('return value is type of "%s", expected %s', sig.returns, return_type)
+    return True, None
+
+
+# id of function -> (weak reference to it, its signature, results by id of Callable[...] type)
+_callables = {}  # type: Dict[Tuple[int, bool], Tuple[Any, Optional[CallSignature], Dict[int, Tuple[Any, CheckerType]]]]
+
+
 def check_callable(value: T, typo: Any) -> CheckerType:
+    """
+        signature of callable is inspected once and results are kept per Callable[...] type,
+        both are dropped when callable is collected,
+        bound methods share signature of their function, callables which can not be weakly referenced are not cached
+    """
     if not callable(value):
-        return False, 'expected callable, got "%s"' % value
-    if typo.__args__ and hasattr(value, '__annotations__'):
-        for idx in range(value.__code__.co_argcount):
-            if (var_name := value.__code__.co_varnames[idx]) in value.__annotations__:
-                if not is_subtype(value.__annotations__[var_name], typo.__args__[idx]):
-                    return (
-                        False,
-                        'arg "%s" is type of "%s", expected %s' % (
-                            var_name,
-                            value.__annotations__[var_name],
-                            typo.__args__[idx],
-                        ),
-                    )
-            if 'return' in value.__annotations__ and not is_subtype(value.__annotations__['return'], typo.__args__[-1]):
-                return (
-                    False,
-                    'return value is type of "%s", expected %s' % (
-                        value.__annotations__['return'],
-                        typo.__args__[idx],
-                    ),
-                )
-    return True, None
+        return False, ErrorMessage('expected callable, got "%s"', value)
+    if not typo.__args__:
+        return True, None
+    bound = type(value) is MethodType
+    target = value.__func__ if bound else value  # type: ignore
+    key = (id(target), bound)
+    if (entry := _callables.get(key)) is None or entry[0]() is not target:
+        sig = call_signature(value)
+        try:
+            entry = _callables[key] = weakref.ref(target, partial(forget, _callables, key)), sig, {}
+        except TypeError:
+            return (True, None) if sig is None else check_signature(sig, typo)
+    if (found := entry[2].get(id(typo))) is not None and found[0] is typo:
+        return found[1]
+    result = (True, None) if entry[1] is None else check_signature(entry[1], typo)  # type: CheckerType
+    entry[2][id(typo)] = (typo, result)
+    return result
 
 
 def check_alias(attr: str) -> Callable[[T, Any], CheckerType]:
     return (
         lambda value, typo: (
             bool(getattr(value, attr, None)),
-            'expected obj with method "%s()", got "%s"' % (attr, value),
+            ErrorMessage('expected obj with method "%s()", got "%s"', attr, value),
         )
     )
 
 
 def check_typeddict(value: T, value_type: Any) -> CheckerType:
     if not isinstance(value, dict):
-        return False, 'expected dict, got "%s"' % type(value)
-    checked = set()
-    for key, value in value.items():
-        if key in value_type.__annotations__:
-            res = check_type(value, value_type.__annotations__[key])
-            if not res[0]:
-                return False, '%s in TypedDict["%s"]' % (res[1], key)
-            checked.add(key)
-        elif value_type.__total__:
-            return False, 'expected key "%s" type of "%s" in TypedDict' % (key, type(value))
-    if value_type.__total__ and (missed := (set(value_type.__annotations__) - checked)):
-        return False, 'fields "%s" missed in TypedDict' % ('","'.join(list(missed)))
+        return False, ErrorMessage('expected dict, got "%s"', type(value))
+    layout = typeddict_layout(value_type)
+    if layout.closed and not value.keys() <= layout.keys:
+        key = next(key for key in value if key not in layout.keys)
+        return False, ErrorMessage('expected key "%s" type of "%s" in TypedDict', key, type(value[key]))
+    fields = layout.fields
+    for key, item in value.items():
+        if key in fields and not (res := check_type(item, fields[key]))[0]:
+            return False, ErrorMessage('%s in TypedDict["%s"]', res[1], key)
+    if not layout.required <= value.keys():
+        missed = layout.required - value.keys()
+        return False, ErrorMessage('fields "%s" missed in TypedDict', '","'.join(map(str, sorted(missed))))
     return True, ''
 
 
 SUPPORTED_TYPOS = {
     Optional: check_union,
     Union: check_union,
+    Literal: check_literal,
     List: check_list,
     list: check_list,
     Tuple: check_tuple,
     tuple: check_tuple,
     Dict: check_dict,
     dict: check_dict,
+    abc.Sequence: check_sequence,
+    abc.MutableSequence: check_sequence,
+    abc.Mapping: check_dict,
+    abc.MutableMapping: check_dict,
+    set: check_collection,
+    frozenset: check_collection,
+    abc.Set: check_collection,
+    abc.MutableSet: check_collection,
+    abc.Collection: check_collection,
     Any: lambda *a, **b: (True, ''),
     abc.Callable: check_callable,
-    abc.Iterable: check_alias('__iter__'),
+    abc.Iterable: check_collection,
     abc.Sized: check_alias('__len__'),
     abc.Hashable: check_alias('__hash__'),
     abc.Reversible: check_alias('__reversed__'),
-    abc.Coroutine: lambda value, value_type: (asyncio.iscoroutine(value), 'Excpected Coroutine, got "%s"' % value),
+    abc.Coroutine: (
+        lambda value, value_type: (
+            asyncio.iscoroutine(value),
+            ErrorMessage('Excpected Coroutine, got "%s"', value),
+        )
+    ),
     abc.Generator: (
         lambda value, value_type: (
             bool(getattr(value, '__next__', None) and getattr(value, 'send', None)),
-            'Expected generator, got "%s"' % value,
+            ErrorMessage('Expected generator, got "%s"', value),
         )
     ),
 }  # type: Dict[Any, Callable[[T, Any], CheckerType]]
 
 SUPPORTED_ALIASES = {
-    callable: lambda *a, **b: (callable(a[0]), 'Expected callable obj, got "%s"' % a[0]),
+    callable: lambda *a, **b: (callable(a[0]), ErrorMessage('Expected callable obj, got "%s"', a[0])),
 }  # type: Dict[Any, Callable[[T, Any], CheckerType]]
 
 
 def check_type(value: T, value_type: Any) -> CheckerType:
-    if type(value_type) is tuple and len(value_type) == 1 and isinstance(value_type[0], type):
-        value_type = value_type[0]
-    if value_type in SUPPORTED_ALIASES:
-        if not (res := SUPPORTED_ALIASES[value_type](value, value_type))[0]:
-            return res
-    if (
-        (
-            isinstance(value_type, type)
-        ) or (
-            (
-                isinstance(value_type, tuple)
-            ) and (
-                all(isinstance(i, type) for i in value_type)
-            )
-        )
-    ) and (
-        not is_typed_dict(value_type)
-    ) and (
-        not isinstance(value, value_type)
-    ):
-        return False, 'for "%s" expected type "%s", got "%s"' % (value, value_type, type(value))
-    if hasattr(value_type, '__origin__'):
-        if value_type.__origin__ in SUPPORTED_TYPOS:
-            if not (res := SUPPORTED_TYPOS[value_type.__origin__](value, value_type))[0]:
+    info = classify(value_type)
+    if (kind := info.kind) == CLASS or kind == TYPES:
+        if not isinstance(value, value_type):
+            return False, ErrorMessage('for "%s" expected type "%s", got "%s"', value, value_type, type(value))
+    elif info.origin is not None:
+        if (handler := SUPPORTED_TYPOS.get(info.origin)) is not None:
+            if not (res := handler(value, value_type))[0]:
                 return res
-    elif is_typed_dict(value_type):
+    elif kind == TYPEDDICT:
         return check_typeddict(value, value_type)
+    elif kind == OTHER and value_type in SUPPORTED_ALIASES:
+        if not (res := SUPPORTED_ALIASES[value_type](value, value_type))[0]:
+            return res
     return True, None
 
 
-def is_type(value: Any, type: Any) -> bool:
-    return check_type(value, type)[0]
+def is_type(
+    value: Any,
+    type: Any,
+    engine: Optional[str] = None,
+    sample: Optional['Sample'] = None,
+    workers: Optional[int] = None,
+) -> bool:
+    if workers is not None:
+        if engine is not None or sample is not None:
+            raise ValueError('parallel mode is supported by default engine only')
+        test = lambda value: is_type_parallel(value, type, workers)  # noqa: E731
+    elif engine is None:
+        test = compile(type, sample).test
+    elif sample is not None:
+        raise ValueError('sampling is supported by default engine only')
+    else:
+        test = ENGINES[engine](type).test
+    if instrumentation.enabled:
+        return instrumentation.observe(test, value, type)
+    return test(value)
+
+
+MISSING = object()
+
 
+def is_mutable(value: Any) -> bool:
+    """
+        unhashable defaults (lists, dicts, sets, ...) are copied for every instance
+    """
+    return type(value).__hash__ is None
 
-def staticclass(cls=None, /, strict: bool = True):
+
+def reserved(name: str) -> bool:
+    """
+        names which can not be parameters of generated __init__
+    """
+    return name.startswith('_rtc_') or keyword.iskeyword(name) or not name.isidentifier()
+
+
+def plain_init(ant: Dict[str, Any], defaults: Dict[str, Any], strict: bool) -> Callable[..., None]:
+    """
+        __init__ with the same behaviour as generated one, used when field names are reserved
+    """
+    names = tuple(ant)
+    tests = {name: compile(typo).test for name, typo in ant.items()}
+
+    def __init__(self: Any, /, *args: Any, **kwargs: Any) -> None:
+        if len(args) > len(names):
+            raise TypeError(
+                '__init__() takes %d positional arguments but %d were given' % (len(names) + 1, len(args) + 1)
+            )
+        values = dict(zip(names, args))
+        for name, value in kwargs.items():
+            if name not in tests:
+                raise TypeError('__init__() got an unexpected keyword argument \'%s\'' % name)
+            if name in values:
+                raise TypeError('__init__() got multiple values for argument \'%s\'' % name)
+            values[name] = value
+        for name in names:
+            if name in values:
+                if not tests[name](value := values[name]):
+                    raise TypeError(Explanation(value, ant[name]))
+                setattr(self, name, value)
+            elif name in defaults:
+                value = defaults[name]
+                setattr(self, name, deepcopy(value) if is_mutable(value) else value)
+            elif strict:
+                raise TypeError('arg "%s" not passed' % name)
+    return __init__
+
+
+def gen_init(ant: Dict[str, Any], defaults: Dict[str, Any], strict: bool) -> Callable[..., None]:
+    if any(map(reserved, ant)):
+        return plain_init(ant, defaults, strict)
+    generator = CodeGenerator()
+    checks = {name: generator.check(name, typo) for name, typo in ant.items()}
+    if set(ant) & generator.names:
+        generator = CodeGenerator()
+        checks = {
+            name: '%s(%s)' % (generator.constant(compile(typo).test, '_rtc_test_'), name)
+            for name, typo in ant.items()
+            if compile(typo).test is not always
+        }
+    namespace = generator.namespace
+    namespace.update(_rtc_missing=MISSING, _rtc_explain=Explanation, _rtc_type_error=TypeError, _rtc_copy=deepcopy)
+    lines = ['def __init__(_rtc_self%s):' % ''.join(', %s=_rtc_missing' % name for name in ant)]
+    for idx, (name, typo) in enumerate(ant.items()):
+        body = []
+        if checks.get(name) is not None:
+            namespace['_rtc_type_%d' % idx] = typo
+            body += [
+                'if not %s:' % checks[name],
+                '    raise _rtc_type_error(_rtc_explain(%s, _rtc_type_%d))' % (name, idx),
+            ]
+        body.append('_rtc_self.%s = %s' % (name, name))
+        if name in defaults:
+            namespace['_rtc_default_%d' % idx] = defaults[name]
+            default = ('_rtc_copy(_rtc_default_%d)' if is_mutable(defaults[name]) else '_rtc_default_%d') % idx
+            lines += [
+                '    if %s is _rtc_missing:' % name,
+                '        _rtc_self.%s = %s' % (name, default),
+                '    else:',
+                *('        ' + line for line in body),
+            ]
+        elif strict:
+            lines += [
+                '    if %s is _rtc_missing:' % name,
+                '        raise _rtc_type_error(\'arg "%s" not passed\')' % name,
+                *('    ' + line for line in body),
+            ]
+        else:
+            lines += [
+                '    if %s is not _rtc_missing:' % name,
+                *('        ' + line for line in body),
+            ]
+    if len(lines) == 1:
+        lines.append('    pass')
+    exec('\n\n'.join([*generator.sources, '\n'.join(lines)]), namespace)
+    return namespace['__init__']
+
+
+def rebind_class_cells(old: type, new: type) -> type:
+    """
+        point __class__ cells of methods (used by zero-arg super()) from 'old' class to 'new' one
+        Example:
+            cls = rebind_class_cells(cls, type(cls)(cls.__name__, cls.__bases__, namespace))
+    """
+    for item in new.__dict__.values():
+        if isinstance(item, (classmethod, staticmethod)):
+            funcs = [item.__func__]
+        elif isinstance(item, property):
+            funcs = [item.fget, item.fset, item.fdel]
+        else:
+            funcs = [item]
+        for func in funcs:
+            for cell in getattr(func, '__closure__', None) or ():
+                try:
+                    if cell.cell_contents is old:
+                        cell.cell_contents = new
+                except ValueError:  # empty cell
+                    pass
+    return new
+
+
+def staticclass(cls=None, /, strict: bool = True, slots: bool = False):
+    """
+        generate type-checking __init__ for class with annotated fields
+        fields can be passed positionally (in annotation order) or by name,
+        class-level values are used as defaults, unhashable ones (lists, dicts, ...) are copied for every instance,
+        slots=True creates new class with __slots__ for own fields
+    """
     def wrap(cls):
-        def gen_init(ant: Dict[str, Any]) -> Callable[[Any], None]:
-            def init(self, /, **kwargs) -> None:
-                for arg_name, arg_type in ant.items():
-                    if arg_name in kwargs:
-                        if (res := check_type(kwargs[arg_name], arg_type))[0]:
-                            setattr(self, arg_name, kwargs[arg_name])
-                        else:
-                            raise TypeError(res[1])
-                    elif strict:
-                        raise TypeError('arg "%s" not passed' % arg_name)
-            return init
         ans = {}
         for _cls in cls.__mro__[::-1]:
             if hasattr(_cls, '__annotations__'):
                 ans.update(_cls.__annotations__)
+        defaults = {
+            name: value
+            for name in ans
+            if not isinstance(value := getattr(cls, name, MISSING), MemberDescriptorType) and value is not MISSING
+        }
 
-        setattr(cls, '__init__', gen_init(ans))
+        if slots:
+            inherited = {name for _cls in cls.__mro__[1:] for name in getattr(_cls, '__slots__', ())}
+            namespace = {
+                key: value
+                for key, value in cls.__dict__.items()
+                if key not in ans and key not in ('__dict__', '__weakref__')
+            }
+            namespace['__slots__'] = tuple(name for name in ans if name not in inherited)
+            namespace['__qualname__'] = cls.__qualname__
+            cls = rebind_class_cells(cls, type(cls)(cls.__name__, cls.__bases__, namespace))
+
+        init = gen_init(ans, defaults, strict)
+        init.__qualname__ = '%s.__init__' % cls.__qualname__
+        setattr(cls, '__init__', init)
+        instrumentation.register(cls)
         return cls
     if cls:
         return wrap(cls)
     return wrap
+
+
+from .compiler import ENGINES, Explanation, always, compile  # noqa: E402 compiler depends on the handlers above
+from .codegen import CodeGenerator  # noqa: E402
+from .parallel import is_type_parallel  # noqa: E402
@@ -0,0 +1,234 @@
+from typing import Any, List, Optional, Tuple, Union
+
+from .compiler import ENGINES, MISSING, Checker, Explanation, always, compile, compile_dispatch
+from .errors import ErrorMessage
+from .is_type import CheckerType
+from .tools import LRUCache, classify, is_typed_dict, typeddict_layout
+
+# plan kinds
+FLAT, SEQUENCE, TUPLE, MAPPING, TYPEDDICT, UNION = range(6)
+# work stack entries
+NODE, ITEMS, CHOICE = range(3)
+
+Plan = Tuple[Any, ...]
+Failure = Tuple[Any, Any, Optional[ErrorMessage]]
+
+PLAN_CACHE = LRUCache(maxsize=4096)
+_planning = set()  # type: set
+
+
+def plan(value_type: Any) -> Plan:
+    """
+        describe one level of 'value_type' for the iterative engine
+        types without nested containers are FLAT and checked at once by compiled checker,
+        nested types are referred to by type and planned when reached
+        plans are kept in PLAN_CACHE (LRU) by id(), since typing aliases are slow to hash
+    """
+    if (entry := PLAN_CACHE.get(id(value_type))) is not None and entry[0] is value_type:
+        return entry[1]
+    try:
+        hash(value_type)
+    except TypeError:
+        return build_plan(value_type)
+    _planning.add(value_type)
+    try:
+        result = build_plan(value_type)
+    finally:
+        _planning.discard(value_type)
+    PLAN_CACHE.put(id(value_type), (value_type, result))
+    return result
+
+
+def is_flat(value_type: Any) -> bool:
+    try:
+        if value_type in _planning:
+            return False
+    except TypeError:
+        pass
+    return plan(value_type)[0] == FLAT
+
+
+def build_plan(value_type: Any) -> Plan:
+    test = compile(value_type).test
+    if test is always:
+        return FLAT, test
+    if is_typed_dict(value_type):
+        layout = typeddict_layout(value_type)
+        fields = {
+            key: (key_type, compile(key_type).test if is_flat(key_type) else None)
+            for key, key_type in layout.fields.items()
+        }
+        if all(field_test is not None for _, field_test in fields.values()):
+            return FLAT, test
+        return TYPEDDICT, value_type, fields, layout
+    origin, args = (info := classify(value_type)).origin, info.args
+    if origin is list and args and not is_flat(args[0]):
+        return SEQUENCE, origin, args[0]
+    if origin is tuple and args and (len(args) == 1 or (len(args) == 2 and args[1] is ...)):
+        if not is_flat(args[0]):
+            return SEQUENCE, tuple, args[0]
+    elif origin is tuple and args and not all(map(is_flat, args)):
+        return TUPLE, value_type, args
+    if origin is dict and args and not (is_flat(args[0]) and is_flat(args[1])):
+        key_test = compile(args[0]).test if is_flat(args[0]) else None
+        value_test = compile(args[1]).test if is_flat(args[1]) else None
+        return MAPPING, origin, args[0], args[1], key_test, value_test
+    if origin is Union and not all(map(is_flat, args)):
+        flat = [arg for arg in args if is_flat(arg)]
+        nested = [arg for arg in args if arg not in flat]
+        typeddicts = [arg for arg in nested if is_typed_dict(arg)]
+        dispatch, covered = compile_dispatch(typeddicts, {arg: arg for arg in typeddicts})
+        return UNION, value_type, compile(Union[tuple(flat)]).test if flat else None, nested, dispatch, covered
+    return FLAT, test
+
+
+def container(value_type: Any) -> Any:
+    data = plan(value_type)
+    if (kind := data[0]) in (SEQUENCE, MAPPING):
+        return data[1]
+    if kind == TUPLE:
+        return tuple
+    if kind == TYPEDDICT:
+        return dict
+    return object
+
+
+def walk(value: Any, value_type: Any) -> Optional[Failure]:
+    """
+        check 'value' with explicit work stack instead of recursion
+        return None if value is valid, else last failed (value, type, message)
+        Union arms are tried one by one: on failure the stack is unwound to the last choice point
+    """
+    stack = [(NODE, value, value_type)]  # type: List[Tuple[int, Any, Any]]
+    pop, push = stack.pop, stack.append
+    while stack:
+        tag, value, value_type = pop()
+        if tag == ITEMS:
+            if (item := next(value, MISSING)) is MISSING:
+                continue
+            push((ITEMS, value, value_type))
+            value = item
+        elif tag == CHOICE:
+            continue
+        failure = visit(value, value_type, push)
+        if failure is None:
+            continue
+        while stack:
+            tag, value, arms = pop()
+            if tag == CHOICE and (arm := next(arms, None)) is not None:
+                push((CHOICE, value, arms))
+                push((NODE, value, arm))
+                break
+        else:
+            return failure
+    return None
+
+
+def visit(value: Any, value_type: Any, push: Any) -> Optional[Failure]:
+    data = plan(value_type)
+    kind = data[0]
+    if kind == FLAT:
+        if data[1](value):
+            return None
+        return value, value_type, None
+    if kind == TYPEDDICT:
+        _, typeddict, fields, layout = data
+        if not isinstance(value, dict):
+            return value, value_type, None
+        if not layout.required <= value.keys():
+            return value, value_type, ErrorMessage(
+                'fields "%s" missed in TypedDict', '","'.join(map(str, sorted(layout.required - value.keys()))),
+            )
+        if layout.closed and not value.keys() <= layout.keys:
+            key = next(key for key in value if key not in fields)
+            return value, value_type, ErrorMessage(
+                'expected key "%s" type of "%s" in TypedDict', key, type(value[key]),
+            )
+        for key, item in value.items():
+            if (field := fields.get(key)) is not None:
+                if field[1] is None:
+                    push((NODE, item, field[0]))
+                elif not field[1](item):
+                    return item, field[0], None
+        return None
+    if kind == SEQUENCE:
+        if not isinstance(value, data[1]):
+            return value, value_type, None
+        push((ITEMS, iter(value), data[2]))
+        return None
+    if kind == MAPPING:
+        _, origin, key_type, item_type, key_test, item_test = data
+        if not isinstance(value, origin):
+            return value, value_type, None
+        if key_test is None:
+            push((ITEMS, iter(value), key_type))
+        elif not all(map(key_test, value)):
+            key = next(key for key in value if not key_test(key))
+            return key, key_type, None
+        if item_test is None:
+            push((ITEMS, iter(value.values()), item_type))
+        elif not all(map(item_test, value.values())):
+            item = next(item for item in value.values() if not item_test(item))
+            return item, item_type, None
+        return None
+    if kind == TUPLE:
+        args = data[2]
+        if not isinstance(value, tuple) or len(value) != len(args):
+            return value, value_type, None
+        for item, item_type in zip(reversed(value), reversed(args)):
+            push((NODE, item, item_type))
+        return None
+    _, union, flat_test, nested, dispatch, covered = data
+    if flat_test is not None and flat_test(value):
+        return None
+    arms = [arm for arm in nested if arm not in covered and isinstance(value, container(arm))]
+    if dispatch is not None and isinstance(value, dict) and (arm := dispatch(value)) is not None:
+        arms.insert(0, arm)
+    if not arms:
+        return value, value_type, ErrorMessage('expected value any type of [%s], got "%s"', classify(union).args, value)
+    if len(arms) > 1:
+        push((CHOICE, value, iter(arms[1:])))
+    push((NODE, value, arms[0]))
+    return None
+
+
+class IterativeChecker(Checker):
+    """
+        checker of iterative engine, message describes the innermost failed value
+    """
+
+    __slots__ = ()
+
+    def __call__(self, value: Any) -> CheckerType:
+        if (failure := walk(value, self.type)) is None:
+            return True, None
+        value, value_type, message = failure
+        return False, message or Explanation(value, value_type)
+
+
+ITERATIVE_CACHE = LRUCache(maxsize=1024)
+
+
+def compile_iterative(value_type: Any) -> Checker:
+    """
+        same as rtc.compile(), but checker walks value with explicit stack,
+        so depth of value is not limited by recursion limit,
+        checkers are kept in ITERATIVE_CACHE (LRU)
+        Example:
+            is_type(tree, Node, engine='iterative')
+    """
+    try:
+        checker = ITERATIVE_CACHE.get(value_type)
+    except TypeError:
+        return IterativeChecker(value_type, lambda value: walk(value, value_type) is None)
+    if checker is None:
+        checker = IterativeChecker(value_type, lambda value: walk(value, value_type) is None)
+        ITERATIVE_CACHE.put(value_type, checker)
+    return checker
+
+
+compile_iterative.cache_info = ITERATIVE_CACHE.cache_info  # type: ignore
+compile_iterative.cache_clear = ITERATIVE_CACHE.clear  # type: ignore
+
+
+ENGINES['iterative'] = compile_iterative
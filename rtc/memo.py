@@ -0,0 +1,41 @@
+from typing import Any
+
+from .compiler import compile
+from .is_type import CheckerType
+from .tools import LRUCache
+
+RESULT_CACHE = LRUCache(maxsize=1024)
+ATOMIC_TYPES = frozenset({int, float, complex, str, bytes, bool, type(None), range})
+
+
+def is_immutable(value: Any) -> bool:
+    """
+        True for builtin scalars and tuples / frozensets built of them
+    """
+    if (cls := type(value)) in ATOMIC_TYPES:
+        return True
+    if cls is tuple or cls is frozenset:
+        return all(map(is_immutable, value))
+    return False
+
+
+def check_type_cached(value: Any, value_type: Any) -> CheckerType:
+    """
+        same as check_type, but results for deeply immutable values
+        are kept in RESULT_CACHE (LRU) by (id(value), id(type))
+        cache entry holds the value and the type, so their ids can not be reused while entry exists
+        see check_type_cached.cache_info() and check_type_cached.cache_clear()
+        Example:
+            check_type_cached(CONFIG, Tuple[str, ...]) -> (True, None)  # O(1) for the same object next time
+    """
+    key = (id(value), id(value_type))
+    if (entry := RESULT_CACHE.get(key)) is not None and entry[0] is value and entry[1] is value_type:
+        return entry[2]
+    result = compile(value_type)(value)
+    if is_immutable(value):
+        RESULT_CACHE.put(key, (value, value_type, result))
+    return result
+
+
+check_type_cached.cache_info = RESULT_CACHE.cache_info  # type: ignore
+check_type_cached.cache_clear = RESULT_CACHE.clear  # type: ignore
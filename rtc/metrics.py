@@ -0,0 +1,146 @@
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# upper bounds (seconds) of histogram buckets, last bucket counts slower checks
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+CONTAINERS = (list, tuple, dict, set, frozenset)
+
+Finish = Callable[[bool, float], None]
+Hook = Callable[[Any, Any], Optional[Finish]]
+
+
+class TypeStats(NamedTuple):
+    calls: int
+    failures: int
+    elements: int
+    total: float
+    histogram: Tuple[int, ...]
+
+
+def size_of(value: Any) -> int:
+    return len(value) if isinstance(value, CONTAINERS) else 1
+
+
+class Instrumentation:
+    """
+        per-schema counters, timings and tracing hooks for is_type and staticclass
+        when disabled nothing is measured: is_type checks one flag per call,
+        __init__ of staticclasses is swapped only by enable()
+        Example:
+            instrumentation.enable()
+            instrumentation.add_hook(lambda value_type, value: print('start', value_type))
+            instrumentation.stats()[Event] -> TypeStats(calls=10, failures=1, elements=10, ...)
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.hooks = []  # type: List[Hook]
+        self._stats = {}  # type: Dict[Any, List[Any]]
+        self._lock = threading.Lock()
+        self._classes = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+    def enable(self) -> None:
+        self.enabled = True
+        for cls, init in list(self._classes.items()):
+            cls.__init__ = self.observed_init(cls, init)
+
+    def disable(self) -> None:
+        self.enabled = False
+        for cls, init in list(self._classes.items()):
+            cls.__init__ = init
+
+    def add_hook(self, hook: Hook) -> Hook:
+        """
+            hook(value_type, value) is called before check,
+            it may return finish(ok, elapsed) which is called after check
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self) -> Dict[Any, TypeStats]:
+        """
+            snapshot of counters per checked type
+        """
+        with self._lock:
+            return {
+                value_type: TypeStats(calls, failures, elements, total, tuple(histogram))
+                for value_type, (calls, failures, elements, total, histogram) in self._stats.items()
+            }
+
+    def record(self, value_type: Any, ok: bool, elements: int, elapsed: float) -> None:
+        try:
+            hash(value_type)
+        except TypeError:
+            value_type = repr(value_type)
+        with self._lock:
+            if (row := self._stats.get(value_type)) is None:
+                row = self._stats[value_type] = [0, 0, 0, 0.0, [0] * (len(BUCKETS) + 1)]
+            row[0] += 1
+            row[1] += not ok
+            row[2] += elements
+            row[3] += elapsed
+            row[4][bisect_left(BUCKETS, elapsed)] += 1
+
+    def start(self, value_type: Any, value: Any) -> List[Finish]:
+        return [finish for hook in self.hooks if (finish := hook(value_type, value)) is not None]
+
+    def observe(self, test: Callable[[Any], bool], value: Any, value_type: Any) -> bool:
+        finishes = self.start(value_type, value) if self.hooks else ()
+        started = perf_counter()
+        ok = False
+        try:
+            ok = test(value)
+            return ok
+        finally:
+            elapsed = perf_counter() - started
+            self.record(value_type, ok, size_of(value), elapsed)
+            for finish in finishes:
+                finish(ok, elapsed)
+
+    def register(self, cls: type) -> None:
+        """
+            remember generated __init__ of staticclass, so it can be measured when enabled
+        """
+        init = self._classes[cls] = cls.__init__
+        if self.enabled:
+            cls.__init__ = self.observed_init(cls, init)
+
+    def observed_init(self, cls: type, init: Callable[..., None]) -> Callable[..., None]:
+        def __init__(obj: Any, *args: Any, **kwargs: Any) -> None:
+            finishes = self.start(cls, (args, kwargs)) if self.hooks else ()
+            started = perf_counter()
+            ok = False
+            try:
+                init(obj, *args, **kwargs)
+                ok = True
+            finally:
+                elapsed = perf_counter() - started
+                self.record(cls, ok, len(args) + len(kwargs), elapsed)
+                for finish in finishes:
+                    finish(ok, elapsed)
+        __init__.__qualname__ = init.__qualname__
+        __init__.__wrapped__ = init  # type: ignore
+        return __init__
+
+
+instrumentation = Instrumentation()
+
+
+def stats() -> Dict[Any, TypeStats]:
+    """
+        snapshot of instrumentation counters per checked type
+        Example:
+            for value_type, row in stats().items():
+                print(value_type, row.calls, row.failures, row.total / row.calls)
+    """
+    return instrumentation.stats()
@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, ContextManager, Iterator, List, Optional, Sequence, Tuple
+
+from .compiler import Explanation, always, compile
+from .errors import ErrorMessage
+
+MIN_SIZE = 10000
+CHUNKS_PER_WORKER = 4
+
+
+def split(value: Any, value_type: Any) -> Optional[Tuple[Sequence[Any], Any, bool]]:
+    """
+        return (elements, element type, is mapping) for List, homogeneous Tuple and Dict values,
+        None if value can not be split or elements need no checks
+    """
+    origin = getattr(value_type, '__origin__', None)
+    args = getattr(value_type, '__args__', None) or ()
+    if not args or not isinstance(value, origin or ()):
+        return None
+    if origin is list or (origin is tuple and (len(args) == 1 or (len(args) == 2 and args[1] is ...))):
+        item_type = args[0]
+    elif origin is dict:
+        item_type = Tuple[args[0], args[1]]
+    else:
+        return None
+    if compile(item_type).test is always:
+        return None
+    return (list(value.items()), item_type, True) if origin is dict else (value, item_type, False)
+
+
+def chunks(elements: Sequence[Any], workers: int) -> Iterator[Tuple[int, Sequence[Any]]]:
+    size = -(-len(elements) // (workers * CHUNKS_PER_WORKER))
+    for start in range(0, len(elements), size):
+        yield start, elements[start:start + size]
+
+
+def valid(chunk: Sequence[Any], value_type: Any) -> bool:
+    return all(map(compile(value_type).test, chunk))
+
+
+def invalid(chunk: Sequence[Any], value_type: Any, start: int, limit: Optional[int]) -> List[int]:
+    """
+        return global indices of invalid elements of 'chunk', at most 'limit'
+    """
+    test = compile(value_type).test
+    result = []  # type: List[int]
+    for idx, item in enumerate(chunk, start):
+        if not test(item):
+            result.append(idx)
+            if len(result) == limit:
+                break
+    return result
+
+
+def pool(workers: Optional[int], executor: Optional[Executor]) -> Tuple[int, ContextManager[Executor]]:
+    if executor is not None:
+        return workers or os.cpu_count() or 1, nullcontext(executor)
+    workers = workers or os.cpu_count() or 1
+    return workers, ProcessPoolExecutor(workers)
+
+
+def is_type_parallel(
+    value: Any,
+    value_type: Any,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    min_size: int = MIN_SIZE,
+) -> bool:
+    """
+        same as is_type, but elements of top-level List, Tuple[T, ...] and Dict
+        are checked in chunks by process pool,
+        values shorter than 'min_size' are checked in current process
+        types must be picklable (defined at module level)
+        Example:
+            is_type_parallel(records, List[Event], workers=8) -> True
+    """
+    if (parts := split(value, value_type)) is None or len(parts[0]) < min_size or workers == 1:
+        return compile(value_type).test(value)
+    elements, item_type, _ = parts
+    compile(item_type)
+    workers, context = pool(workers, executor)
+    with context as executor:
+        futures = [executor.submit(valid, chunk, item_type) for _, chunk in chunks(elements, workers)]
+        try:
+            return all(future.result() for future in as_completed(futures))
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def check_parallel(
+    value: Any,
+    value_type: Any,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    min_size: int = MIN_SIZE,
+    limit: Optional[int] = None,
+) -> List[Tuple[Any, ErrorMessage]]:
+    """
+        check elements of top-level List, Tuple[T, ...] or Dict by process pool
+        return list of (index or key, error) for invalid elements ordered by position,
+        stops after 'limit' errors if it's passed, limit=1 gives the first failure
+        Example:
+            check_parallel(records, List[Event], workers=8) -> [(1048576, 'for "x" expected type ...')]
+    """
+    if (parts := split(value, value_type)) is None:
+        ok, message = compile(value_type)(value)
+        return [] if ok else [(None, message)]
+    elements, item_type, mapping = parts
+    indices = find_invalid(elements, item_type, workers, executor, min_size, limit)
+    if not mapping:
+        return [(idx, Explanation(elements[idx], item_type)) for idx in indices]
+    key_type, value_type = item_type.__args__
+    key_test = compile(key_type).test
+    return [
+        (
+            key,
+            ErrorMessage('key "%s", %s', key, Explanation(key, key_type))
+            if not key_test(key) else
+            ErrorMessage('value for key "%s", %s', key, Explanation(item, value_type))
+        )
+        for key, item in (elements[idx] for idx in indices)
+    ]
+
+
+def find_invalid(
+    elements: Sequence[Any],
+    item_type: Any,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    min_size: int = MIN_SIZE,
+    limit: Optional[int] = None,
+) -> List[int]:
+    """
+        return sorted indices of invalid 'elements', at most 'limit'
+    """
+    if len(elements) < min_size or workers == 1:
+        return invalid(elements, item_type, 0, limit)
+    compile(item_type)
+    workers, context = pool(workers, executor)
+    result = []  # type: List[int]
+    with context as executor:
+        futures = [
+            executor.submit(invalid, chunk, item_type, start, limit)
+            for start, chunk in chunks(elements, workers)
+        ]
+        try:
+            for future in futures:
+                result.extend(future.result())
+                if limit is not None and len(result) >= limit:
+                    return result[:limit]
+        finally:
+            for future in futures:
+                future.cancel()
+    return result
+
+
+def mask_parallel(
+    elements: Sequence[Any],
+    item_type: Any,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    min_size: int = MIN_SIZE,
+) -> bytearray:
+    """
+        return mask with 1 for valid 'elements' and 0 for invalid ones
+    """
+    mask = bytearray(b'\x01') * len(elements)
+    for idx in find_invalid(elements, item_type, workers, executor, min_size):
+        mask[idx] = 0
+    return mask
+
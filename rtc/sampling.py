@@ -0,0 +1,96 @@
+import random
+import threading
+from itertools import islice
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from .compiler import compile
+
+STRATEGIES = ('head', 'random', 'stratified')
+
+_state = threading.local()
+
+
+class Sample:
+    """
+        sampling policy for large containers
+        containers longer than 'size' get only 'size' elements checked:
+            head - first elements
+            random - random elements
+            stratified - one random element from each of 'size' equal slices
+        container types, lengths and TypedDict keys are always checked
+        with 'seed' the same positions are picked on every check
+    """
+
+    __slots__ = ('size', 'strategy', 'seed')
+
+    def __init__(self, size: int = 100, strategy: str = 'head', seed: Optional[int] = None) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError('unknown strategy "%s", expected one of %s' % (strategy, STRATEGIES))
+        if size < 1:
+            raise ValueError('sample size must be positive, got %s' % size)
+        self.size = size
+        self.strategy = strategy
+        self.seed = seed
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sample):
+            return NotImplemented
+        return (self.size, self.strategy, self.seed) == (other.size, other.strategy, other.seed)
+
+    def __hash__(self) -> int:
+        return hash((Sample, self.size, self.strategy, self.seed))
+
+    def __repr__(self) -> str:
+        return 'Sample(size=%s, strategy=%r, seed=%s)' % (self.size, self.strategy, self.seed)
+
+    def positions(self, length: int) -> List[int]:
+        if self.strategy == 'head':
+            return list(range(self.size))
+        # equal samples share cached checkers, so seeded generator is created per check, not per instance
+        rng = random if self.seed is None else random.Random(self.seed)
+        if self.strategy == 'random':
+            return sorted(rng.sample(range(length), self.size))
+        step = length / self.size
+        return sorted({int(i * step + rng.random() * step) for i in range(self.size)})
+
+    def items(self, container: Any) -> Iterable[Any]:
+        """
+            return elements of sized 'container' to be checked
+        """
+        if (length := len(container)) <= self.size:
+            return container
+        _state.sampled = True
+        if self.strategy == 'head':
+            return islice(container, self.size)
+        positions = self.positions(length)
+        if isinstance(container, (list, tuple)):
+            return [container[i] for i in positions]
+        return walk(container, positions)
+
+
+def walk(container: Iterable[Any], positions: List[int]) -> Iterable[Any]:
+    iterator = iter(container)
+    prev = -1
+    for pos in positions:
+        for item in islice(iterator, pos - prev - 1, None):
+            yield item
+            break
+        prev = pos
+
+
+class SampleResult(NamedTuple):
+    valid: bool
+    exhaustive: bool
+
+
+def check_sample(value: Any, value_type: Any, sample: Sample) -> SampleResult:
+    """
+        check 'value' with sampling policy
+        'exhaustive' is False if any container was sampled,
+        so positive verdict is advisory only
+        Example:
+            check_sample(list(range(10 ** 6)), List[int], Sample(100)) -> SampleResult(True, False)
+    """
+    _state.sampled = False
+    valid = compile(value_type, sample).test(value)
+    return SampleResult(valid, not _state.sampled)
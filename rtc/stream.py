@@ -0,0 +1,306 @@
+import codecs
+import re
+from json.decoder import JSONDecodeError, scanstring
+from typing import IO, Any, Iterator, List, Tuple, Union
+
+from .compiler import Explanation, always, compile
+from .errors import ErrorMessage
+from .is_type import CheckerType
+from .tools import classify, is_typed_dict, typeddict_layout
+
+NUMBER_RE = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+WHITESPACE = ' \t\n\r'
+STRUCTURAL = '{}[],:'
+LITERALS = (
+    ('true', True),
+    ('false', False),
+    ('null', None),
+    ('NaN', float('nan')),
+    ('Infinity', float('inf')),
+    ('-Infinity', float('-inf')),
+)
+LONGEST_LITERAL = max(len(i) for i, _ in LITERALS)
+NONE_TYPE = type(None)
+# longest escape of JSON string: surrogate pair like \ud83d\ude00
+MAX_ESCAPE = 12
+
+Token = Tuple[str, Any]
+VALUE = 'value'
+
+
+class StreamError(ValueError):
+    pass
+
+
+class Invalid(Exception):
+
+    def __init__(self, message: ErrorMessage) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+def tokenize(fp: IO, chunk_size: int = 65536) -> Iterator[Token]:
+    """
+        incremental JSON tokenizer over file-like object with read()
+        yields ('{', None), ('}', None), ..., (':', None) for structural chars
+        and ('value', obj) for strings, numbers and literals
+    """
+    decoder = None
+    buf, pos, eof = '', 0, False
+
+    def more(size: int = chunk_size) -> bool:
+        """
+            read at least 'size' more chars (unless input ends), consumed part of buffer is dropped
+        """
+        nonlocal decoder, buf, pos, eof
+        parts, got = [buf[pos:]], 0
+        while not eof and got < size:
+            chunk = raw = fp.read(max(chunk_size, size - got))
+            if isinstance(raw, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                chunk = decoder.decode(raw, final=not raw)
+            if not raw:
+                eof = True
+            if chunk:
+                parts.append(chunk)
+                got += len(chunk)
+        if got:
+            buf, pos = ''.join(parts), 0
+        return got > 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if more():
+                continue
+            return
+        char = buf[pos]
+        if char in STRUCTURAL:
+            pos += 1
+            yield char, None
+        elif char == '"':
+            try:
+                value, end = scanstring(buf, pos + 1, True)
+            except JSONDecodeError as e:
+                # string may be cut by end of buffer: then at least as much as buffered is read,
+                # so long strings are rescanned O(log n) times, other errors are raised at once
+                if (e.msg.startswith('Unterminated') or e.pos + MAX_ESCAPE > len(buf)) and more(len(buf) - pos):
+                    continue
+                raise StreamError('invalid JSON string: %s' % e.msg)
+            pos = end
+            yield VALUE, value
+        elif (match := NUMBER_RE.match(buf, pos)) is not None:
+            if len(buf) - match.end() < 3 and more(len(buf) - pos):
+                continue
+            integer, frac, exp = match.groups()
+            pos = match.end()
+            yield VALUE, float(integer + (frac or '') + (exp or '')) if frac or exp else int(integer)
+        else:
+            if len(buf) - pos < LONGEST_LITERAL and more():
+                continue
+            for literal, value in LITERALS:
+                if buf.startswith(literal, pos):
+                    pos += len(literal)
+                    yield VALUE, value
+                    break
+            else:
+                raise StreamError('invalid JSON: unexpected "%s"' % buf[pos:pos + 20])
+
+
+class StreamValidator:
+    """
+        validates JSON token stream against schema,
+        only current path is kept for TypedDict, List and Dict nodes,
+        other nodes are built and checked with compiled checkers
+    """
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        self.tokens = tokens
+        self.path = []  # type: List[Union[str, int]]
+
+    def next(self) -> Token:
+        for token in self.tokens:
+            return token
+        raise StreamError('invalid JSON: unexpected end of data')
+
+    def fail(self, fmt: str, *args: Any) -> None:
+        # JSON pointer (RFC 6901) like collect.Path: document root is '', not '/'
+        pointer = ''.join('/' + str(key).replace('~', '~0').replace('/', '~1') for key in self.path)
+        raise Invalid(ErrorMessage(fmt + ' at "%s"', *args, pointer))
+
+    def expect(self, token: Token, kind: str) -> None:
+        if token[0] != kind:
+            raise StreamError(
+                'invalid JSON: expected "%s", got "%s"' % (kind, token[0] if token[1] is None else token[1])
+            )
+
+    def validate(self, token: Token, value_type: Any) -> None:
+        if compile(value_type).test is always:
+            self.skip(token)
+        elif is_typed_dict(value_type):
+            self.typeddict(token, value_type)
+        elif (origin := (info := classify(value_type)).origin) is list:
+            self.array(token, info.args[0] if info.args else Any)
+        elif origin is dict:
+            self.mapping(token, *(info.args or (Any, Any)))
+        elif origin is Union and token[0] != VALUE and len(arms := [
+            arg
+            for arg in info.args
+            if arg is not NONE_TYPE
+        ]) == 1:
+            self.validate(token, arms[0])
+        elif isinstance(value_type, type) and token[0] in '{[':
+            if not issubclass(dict if token[0] == '{' else list, value_type):
+                self.fail('expected type "%s", got "%s"', value_type, dict if token[0] == '{' else list)
+            self.skip(token)
+        else:
+            value = self.build(token)
+            if not compile(value_type).test(value):
+                self.fail('%s', Explanation(value, value_type))
+
+    def array(self, token: Token, item_type: Any) -> None:
+        if token[0] != '[':
+            self.fail('expected list, got "%s"', self.build(token))
+        token = self.next()
+        if token[0] == ']':
+            return
+        idx = 0
+        while True:
+            self.path.append(idx)
+            self.validate(token, item_type)
+            self.path.pop()
+            token = self.next()
+            if token[0] == ']':
+                return
+            self.expect(token, ',')
+            token = self.next()
+            idx += 1
+
+    def items(self, token: Token) -> Iterator[Tuple[str, Token]]:
+        if token[0] != '{':
+            self.fail('expected dict, got "%s"', self.build(token))
+        token = self.next()
+        if token[0] == '}':
+            return
+        while True:
+            self.expect(token, VALUE)
+            if not isinstance(key := token[1], str):
+                raise StreamError('invalid JSON: object key must be string, got "%s"' % key)
+            self.expect(self.next(), ':')
+            yield key, self.next()
+            token = self.next()
+            if token[0] == '}':
+                return
+            self.expect(token, ',')
+            token = self.next()
+
+    def mapping(self, token: Token, key_type: Any, value_type: Any) -> None:
+        key_test = compile(key_type).test
+        for key, token in self.items(token):
+            if not key_test(key):
+                self.fail('key "%s", %s', key, Explanation(key, key_type))
+            self.path.append(key)
+            self.validate(token, value_type)
+            self.path.pop()
+
+    def typeddict(self, token: Token, value_type: Any) -> None:
+        layout = typeddict_layout(value_type)
+        seen = set()
+        for key, token in self.items(token):
+            if key in layout.fields:
+                self.path.append(key)
+                self.validate(token, layout.fields[key])
+                self.path.pop()
+                seen.add(key)
+            elif layout.closed:
+                self.fail('unexpected key "%s" in TypedDict', key)
+            else:
+                self.skip(token)
+        if missed := layout.required - seen:
+            self.fail('fields "%s" missed in TypedDict', '","'.join(map(str, sorted(missed))))
+
+    def build(self, token: Token) -> Any:
+        if token[0] == VALUE:
+            return token[1]
+        if token[0] == '[':
+            result = []  # type: List[Any]
+            token = self.next()
+            if token[0] == ']':
+                return result
+            while True:
+                result.append(self.build(token))
+                token = self.next()
+                if token[0] == ']':
+                    return result
+                self.expect(token, ',')
+                token = self.next()
+        if token[0] == '{':
+            return {key: self.build(token) for key, token in self.items(token)}
+        raise StreamError('invalid JSON: unexpected "%s"' % token[0])
+
+    def skip(self, token: Token) -> None:
+        if token[0] == VALUE:
+            return
+        if token[0] not in '{[':
+            raise StreamError('invalid JSON: unexpected "%s"' % token[0])
+        depth = 1
+        for kind, _ in self.tokens:
+            if kind in '{[':
+                depth += 1
+            elif kind in '}]':
+                depth -= 1
+                if not depth:
+                    return
+        raise StreamError('invalid JSON: unexpected end of data')
+
+    def end(self) -> None:
+        for kind, value in self.tokens:
+            raise StreamError('invalid JSON: extra data "%s"' % (kind if value is None else value))
+
+
+def check_stream(fp: IO, value_type: Any, chunk_size: int = 65536) -> CheckerType:
+    """
+        validate JSON document from file-like object without loading it,
+        stops reading on first violation
+        raises StreamError (ValueError) on malformed JSON
+        Example:
+            with open('export.json', 'rb') as f:
+                check_stream(f, List[Event]) -> (False, 'for "x" expected type ... at "/12/time"')
+    """
+    validator = StreamValidator(tokenize(fp, chunk_size))
+    try:
+        validator.validate(validator.next(), value_type)
+    except Invalid as e:
+        return False, e.message
+    validator.end()
+    return True, None
+
+
+def iter_stream(fp: IO, value_type: Any, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+        yield validated elements of top-level JSON array one at a time,
+        raises TypeError on first invalid element
+        Example:
+            for event in iter_stream(f, List[Event]):
+                ...
+    """
+    item_type = args[0] if (args := classify(value_type).args) else Any
+    test = compile(item_type).test
+    validator = StreamValidator(tokenize(fp, chunk_size))
+    token = validator.next()
+    if token[0] != '[':
+        raise TypeError(ErrorMessage('expected list, got "%s"', validator.build(token)))
+    token = validator.next()
+    idx = 0
+    while token[0] != ']':
+        if idx:
+            validator.expect(token, ',')
+            token = validator.next()
+        if not test(value := validator.build(token)):
+            raise TypeError(ErrorMessage('%s at "/%s"', Explanation(value, item_type), idx))
+        yield value
+        token = validator.next()
+        idx += 1
+    validator.end()
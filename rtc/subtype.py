@@ -1,8 +1,11 @@
 
-from typing import Any, Tuple, TypeVar, Union, Hashable, Sized, _SpecialForm, Generic
+from typing import Any, Dict, Iterator, List, Tuple, TypeVar, Union, Hashable, Sized, _SpecialForm, Generic, Literal
 from collections.abc import Callable, Iterable, Container, Reversible, Coroutine, Generator, AsyncGenerator
 
-from .tools import is_typed_dict, typeddict_to_dict
+from .tools import ANY, CLASS, LITERAL, TYPEDDICT, TYPEVAR, LRUCache, classify, typeddict_to_dict
+
+SUBTYPE_CACHE = LRUCache(maxsize=4096)
+_MISSING = object()
 
 
 def check_list(frst: Any, scnd: Any) -> bool:
@@ -35,15 +38,10 @@ def check_tuple(frst: Any, scnd: Any) -> bool:
 
 def check_union(frst: Any, scnd: Any) -> bool:
     if getattr(frst, '__origin__', None) == Union:
-        for i in range(len(scnd.__args__)):
-            if scnd.__args__[i] is None:
-                scnd.__args__[i] = type(None)
-        for arg1 in frst.__args__:
-            if arg1 is None:
-                arg1 = type(None)
-            if not any(is_subtype(arg1, arg) for arg in scnd.__args__):
-                return False
-        return True
+        return all(
+            any(is_subtype(arg1, arg2) for arg2 in scnd.__args__)
+            for arg1 in frst.__args__
+        )
     return any(is_subtype(frst, arg) for arg in scnd.__args__)
 
 
@@ -118,6 +116,22 @@ def check_generic(frst: Any, scnd: Any) -> bool:
     )
 
 
+def check_literal_value(value: Any, scnd: Any) -> bool:
+    origin = getattr(scnd, '__origin__', None)
+    if origin is Literal:
+        return any(type(value) is type(arg) and value == arg for arg in scnd.__args__)
+    if origin is Union:
+        return any(check_literal_value(value, arg) for arg in scnd.__args__)
+    return is_subtype(type(value), scnd)
+
+
+def check_literal(frst: Any, scnd: Any) -> bool:
+    origin = getattr(frst, '__origin__', None)
+    if origin is Union:
+        return all(is_subtype(arg, scnd) for arg in frst.__args__)
+    return origin is Literal and all(check_literal_value(arg, scnd) for arg in frst.__args__)
+
+
 def check_typeddict(frst: Any, scnd: Any) -> bool:
     if isinstance(scnd, type) and issubclass(scnd, dict) and hasattr(scnd, '__annotations__'):
         for key, key_type in scnd.__annotations__.items():
@@ -142,6 +156,7 @@ SUBTYPE_CHECK_HANDLERS = {
     dict: check_dict,
     set: check_list,
     Union: check_union,
+    Literal: check_literal,
     Callable: check_callable,
     Iterable: check_iterable,
     Hashable: check_alias('__hash__'),
@@ -158,33 +173,162 @@ SUBTYPE_CHECK_HANDLERS = {
 def is_subtype(frst: Any, scnd: Any) -> bool:
     """
         return True if 'frst' is subtype of 'scnd'
+        results are kept in SUBTYPE_CACHE (LRU),
+        see is_subtype.cache_info() and is_subtype.cache_clear()
         Example:
             List[str], List -> True
             bool, int -> True
             bool, bool -> True
             int, bool -> False
             Optional[str], Union[str, int, None] -> True
+            Literal['a', 'b'], str -> True
             List[str], List[int] -> False
     """
+    key = (frst, scnd)
+    try:
+        result = SUBTYPE_CACHE.get(key, _MISSING)
+    except TypeError:
+        return _is_subtype(frst, scnd)
+    if result is _MISSING:
+        result = _is_subtype(frst, scnd)
+        SUBTYPE_CACHE.put(key, result)
+    return result
+
+
+is_subtype.cache_info = SUBTYPE_CACHE.cache_info  # type: ignore
+is_subtype.cache_clear = SUBTYPE_CACHE.clear  # type: ignore
+
+
+def _is_subtype(frst: Any, scnd: Any) -> bool:
     frst = type(None) if frst is None else frst
     scnd = type(None) if scnd is None else scnd
-    if is_typed_dict(scnd) + is_typed_dict(frst) == 1:
-        scnd = typeddict_to_dict(scnd) if is_typed_dict(scnd) else scnd
-        frst = typeddict_to_dict(frst) if is_typed_dict(frst) else frst
-    if isinstance(frst, type) and isinstance(scnd, type) and not is_typed_dict(scnd):
+    first, second = classify(frst), classify(scnd)
+    if (first.kind == TYPEDDICT) != (second.kind == TYPEDDICT):
+        if first.kind == TYPEDDICT:
+            first = classify(frst := typeddict_to_dict(frst))
+        else:
+            second = classify(scnd := typeddict_to_dict(scnd))
+    if first.kind in (CLASS, TYPEDDICT) and second.kind == CLASS:
         return issubclass(frst, scnd)
-    if Any == scnd or Any == frst:
-        return scnd == Any
-    if isinstance(scnd, TypeVar) or isinstance(frst, TypeVar):
-        return isinstance(scnd, TypeVar) and isinstance(frst, TypeVar) and scnd.__name__ == frst.__name__
-    if hasattr(frst, '__origin__') and isinstance(frst.__origin__, type) and isinstance(scnd, type) and not is_typed_dict(scnd):
-        return issubclass(frst.__origin__, scnd)
-    if hasattr(scnd, '__origin__') and isinstance(scnd.__origin__, type) and isinstance(frst, type) and not is_typed_dict(frst):
-        return issubclass(frst, scnd.__origin__)
-    if is_typed_dict(frst):
+    if first.kind == ANY or second.kind == ANY:
+        return second.kind == ANY
+    if first.kind == TYPEVAR or second.kind == TYPEVAR:
+        return first.kind == second.kind and scnd.__name__ == frst.__name__
+    if first.kind == LITERAL:
+        return check_literal(frst, scnd)
+    if isinstance(first.origin, type) and second.kind == CLASS:
+        return issubclass(first.origin, scnd)
+    if isinstance(second.origin, type) and first.kind == CLASS:
+        return issubclass(frst, second.origin)
+    if first.kind == TYPEDDICT:
         handler = check_typeddict
-    elif hasattr(scnd, '__origin__'):
-        handler = (SUBTYPE_CHECK_HANDLERS.get(scnd.__origin__) or SUBTYPE_CHECK_HANDLERS.get(scnd)) or check_generic
+    elif second.origin is not None:
+        handler = (SUBTYPE_CHECK_HANDLERS.get(second.origin) or SUBTYPE_CHECK_HANDLERS.get(scnd)) or check_generic
     else:
         handler = lambda x, y: x == y
     return handler(frst, scnd)
+
+
+class SubtypeRegistry:
+    """
+        subtype relation of closed set of types, computed once when types are added,
+        each registered type gets index, its supertypes and subtypes are kept as bitmasks of indexes,
+        so queries between registered types are O(1), others fall back to is_subtype()
+        Example:
+            registry = SubtypeRegistry([Event, LoginEvent, Dict[str, Any]])
+            registry.add(LogoutEvent)
+            registry.is_subtype(LoginEvent, Event) -> True
+            registry.supertypes(LoginEvent) -> [Event, Dict[str, Any]]
+    """
+
+    def __init__(self, types: Iterable = ()) -> None:
+        self._types = []  # type: List[Any]
+        self._index = {}  # type: Dict[Any, int]
+        # the same indexes by id(type): found without hashing typing aliases,
+        # ids can not be reused since registry keeps its types alive
+        self._by_id = {}  # type: Dict[int, int]
+        self._supers = []  # type: List[int]
+        self._subs = []  # type: List[int]
+        self.add(*types)
+
+    def add(self, *types: Any) -> None:
+        """
+            register types, relation with already registered ones is computed right away:
+            O(n) subtype checks per added type
+        """
+        for value_type in types:
+            if value_type in self._index:
+                continue
+            idx, bit = len(self._types), 1 << len(self._types)
+            supers = subs = bit
+            for other, other_idx in self._index.items():
+                # pairs are stored here, so SUBTYPE_CACHE is left for nested checks
+                if _is_subtype(value_type, other):
+                    supers |= 1 << other_idx
+                    self._subs[other_idx] |= bit
+                if _is_subtype(other, value_type):
+                    subs |= 1 << other_idx
+                    self._supers[other_idx] |= bit
+            self._types.append(value_type)
+            self._index[value_type] = self._by_id[id(value_type)] = idx
+            self._supers.append(supers)
+            self._subs.append(subs)
+
+    def index(self, value_type: Any) -> int:
+        if (idx := self._by_id.get(id(value_type))) is not None and self._types[idx] is value_type:
+            return idx
+        try:
+            return self._index[value_type]
+        except (KeyError, TypeError):
+            raise KeyError('type "%s" is not registered' % (value_type,)) from None
+
+    def is_subtype(self, frst: Any, scnd: Any) -> bool:
+        """
+            same as is_subtype(frst, scnd), O(1) if both types are registered
+        """
+        types, by_id = self._types, self._by_id
+        if (
+            (first := by_id.get(id(frst))) is not None and types[first] is frst
+            and (second := by_id.get(id(scnd))) is not None and types[second] is scnd
+        ):
+            return bool(self._supers[first] >> second & 1)
+        try:
+            return bool(self._supers[self.index(frst)] >> self.index(scnd) & 1)
+        except KeyError:
+            return is_subtype(frst, scnd)
+
+    def _unpack(self, mask: int, skip: int) -> List[Any]:
+        mask &= ~(1 << skip)
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self._types[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def supertypes(self, value_type: Any) -> List[Any]:
+        """
+            registered supertypes of registered 'value_type' (itself excluded) in order of registration
+        """
+        idx = self.index(value_type)
+        return self._unpack(self._supers[idx], idx)
+
+    def subtypes(self, value_type: Any) -> List[Any]:
+        """
+            registered subtypes of registered 'value_type' (itself excluded) in order of registration
+        """
+        idx = self.index(value_type)
+        return self._unpack(self._subs[idx], idx)
+
+    def __contains__(self, value_type: Any) -> bool:
+        try:
+            self.index(value_type)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._types)
+
+    def __len__(self) -> int:
+        return len(self._types)
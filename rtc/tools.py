@@ -1,13 +1,224 @@
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from functools import partial
+from typing import (
+    Any, Callable, Dict, FrozenSet, Hashable, Literal, NamedTuple, Optional, Tuple, Type, TypeVar, Union, TypedDict,
+    _SpecialForm, get_type_hints,
+)
 
-from typing import Any, Dict, Union, TypedDict
+TYPED_DICT_METAS = {type(TypedDict('TypedDict', {}))}
 
-TypedDictMeta = TypedDict.__class__
+try:
+    from typing import NotRequired, Required  # type: ignore
+except ImportError:  # python < 3.11
+    try:
+        from typing_extensions import NotRequired, Required  # type: ignore
+    except ImportError:
+        NotRequired = Required = None
+
+try:
+    from typing_extensions import TypedDict as TypedDictExtension
+    TYPED_DICT_METAS.add(type(TypedDictExtension('TypedDict', {})))
+except ImportError:
+    pass
+
+QUALIFIERS = tuple(i for i in (Required, NotRequired) if i is not None)
+
+
+class Layout(NamedTuple):
+    """
+        keys of TypedDict worked out once:
+        fields - types of all keys with Required / NotRequired unwrapped,
+        closed - unknown keys are rejected (total=True)
+    """
+    fields: Dict[str, Any]
+    keys: FrozenSet[str]
+    required: FrozenSet[str]
+    optional: FrozenSet[str]
+    closed: bool
 
 
 def is_typed_dict(cls: Any) -> bool:
-    return isinstance(cls, type) and issubclass(cls, dict) and cls.__class__ is TypedDictMeta
+    return isinstance(cls, type) and issubclass(cls, dict) and cls.__class__ in TYPED_DICT_METAS
+
+
+def typeddict_layout(cls: Any) -> Layout:
+    """
+        layout of TypedDict with string forward references resolved,
+        so recursive TypedDicts can be checked (annotations are used as is if any name can not be resolved)
+        required keys are taken from __required_keys__ if python provides it, so inheritance from
+        TypedDicts with other 'total' and Required / NotRequired qualifiers are respected,
+        python 3.8 has no __required_keys__ and does not keep bases, so 'total' of the class itself is used,
+        layouts are kept in LAYOUT_CACHE (LRU)
+    """
+    if (layout := LAYOUT_CACHE.get(cls)) is not None:
+        return layout
+    try:
+        hints = get_type_hints(cls)
+    except Exception:
+        hints = cls.__annotations__
+    required = set(getattr(cls, '__required_keys__', hints if cls.__total__ else ()))
+    fields = {}
+    for key, key_type in hints.items():
+        while (origin := getattr(key_type, '__origin__', None)) is not None and origin in QUALIFIERS:
+            if origin is Required:
+                required.add(key)
+            else:
+                required.discard(key)
+            key_type = key_type.__args__[0]
+        fields[key] = key_type
+    layout = Layout(fields, frozenset(fields), frozenset(required), frozenset(fields.keys() - required), cls.__total__)
+    LAYOUT_CACHE.put(cls, layout)
+    return layout
+
+
+# kinds of annotations
+CLASS, TYPES, TYPEDDICT, UNION, LITERAL, GENERIC, TYPEVAR, ANY, SPECIAL, OTHER = range(10)
+
+
+class TypeInfo(NamedTuple):
+    """
+        classification of annotation:
+        origin and args - __origin__ and __args__ of generic aliases (args are () for bare aliases),
+        engines read them from here instead of annotation,
+        annotation itself is not kept, so cache of infos does not keep annotations alive
+    """
+    kind: int
+    origin: Any
+    args: Tuple[Any, ...]
+
+
+_kinds = {}  # type: Dict[int, Tuple[Callable[[], Any], TypeInfo]]
+
+
+def build_info(value_type: Any) -> TypeInfo:
+    # typing special forms go first: Any is a class since python 3.11
+    if value_type is Any:
+        return TypeInfo(ANY, None, ())
+    if isinstance(value_type, _SpecialForm):
+        return TypeInfo(SPECIAL, None, ())
+    if isinstance(value_type, TypeVar):
+        return TypeInfo(TYPEVAR, None, ())
+    if type(value_type) is tuple and all(isinstance(i, type) for i in value_type):
+        return TypeInfo(TYPES, None, ())
+    if is_typed_dict(value_type):
+        return TypeInfo(TYPEDDICT, None, ())
+    if isinstance(value_type, type):
+        return TypeInfo(CLASS, None, ())
+    if (origin := getattr(value_type, '__origin__', None)) is not None:
+        kind = UNION if origin is Union else LITERAL if origin is Literal else GENERIC
+        return TypeInfo(kind, origin, getattr(value_type, '__args__', None) or ())
+    return TypeInfo(OTHER, None, ())
+
+
+def forget(cache: Dict[Any, Tuple[Any, ...]], key: Any, ref: Any) -> None:
+    """
+        weakref callback: drop entry of collected object unless it's been replaced already
+    """
+    if (entry := cache.get(key)) is not None and entry[0] is ref:
+        del cache[key]
+
+
+def classify(value_type: Any) -> TypeInfo:
+    """
+        classify annotation once, so engines dispatch on kind instead of probing
+        is_typed_dict(), hasattr(__origin__) and isinstance(TypeVar) on every node
+        results are keyed by id() and referenced weakly (typing aliases are slow to hash),
+        objects which can not be weakly referenced (tuples) are classified every time
+        Example:
+            classify(List[int]) -> TypeInfo(kind=GENERIC, origin=list, args=(int,))
+    """
+    try:
+        ref, info = _kinds[id(value_type)]
+        if ref() is value_type:
+            return info
+    except KeyError:
+        pass
+    info = build_info(value_type)
+    key = id(value_type)
+    try:
+        _kinds[key] = weakref.ref(value_type, partial(forget, _kinds, key)), info
+    except TypeError:
+        pass
+    return info
 
 
 def typeddict_to_dict(cls: Any) -> Any:
     return Dict[str, Union.__getitem__(tuple(cls.__annotations__.values()))]
 
+
+class EnumValue:
+    """
+        annotation for enum field which accepts members and their raw values
+        values are checked with hashed Literal lookup
+        Example:
+            class Event(TypedDict):
+                status: EnumValue[Status]  # Status.OK or 'ok'
+    """
+
+    def __class_getitem__(cls, enum_type: Type[Enum]) -> Any:
+        return Union[enum_type, Literal[tuple(member.value for member in enum_type)]]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class LRUCache:
+    """
+        bounded mapping with least-recently-used eviction
+        maxsize=None means unbounded, maxsize=0 disables caching
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                try:
+                    self._data.popitem(last=False)
+                except KeyError:
+                    break
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        self.maxsize = maxsize
+        if maxsize is not None:
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+LAYOUT_CACHE = LRUCache(maxsize=1024)
@@ -0,0 +1,186 @@
+from typing import Any, Callable, FrozenSet, Iterable, List, Tuple
+
+from .compiler import Explanation, always, compile, compile_items
+from .errors import ErrorMessage
+from .tools import is_typed_dict, typeddict_layout
+
+MISSING = object()
+
+
+def validate(value: Any, value_type: Any) -> None:
+    ok, message = compile(value_type)(value)
+    if not ok:
+        raise TypeError(message)
+
+
+class CheckedList(list):
+    """
+        list which is checked once on creation,
+        after that only inserted items are checked by compiled checker of items
+        Example:
+            ids = CheckedList(List[int], [1, 2])
+            ids.append(3)
+            ids.append('4')  # raise TypeError
+    """
+
+    __slots__ = ('type', '_item_type', '_test', '_check_items')
+
+    def __init__(self, value_type: Any, items: Iterable[Any] = ()) -> None:
+        if getattr(value_type, '__origin__', None) is not list:
+            raise TypeError('expected List[T], got "%s"' % (value_type,))
+        self.type = value_type
+        self._item_type = value_type.__args__[0] if value_type.__args__ else Any
+        self._test = compile(self._item_type).test
+        self._check_items = compile_items(self._item_type)
+        super().__init__(self._checked(items))
+
+    def _checked(self, items: Iterable[Any]) -> List[Any]:
+        items = items if isinstance(items, list) else list(items)
+        if self._check_items is not None and not self._check_items(items):
+            raise TypeError(Explanation(next(i for i in items if not self._test(i)), self._item_type))
+        return items
+
+    def _check(self, item: Any) -> Any:
+        if self._test is not always and not self._test(item):
+            raise TypeError(Explanation(item, self._item_type))
+        return item
+
+    def append(self, item: Any) -> None:
+        super().append(self._check(item))
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, self._check(item))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(self._checked(items))
+
+    def __iadd__(self, items: Iterable[Any]) -> 'CheckedList':
+        self.extend(items)
+        return self
+
+    def __setitem__(self, index: Any, item: Any) -> None:
+        if isinstance(index, slice):
+            item = self._checked(item)
+        else:
+            self._check(item)
+        super().__setitem__(index, item)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.type, list(self))
+
+    def __repr__(self) -> str:
+        return 'CheckedList[%s](%s)' % (self.type, super().__repr__())
+
+
+def item_check(value_type: Any) -> Tuple[Callable[[Any, Any], None], FrozenSet[Any]]:
+    """
+        return function which raises TypeError if (key, value) can not be stored in 'value_type'
+        and keys which can not be removed
+    """
+    if is_typed_dict(value_type):
+        layout = typeddict_layout(value_type)
+        fields = {key: (key_type, compile(key_type).test) for key, key_type in layout.fields.items()}
+        closed = layout.closed
+
+        def check_field(key: Any, value: Any) -> None:
+            if (field := fields.get(key)) is None:
+                if closed:
+                    raise TypeError(ErrorMessage('unexpected key "%s" in TypedDict', key))
+            elif not field[1](value):
+                raise TypeError(ErrorMessage('%s in TypedDict["%s"]', Explanation(value, field[0]), key))
+        return check_field, layout.required
+
+    if getattr(value_type, '__origin__', None) is not dict:
+        raise TypeError('expected Dict[K, V] or TypedDict, got "%s"' % (value_type,))
+    key_type, item_type = value_type.__args__
+    key_test, item_test = compile(key_type).test, compile(item_type).test
+
+    def check_item(key: Any, value: Any) -> None:
+        if not key_test(key):
+            raise TypeError(ErrorMessage('key "%s", %s', key, Explanation(key, key_type)))
+        if not item_test(value):
+            raise TypeError(ErrorMessage('value for key "%s", %s', key, Explanation(value, item_type)))
+    return check_item, frozenset()
+
+
+class CheckedDict(dict):
+    """
+        dict which is checked once on creation against Dict[K, V] or TypedDict,
+        after that only stored items are checked,
+        required fields of TypedDict can not be removed
+        Example:
+            state = CheckedDict(Session, {'user': 'root', 'ttl': 60})
+            state['ttl'] = 120
+            state['ttl'] = '120'  # raise TypeError
+    """
+
+    __slots__ = ('type', '_check', '_required')
+
+    def __init__(self, value_type: Any, *args: Any, **kwargs: Any) -> None:
+        self.type = value_type
+        self._check, self._required = item_check(value_type)
+        data = dict(*args, **kwargs)
+        validate(data, value_type)
+        super().__init__(data)
+
+    def _removable(self, key: Any) -> None:
+        if key in self._required and key in self:
+            raise TypeError(ErrorMessage('field "%s" is required in TypedDict', key))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._check(key, value)
+        super().__setitem__(key, value)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        data = dict(*args, **kwargs)
+        for key, value in data.items():
+            self._check(key, value)
+        super().update(data)
+
+    def __ior__(self, other: Any) -> 'CheckedDict':
+        self.update(other)
+        return self
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self._check(key, default)
+        return super().setdefault(key, default)
+
+    def __delitem__(self, key: Any) -> None:
+        self._removable(key)
+        super().__delitem__(key)
+
+    def pop(self, key: Any, default: Any = MISSING) -> Any:
+        self._removable(key)
+        if default is MISSING:
+            return super().pop(key)
+        return super().pop(key, default)
+
+    def popitem(self) -> Tuple[Any, Any]:
+        if self:
+            self._removable(next(reversed(self.keys())))
+        return super().popitem()
+
+    def clear(self) -> None:
+        if self._required:
+            for key in self:
+                self._removable(key)
+        super().clear()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.type, dict(self))
+
+    def __repr__(self) -> str:
+        return 'CheckedDict[%s](%s)' % (getattr(self.type, '__name__', self.type), super().__repr__())
+
+
+def checked(value: Any, value_type: Any) -> Any:
+    """
+        wrap list or dict into validated view of 'value_type'
+        Example:
+            registry = checked({}, Dict[str, Handler])
+    """
+    if getattr(value_type, '__origin__', None) is list:
+        return CheckedList(value_type, value)
+    return CheckedDict(value_type, value)
+
@@ -1,10 +1,44 @@
-
 from .staticclass import TestStaticClass
-from .subtype import TestSubType
+from .subtype import TestSubType, TestSubtypeRegistry
 from .istype import TestIsType
+from .compiler import TestCompile, TestUnionDispatch, TestClassify
+from .errors import TestErrorMessage
+from .codegen import TestCodegen
+from .batch import TestBatch
+from .sampling import TestSampling
+from .stream import TestStream
+from .aio import TestAsync
+from .parallel import TestParallel
+from .iterative import TestIterative
+from .collect import TestCollect
+from .memo import TestMemo
+from .metrics import TestMetrics
+from .functions import TestTypechecked
+from .buffers import TestBuffers
+from .containers import TestContainers
+from .views import TestViews
 
 __all__ = [
     'TestStaticClass',
     'TestSubType',
+    'TestSubtypeRegistry',
     'TestIsType',
+    'TestCompile',
+    'TestUnionDispatch',
+    'TestClassify',
+    'TestErrorMessage',
+    'TestCodegen',
+    'TestBatch',
+    'TestSampling',
+    'TestStream',
+    'TestAsync',
+    'TestParallel',
+    'TestIterative',
+    'TestCollect',
+    'TestMemo',
+    'TestMetrics',
+    'TestTypechecked',
+    'TestBuffers',
+    'TestContainers',
+    'TestViews',
 ]
@@ -0,0 +1,184 @@
+import asyncio
+from typing import Dict, List, Literal, Optional, Tuple, TypedDict, Union
+from unittest import TestCase, mock
+
+from rtc import check_type_async
+from rtc.aio import Walker, sizer, weight
+from rtc.is_type import check_type
+
+from .compiler import CASES
+from .iterative import Node
+
+
+class Item(TypedDict):
+    id: int
+    tags: List[str]
+
+
+class Page(TypedDict):
+    items: List[Item]
+    counts: Dict[str, int]
+    cursor: Optional[Tuple[int, str]]
+
+
+class Done(TypedDict):
+    status: Literal['ok']
+    items: List[Item]
+
+
+class Failed(TypedDict):
+    status: Literal['error']
+    message: str
+
+
+def ticks(value, value_type, budget):
+    count = 0
+
+    async def ticker():
+        nonlocal count
+        while True:
+            count += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        result = await check_type_async(value, value_type, budget=budget)
+        task.cancel()
+        return result
+
+    return asyncio.run(main()), count
+
+
+def steps(value, value_type, budget):
+    walker = Walker(budget).check(value, value_type)
+    count = 0
+    while True:
+        try:
+            next(walker)
+        except StopIteration as e:
+            return count, e.value
+        count += 1
+
+
+class TestAsync(TestCase):
+
+    def test_same_results(self):
+        page = {
+            'items': [{'id': i, 'tags': ['x'] * 3} for i in range(50)],
+            'counts': {str(i): i for i in range(50)},
+            'cursor': (1, 'a'),
+        }
+        cases = [
+            *CASES,
+            (page, Page),
+            ({**page, 'cursor': None}, Page),
+            ({**page, 'items': page['items'] + [{'id': '1', 'tags': []}]}, Page),
+            ({**page, 'items': page['items'] + [{'id': 1, 'tags': ['a'] * 20 + [1]}]}, Page),
+            ({**page, 'counts': {**page['counts'], 'x': '1'}}, Page),
+            ({**page, 'counts': {**page['counts'], 1: 1}}, Page),
+            ({**page, 'cursor': (1, 2)}, Page),
+            ({**page, 'extra': 1}, Page),
+            ({'items': []}, Page),
+            (list(range(100)) + ['1'], List[int]),
+            ([list(range(30)), list(range(30)) + [None]], List[List[int]]),
+        ]
+        for value, value_type in cases:
+            with self.subTest(value=value, type=value_type):
+                expected = check_type(value, value_type)
+                for budget in (1, 7, 10000):
+                    ok, message = asyncio.run(check_type_async(value, value_type, budget=budget))
+                    self.assertEqual(ok, expected[0])
+                    if not ok:
+                        self.assertEqual(str(message), str(expected[1]))
+
+    def test_slices(self):
+        self.assertEqual(steps(list(range(100)), List[int], 10)[0], 10)
+        self.assertEqual(steps({'id': 1, 'tags': ['a'] * 100}, Item, 10)[0], 10)
+        self.assertIn(steps({'items': [{'id': 1, 'tags': []}] * 30}, Page, 10)[0], range(6, 10))
+        self.assertIn(steps(({'items': [{'id': 1, 'tags': []}] * 30}, 1), Tuple[Page, int], 10)[0], range(6, 10))
+        self.assertIn(steps({str(i): [i] * 5 for i in range(30)}, Dict[str, List[int]], 10)[0], range(12, 19))
+        self.assertEqual(steps(list(range(100)), List[int], 1000), (0, (True, None)))
+        self.assertEqual(steps({'a': 1}, Dict[str, int], 1000), (0, (True, None)))
+
+    def test_nested_slices(self):
+        self.assertEqual(steps([[[0] * 10000] * 10], List[List[List[int]]], 100), (1000, (True, None)))
+        self.assertEqual(steps({'a': [[0] * 100000]}, Dict[str, List[List[int]]], 100), (1000, (True, None)))
+        self.assertIn(steps([{'id': 1, 'tags': ['a'] * 1000}], List[Item], 100)[0], range(9, 12))
+        count, (ok, message) = steps([[[0] * 10000] * 10 + [[None]]], List[List[List[int]]], 100)
+        self.assertEqual(count, 1000)
+        self.assertEqual(str(message), str(check_type([[[0] * 10000] * 10 + [[None]]], List[List[List[int]]])[1]))
+
+    def test_sizes(self):
+        tree = {'name': 'a', 'children': [{'name': 'b', 'children': [{'name': 'c', 'children': []}]}]}
+        cases = [
+            ([[1, 2], [3]], List[List[int]], 5),
+            ([[1, 2], [3]], List[List[List[int]]], 5),
+            ([[1, 2], [3]], List[int], 2),
+            ({'id': 1, 'tags': ['a', 'b']}, Item, 4),
+            ({'a': [[1], [2, 3]]}, Dict[str, List[List[int]]], 6),
+            (([1], {'a': [2]}), Tuple[List[int], Dict[str, List[int]]], 5),
+            ([None, [1, [2]]], List[Optional[List[Union[int, List[int]]]]], 5),
+            (tree, Node, 8),
+            ('abc', List[int], 0),
+        ]
+        for value, value_type, expected in cases:
+            with self.subTest(value=value, type=value_type):
+                self.assertEqual(sizer(value_type)(value, 1000), expected)
+        self.assertEqual(weight([[1, 2], [3]], 1000), 5)
+        self.assertEqual(weight([[0] * 10] * 10, 1000), 110)
+        self.assertLessEqual(sizer(List[List[int]])([[0] * 10] * 10, 20), 30)
+
+    def test_small_values(self):
+        page = {'items': [{'id': i, 'tags': ['x'] * 3} for i in range(5)], 'counts': {'a': 1}, 'cursor': None}
+        with mock.patch.object(Walker, 'check', side_effect=AssertionError):
+            self.assertEqual(asyncio.run(check_type_async(page, Page)), (True, None))
+            ok, message = asyncio.run(check_type_async({**page, 'cursor': (1, 2)}, Page))
+        self.assertFalse(ok)
+        self.assertEqual(str(message), str(check_type({**page, 'cursor': (1, 2)}, Page)[1]))
+
+    def test_yields_to_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            ok, _ = await check_type_async(list(range(10000)), List[int], budget=100)
+            task.cancel()
+            return ok
+
+        self.assertTrue(asyncio.run(main()))
+        self.assertGreater(len(ticks), 50)
+
+    def test_union_yields_to_loop(self):
+        items = [{'id': i, 'tags': []} for i in range(5000)]
+        cases = [
+            (list(range(10000)), Union[List[int], str], 90),
+            ({'status': 'ok', 'items': items}, Union[Done, Failed], 90),
+            ({'status': 'ok', 'items': items}, Union[Failed, Done, None], 90),
+            (items, Union[Dict[str, int], List[Item], Failed], 90),
+            (items, Union[List[Tuple[int]], List[Item]], 90),
+            ({'status': 'error', 'message': 'x'}, Union[Done, Failed], 0),
+        ]
+        for value, value_type, expected in cases:
+            with self.subTest(type=value_type):
+                result, count = ticks(value, value_type, 100)
+                self.assertEqual(result, (True, None))
+                self.assertGreaterEqual(count, expected)
+        failures = [
+            (list(range(10000)) + ['x'], Union[List[int], str]),
+            ({'status': 'ok', 'items': items + [{'id': '1', 'tags': []}]}, Union[Done, Failed]),
+            ({'status': 'x', 'items': items}, Union[Done, Failed]),
+            ({'status': ['ok'], 'items': items}, Union[Done, Failed]),
+            (items + [None], Union[List[Tuple[int]], List[Item]]),
+        ]
+        for value, value_type in failures:
+            with self.subTest(type=value_type):
+                (ok, message), _ = ticks(value, value_type, 100)
+                self.assertFalse(ok)
+                self.assertEqual(str(message), str(check_type(value, value_type)[1]))
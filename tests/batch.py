@@ -0,0 +1,39 @@
+from typing import List, Optional, TypedDict
+from unittest import TestCase
+
+from rtc import is_type, is_type_many, check_many
+
+
+class Event(TypedDict):
+    name: str
+    value: Optional[int]
+
+
+RECORDS = [
+    {'name': 'a', 'value': 1},
+    {'name': 'b', 'value': '2'},
+    {'name': 'c', 'value': None},
+    {'name': 'd'},
+    [],
+]
+
+
+class TestBatch(TestCase):
+
+    def test_is_type_many(self):
+        self.assertEqual(list(is_type_many(RECORDS, Event)), [1, 0, 1, 0, 0])
+        self.assertEqual(list(is_type_many(RECORDS, Event, engine='codegen')), [1, 0, 1, 0, 0])
+        self.assertEqual(
+            [bool(i) for i in is_type_many(RECORDS, Event)],
+            [is_type(i, Event) for i in RECORDS],
+        )
+        self.assertEqual(is_type_many(iter([[1], ['1']]), List[int]), bytearray([1, 0]))
+        self.assertEqual(is_type_many([], int), bytearray())
+
+    def test_check_many(self):
+        errors = check_many(RECORDS, Event)
+        self.assertEqual([idx for idx, _ in errors], [1, 3, 4])
+        self.assertIn('value', str(errors[0][1]))
+        self.assertIn('missed', str(errors[1][1]))
+        self.assertEqual([idx for idx, _ in check_many(RECORDS, Event, limit=2)], [1, 3])
+        self.assertEqual(check_many(RECORDS[:1], Event), [])
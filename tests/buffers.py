@@ -0,0 +1,61 @@
+import array
+from typing import Any, List, MutableSequence, Optional, Sequence, Union
+from unittest import TestCase
+
+from rtc import compile, is_type
+from rtc.buffers import buffer_item_type
+from rtc.is_type import check_type
+
+
+class TestBuffers(TestCase):
+
+    def test_item_type(self):
+        self.assertIs(buffer_item_type(b'ab'), int)
+        self.assertIs(buffer_item_type(bytearray(2)), int)
+        self.assertIs(buffer_item_type(array.array('l', [1])), int)
+        self.assertIs(buffer_item_type(array.array('f', [1.0])), float)
+        self.assertIs(buffer_item_type(array.array('u', 'a')), str)
+        self.assertIs(buffer_item_type(memoryview(array.array('d'))), float)
+        self.assertIs(buffer_item_type(memoryview(b'ab').cast('B', (1, 2))), None)
+        self.assertIs(buffer_item_type([1]), None)
+
+    def test_buffers(self):
+        ints, floats = array.array('i', range(10)), array.array('d', [0.5] * 10)
+        for check in (is_type, lambda value, value_type: check_type(value, value_type)[0]):
+            self.assertTrue(check(ints, Sequence[int]))
+            self.assertTrue(check(ints, MutableSequence[int]))
+            self.assertFalse(check(ints, Sequence[float]))
+            self.assertTrue(check(floats, Sequence[float]))
+            self.assertTrue(check(floats, Sequence[Union[int, float]]))
+            self.assertFalse(check(floats, Sequence[int]))
+            self.assertTrue(check(array.array('d'), Sequence[int]))
+            self.assertTrue(check(memoryview(ints), Sequence[int]))
+            self.assertFalse(check(memoryview(ints), Sequence[str]))
+            self.assertTrue(check(memoryview(floats)[2:5], Sequence[float]))
+            self.assertTrue(check(b'abc', Sequence[int]))
+            self.assertTrue(check(bytearray(b'abc'), MutableSequence[int]))
+            self.assertFalse(check(b'abc', MutableSequence[int]))
+            self.assertFalse(check(b'abc', Sequence[Optional[str]]))
+            self.assertFalse(check(memoryview(b'ab').cast('B', (1, 2)), Sequence[int]))
+            self.assertFalse(check(ints, List[int]))
+            self.assertTrue(check(ints, Sequence[Any]))
+            self.assertTrue(check(memoryview(floats), Sequence[Optional[Any]]))
+            self.assertTrue(check(b'abc', Sequence[Union[str, Any]]))
+
+    def test_sequences(self):
+        self.assertTrue(is_type([1, 2], Sequence[int]))
+        self.assertTrue(is_type((1, 2), Sequence[int]))
+        self.assertFalse(is_type([1, '2'], Sequence[int]))
+        self.assertFalse(check_type((1, '2'), Sequence[int])[0])
+        self.assertTrue(is_type('abc', Sequence[str]))
+        self.assertFalse(is_type({1, 2}, Sequence[int]))
+        self.assertTrue(is_type([], Sequence))
+        self.assertFalse(is_type(1, Sequence))
+        self.assertTrue(is_type(b'ab', Sequence[Union[bool, int]], engine='codegen'))
+        self.assertFalse(is_type([1, '2'], Sequence[int], engine='codegen'))
+
+    def test_no_element_loop(self):
+        test = compile(Sequence[int]).test
+        buffer = array.array('q', bytes(8 * 10 ** 6))
+        self.assertTrue(test(buffer))
+        self.assertTrue(test(memoryview(buffer)))
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Tuple, Union, TypedDict
+from unittest import TestCase
+
+from rtc import compile, compile_codegen, is_type
+from rtc.codegen import generate_source
+
+from .compiler import CASES, Data, Open, Ping, Pong
+
+
+class Inner(TypedDict):
+    x: int
+
+
+class Outer(TypedDict, total=False):
+    inner: Inner
+    items: List[Union[Inner, int]]
+    mapping: Dict[str, Optional[Inner]]
+
+
+class TestCodegen(TestCase):
+
+    def test_same_verdicts(self):
+        for value, value_type in CASES:
+            with self.subTest(value=value, type=value_type):
+                self.assertEqual(compile_codegen(value_type).test(value), compile(value_type).test(value))
+
+    def test_nested(self):
+        self.assertTrue(is_type({'inner': {'x': 1}}, Outer, engine='codegen'))
+        self.assertTrue(is_type({'items': [{'x': 1}, 2]}, Outer, engine='codegen'))
+        self.assertTrue(is_type({'mapping': {'a': None, 'b': {'x': 1}}}, Outer, engine='codegen'))
+        self.assertFalse(is_type({'inner': {'x': '1'}}, Outer, engine='codegen'))
+        self.assertFalse(is_type({'items': [{'x': 1}, '2']}, Outer, engine='codegen'))
+        self.assertFalse(is_type({'mapping': {'a': {}}}, Outer, engine='codegen'))
+        self.assertTrue(is_type([1, 'a', None], List[Any], engine='codegen'))
+
+    def test_source(self):
+        source = generate_source(Inner)
+        self.assertIn("value.get('x', MISSING)", source)
+        self.assertIn('type(v1) is t', source)
+        self.assertIs(compile_codegen(Outer), compile_codegen(Outer))
+
+    def test_union_dispatch(self):
+        class A(TypedDict):
+            a: int
+
+        class B(TypedDict):
+            a: str
+            b: str
+
+        union_types = [
+            Union[Ping, Pong, Data],
+            List[Union[Ping, Pong, Data]],
+            Dict[str, Union[A, B]],
+            Union[A, B, Open],
+            Union[int, str, Ping, Pong, Dict[str, int], None],
+            Tuple[Union[Ping, Pong, Dict[str, str]], int],
+        ]
+        values = [
+            {'kind': 'ping', 'id': 1}, {'kind': 'PONG', 'id': 1, 'delay': 0.5}, {'kind': 'data', 'payload': [1]},
+            {'kind': 'data', 'payload': ['1']}, {'kind': ['ping'], 'id': 1}, {'kind': 'x'}, {'a': 1},
+            {'a': '1', 'b': '2'}, {'a': '1'}, {'payload': ['x']}, {'a': 1, 'payload': [1]}, {}, [], None, 1, 'x',
+        ]
+        for value_type in union_types:
+            self.assertNotRegex(generate_source(value_type), r'\bp\d+\(', value_type)
+            for value in [*values, [*values], {'k': values[0]}, (values[0], 1), (values[5], 1)]:
+                with self.subTest(value=value, type=value_type):
+                    self.assertEqual(compile_codegen(value_type).test(value), compile(value_type).test(value))
+
+    def test_message(self):
+        ok, msg = compile_codegen(Inner)({'x': '1'})
+        self.assertFalse(ok)
+        self.assertIn('TypedDict', str(msg))
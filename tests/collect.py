@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional, Tuple, TypedDict, Union
+from unittest import TestCase
+
+from rtc import check_all
+from rtc.collect import Path
+from rtc.is_type import check_type
+
+from .compiler import CASES
+
+
+class Point(TypedDict):
+    time: int
+    tags: List[str]
+
+
+class Track(TypedDict, total=False):
+    name: str
+    points: List[Point]
+    extra: Dict[str, Optional[Point]]
+
+
+class TestCollect(TestCase):
+
+    def test_path(self):
+        root = Path()
+        self.assertEqual(str(root), '')
+        objects = Path(root, 'objects')
+        self.assertEqual(str(Path(Path(objects, 3), 'data')), '/objects/3/data')
+        self.assertEqual(str(Path(objects, 'a/b~c')), '/objects/a~1b~0c')
+        self.assertIs(Path(objects, 1).parent, Path(objects, 2).parent)
+
+    def test_valid(self):
+        for value, value_type in CASES:
+            with self.subTest(value=value, type=value_type):
+                self.assertEqual(not check_all(value, value_type), check_type(value, value_type)[0])
+
+    def test_all_errors(self):
+        track = {
+            'name': 1,
+            'points': [
+                {'time': 1, 'tags': []},
+                {'time': 'x', 'tags': ['a', 2]},
+                {'time': 1},
+                {'time': 1, 'tags': [], 'speed': 1},
+                None,
+            ],
+            'extra': {'a': None, 'b': {'time': 1.5, 'tags': []}, 1: None},
+        }
+        violations = check_all(track, Track)
+        self.assertEqual(
+            [str(i.path) for i in violations],
+            [
+                '/name',
+                '/points/1/time',
+                '/points/1/tags/1',
+                '/points/2/tags',
+                '/points/3/speed',
+                '/points/4',
+                '/extra/b/time',
+                '/extra/1',
+            ],
+        )
+        self.assertIn('"x"', str(violations[1].message))
+        self.assertIn('missed', str(violations[3].message))
+        self.assertTrue(str(violations[-1]).startswith('/extra/1: key "1"'))
+        self.assertEqual([str(i.path) for i in check_all(track, Track, limit=2)], ['/name', '/points/1/time'])
+
+    def test_union_and_tuple(self):
+        value_type = Union[int, List[int], Tuple[str, int]]
+        self.assertEqual([str(i.path) for i in check_all([1, '2'], value_type)], ['/1'])
+        self.assertEqual([str(i.path) for i in check_all(('a', 'b'), value_type)], ['/1'])
+        self.assertEqual([str(i.path) for i in check_all('a', value_type)], [''])
+
+    def test_cap(self):
+        broken = list(map(str, range(100000)))
+        self.assertEqual(len(check_all(broken, List[int], limit=10)), 10)
+        self.assertEqual(len(check_all(broken[:500], List[int], limit=None)), 500)
@@ -0,0 +1,258 @@
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Optional,
+    Any,
+    Callable,
+    ClassVar,
+    Sized,
+    Hashable,
+    Iterable,
+    TypedDict,
+    Literal,
+    TypeVar,
+)
+import gc
+import weakref
+from unittest import TestCase
+
+from rtc import Sample, codegen, compile, compiler, is_type, iterative, tools
+from rtc.compiler import compile_dispatch, find_discriminator
+from rtc.is_type import check_type
+
+
+class A(TypedDict):
+    a: int
+    b: Optional[str]
+
+
+class B(TypedDict, total=False):
+    a: Union[int, float]
+    b: List[A]
+
+
+def f(x: int) -> None:
+    ...
+
+
+CASES = [
+    (123, int),
+    (True, int),
+    (12.3, int),
+    (None, Optional[int]),
+    ('1', Optional[int]),
+    ([1, 2, 3], List),
+    ([1, 2, 3], List[int]),
+    ([1, '2'], List[int]),
+    ([1, 2.0], List[Union[int, float]]),
+    ([1, '2'], List[Union[int, float]]),
+    ((1, 2, 3), Tuple),
+    ((1, 2, 3), Tuple[int]),
+    ((1, 2, 3), Tuple[int, ...]),
+    ((1, '2'), Tuple[int, str]),
+    ((1, '2', 3), Tuple[int, str]),
+    (('1', 2), Tuple[int, str]),
+    ({'1': 1}, Dict),
+    ({'1': 1}, Dict[str, int]),
+    ({1: 1}, Dict[str, int]),
+    ({'1': '1'}, Dict[str, int]),
+    ({'1': '1'}, Dict[str, Any]),
+    ({1: '1'}, Dict[Any, str]),
+    (f, Callable[[int], None]),
+    (f, Callable[[str], None]),
+    (f, callable),
+    (1, callable),
+    ('123', Sized),
+    (123, Sized),
+    ([], Hashable),
+    ([], Iterable),
+    ({'a': 1, 'b': None}, A),
+    ({'a': 1, 'b': None, 'c': 1}, A),
+    ({'a': 1}, A),
+    ({'a': '1', 'b': None}, A),
+    ([], A),
+    ({}, B),
+    ({'a': 1.1, 'c': 1}, B),
+    ({'b': [{'a': 1, 'b': '1'}]}, B),
+    ({'b': [{'a': 1}]}, B),
+    ('a', Literal['a', 'b']),
+    ('c', Literal['a', 'b']),
+    (1, Literal[1, 'a']),
+    (1.0, Literal[1, 'a']),
+    ([2, 'b'], List[Literal[1, 2, 'a', 'b']]),
+]
+
+
+class TestCompile(TestCase):
+
+    def test_same_verdicts(self):
+        for value, value_type in CASES:
+            with self.subTest(value=value, type=value_type):
+                self.assertEqual(compile(value_type).test(value), check_type(value, value_type)[0])
+                self.assertEqual(compile(value_type)(value)[0], check_type(value, value_type)[0])
+
+    def test_memoized(self):
+        self.assertIs(compile(List[int]), compile(List[int]))
+        self.assertIs(compile(A), compile(A))
+        self.assertIsNot(compile(List[int]), compile(List[str]))
+
+    def test_bounded_caches(self):
+        caches = [
+            compiler.CHECKER_CACHE, codegen.CODEGEN_CACHE, iterative.ITERATIVE_CACHE, iterative.PLAN_CACHE,
+            tools.LAYOUT_CACHE,
+        ]
+        sizes = [cache.maxsize for cache in caches]
+        try:
+            for cache in caches:
+                cache.resize(8)
+            refs = []
+            for idx in range(200):
+                value_type = TypedDict('Runtime%d' % idx, {'a': int, 'b': List[Optional[str]]})
+                for engine in ('closure', 'codegen', 'iterative'):
+                    self.assertTrue(is_type({'a': 1, 'b': ['x']}, value_type, engine=engine))
+                self.assertFalse(check_type({'a': '1', 'b': []}, value_type)[0])
+                refs.append(weakref.ref(value_type))
+                del value_type
+            gc.collect()
+            self.assertLessEqual(sum(ref() is not None for ref in refs), 8 * len(caches))
+            self.assertEqual(compile.cache_info().maxsize, 8)
+        finally:
+            for cache, size in zip(caches, sizes):
+                cache.resize(size)
+
+    def test_message(self):
+        ok, msg = compile(List[int])([1, '2'])
+        self.assertFalse(ok)
+        self.assertIn('"2"', str(msg))
+        self.assertEqual(compile(List[int])([1, 2]), (True, None))
+
+
+class Ping(TypedDict):
+    kind: Literal['ping']
+    id: int
+
+
+class Pong(TypedDict):
+    kind: Literal['pong', 'PONG']
+    id: int
+    delay: float
+
+
+class Data(TypedDict):
+    kind: Literal['data']
+    payload: List[int]
+
+
+class Open(TypedDict, total=False):
+    payload: List[str]
+
+
+class TestUnionDispatch(TestCase):
+
+    def test_discriminator(self):
+        key, index = find_discriminator([Ping, Pong, Data])
+        self.assertEqual(key, 'kind')
+        self.assertEqual(index, {'ping': Ping, 'pong': Pong, 'PONG': Pong, 'data': Data})
+        self.assertIsNone(find_discriminator([Ping, Open]))
+        message = Union[Ping, Pong, Data]
+        self.assertTrue(is_type({'kind': 'ping', 'id': 1}, message))
+        self.assertTrue(is_type({'kind': 'PONG', 'id': 1, 'delay': 0.5}, message))
+        self.assertTrue(is_type({'kind': 'data', 'payload': [1]}, message))
+        self.assertFalse(is_type({'kind': 'data', 'payload': ['1']}, message))
+        self.assertFalse(is_type({'kind': 'pong', 'id': 1}, message))
+        self.assertFalse(is_type({'kind': ['ping'], 'id': 1}, message))
+        self.assertFalse(is_type({'id': 1}, message))
+        self.assertFalse(is_type([], message))
+        self.assertTrue(is_type({'kind': 'ping', 'id': 1}, message, engine='codegen'))
+        self.assertFalse(is_type({'kind': 'data', 'payload': ['1']}, message, engine='codegen'))
+
+    def test_keyset(self):
+        class A(TypedDict):
+            a: int
+
+        class B(TypedDict):
+            a: str
+            b: str
+
+        dispatch, covered = compile_dispatch([A, B, Open], {A: compile(A).test, B: compile(B).test})
+        self.assertEqual(covered, (A, B))
+        self.assertIs(dispatch({'a': 1}), compile(A).test)
+        self.assertIsNone(dispatch({'c': 1}))
+        self.assertTrue(is_type({'a': 1}, Union[A, B, Open]))
+        self.assertTrue(is_type({'a': '1', 'b': '2'}, Union[A, B, Open]))
+        self.assertTrue(is_type({'payload': ['x']}, Union[A, B, Open]))
+        self.assertTrue(is_type({'a': '1'}, Union[A, B, Open]))
+        self.assertFalse(is_type({'a': 1, 'payload': [1]}, Union[A, B, Open]))
+
+    def test_mixed(self):
+        value_type = Union[int, str, Ping, Pong, Dict[str, int], None]
+        self.assertTrue(is_type(True, value_type))
+        self.assertTrue(is_type(None, value_type))
+        self.assertTrue(is_type('x', value_type))
+        self.assertTrue(is_type({'kind': 'ping', 'id': 1}, value_type))
+        self.assertTrue(is_type({'kind': 'x'}, Union[Ping, Pong, Dict[str, str]]))
+        self.assertFalse(is_type(1.5, value_type))
+        self.assertFalse(check_type(1.5, value_type)[0])
+        self.assertTrue(check_type({'kind': 'ping', 'id': 1}, value_type)[0])
+
+
+class TestClassify(TestCase):
+
+    def test_kinds(self):
+        T = TypeVar('T')
+        cases = [
+            (int, tools.CLASS, None),
+            ((int,), tools.TYPES, None),
+            ((int, str), tools.TYPES, None),
+            (A, tools.TYPEDDICT, None),
+            (Optional[int], tools.UNION, Union),
+            (Literal[1], tools.LITERAL, Literal),
+            (List[int], tools.GENERIC, list),
+            (T, tools.TYPEVAR, None),
+            (Any, tools.ANY, None),
+            (callable, tools.OTHER, None),
+        ]
+        for value_type, kind, origin in cases:
+            info = tools.classify(value_type)
+            self.assertEqual((info.kind, info.origin), (kind, origin), value_type)
+        self.assertEqual(tools.classify(Dict[str, int]).args, (str, int))
+        self.assertIs(tools.classify(List[int]), tools.classify(List[int]))
+
+    def test_special_forms(self):
+        # special forms are classified before classes, Any is a class since python 3.11
+        self.assertEqual(tools.classify(Any).kind, tools.ANY)
+        self.assertEqual(tools.classify(Union).kind, tools.SPECIAL)
+        self.assertEqual(tools.classify(ClassVar).kind, tools.SPECIAL)
+        for engine in (None, 'codegen', 'iterative'):
+            self.assertTrue(is_type({'a': 1}, Dict[str, Any], engine=engine), engine)
+            self.assertTrue(is_type([1, 'a', None], List[Any], engine=engine), engine)
+            self.assertTrue(is_type(object(), Any, engine=engine), engine)
+        self.assertTrue(check_type((1, 'a'), Tuple[Any, ...])[0])
+
+    def test_bare_aliases(self):
+        # engines read arguments from classify(), bare aliases have no __args__ since python 3.9
+        for value_type, value in ((List, [1, 'a']), (Dict, {1: 'a'}), (Tuple, (1, 'a')), (Iterable, [])):
+            self.assertIsInstance(tools.classify(value_type).args, tuple)
+            for engine in (None, 'codegen', 'iterative'):
+                self.assertTrue(is_type(value, value_type, engine=engine), (value_type, engine))
+                self.assertFalse(is_type(1, value_type, engine=engine), (value_type, engine))
+
+    def test_weak_keys(self):
+        class Item(TypedDict):
+            name: str
+
+        self.assertEqual(tools.classify(Item).kind, tools.TYPEDDICT)
+        key = id(Item)
+        self.assertIn(key, tools._kinds)
+        del Item
+        gc.collect()
+        self.assertNotIn(key, tools._kinds)
+
+    def test_compile_by_id(self):
+        value_type = Dict[str, List[int]]
+        checker = compile(value_type)
+        self.assertIs(compiler._by_id[id(value_type)](), checker)
+        self.assertIs(compile(value_type), checker)
+        self.assertIsNot(compile(value_type, Sample(10)), checker)
@@ -0,0 +1,70 @@
+from types import MappingProxyType
+from typing import (
+    AbstractSet, Collection, Dict, FrozenSet, Iterable, List, Mapping, MutableMapping, MutableSet, Optional, Set,
+)
+from unittest import TestCase
+
+from rtc import Sample, check_sample, is_type
+from rtc.is_type import check_type
+
+
+def check(value, value_type):
+    return check_type(value, value_type)[0]
+
+
+class TestContainers(TestCase):
+
+    def test_sets(self):
+        for func in (is_type, check):
+            self.assertTrue(func({1, 2}, Set[int]))
+            self.assertFalse(func({1, 'a'}, Set[int]))
+            self.assertFalse(func(frozenset({1}), Set[int]))
+            self.assertTrue(func(frozenset({1, True}), FrozenSet[int]))
+            self.assertFalse(func(frozenset({1.5}), FrozenSet[int]))
+            self.assertTrue(func(frozenset({'a'}), AbstractSet[str]))
+            self.assertFalse(func(frozenset({'a'}), MutableSet[str]))
+            self.assertTrue(func({None, 1}, Set[Optional[int]]))
+            self.assertTrue(func({(1, 'a')}, Set[tuple]))
+            self.assertTrue(func(set(), Set[int]))
+            self.assertTrue(func({1}, Set))
+
+    def test_mappings(self):
+        for func in (is_type, check):
+            self.assertTrue(func(MappingProxyType({'a': 1}), Mapping[str, int]))
+            self.assertFalse(func(MappingProxyType({'a': '1'}), Mapping[str, int]))
+            self.assertFalse(func(MappingProxyType({1: 1}), Mapping[str, int]))
+            self.assertFalse(func(MappingProxyType({'a': 1}), MutableMapping[str, int]))
+            self.assertTrue(func({'a': [1]}, MutableMapping[str, List[int]]))
+            self.assertFalse(func({'a': [1, None]}, Mapping[str, List[int]]))
+            self.assertFalse(func({'a': 1, 2: 1}, Dict[str, int]))
+
+    def test_iterables(self):
+        for func in (is_type, check):
+            self.assertTrue(func([1, 2], Iterable[int]))
+            self.assertFalse(func([1, '2'], Iterable[int]))
+            self.assertTrue(func(range(3), Collection[int]))
+            self.assertFalse(func({'a': 1}, Collection[int]))
+            self.assertFalse(func(1, Iterable[int]))
+            self.assertTrue(func('abc', Iterable[str]))
+
+    def test_one_shot_iterators(self):
+        for func in (is_type, check):
+            items = iter([1, '2', 3])
+            self.assertTrue(func(items, Iterable[int]))
+            self.assertEqual(list(items), [1, '2', 3])
+            generator = (i for i in range(3))
+            self.assertTrue(func(generator, Iterable[str]))
+            self.assertEqual(next(generator), 0)
+
+    def test_subclasses(self):
+        class Int(int):
+            pass
+
+        self.assertTrue(is_type({Int(1), 2}, Set[int]))
+        self.assertTrue(is_type([True, Int(2)], List[int]))
+        self.assertFalse(is_type([1], List[bool]))
+
+    def test_sampling(self):
+        self.assertEqual(tuple(check_sample(set(range(1000)), Set[int], Sample(10))), (True, False))
+        self.assertFalse(check_sample({'a'}, Set[int], Sample(10)).valid)
+        self.assertTrue(check_sample(MappingProxyType({'a': 1}), Mapping[str, int], Sample(10)).valid)
@@ -0,0 +1,42 @@
+from typing import List, Optional
+from unittest import TestCase
+
+from rtc import compile
+from rtc.errors import ErrorMessage
+from rtc.is_type import check_type
+
+
+class Counted:
+    calls = 0
+
+    def __repr__(self):
+        Counted.calls += 1
+        return 'Counted()'
+
+
+class TestErrorMessage(TestCase):
+
+    def test_lazy(self):
+        msg = ErrorMessage('got "%s"', Counted())
+        self.assertFalse(check_type([Counted()], Optional[List[int]])[0])
+        self.assertFalse(compile(Optional[List[int]])([Counted()])[0])
+        self.assertEqual(Counted.calls, 0)
+        self.assertEqual(str(msg), 'got "Counted()"')
+        self.assertEqual(Counted.calls, 1)
+
+    def test_truncated(self):
+        ok, msg = check_type(list(range(100000)) + ['x'], Optional[List[int]])
+        self.assertFalse(ok)
+        self.assertLess(len(str(msg)), 200)
+        self.assertLess(len(str(ErrorMessage('"%s"', 'x' * 10000))), 100)
+
+    def test_text(self):
+        self.assertEqual(ErrorMessage('key "%s", %s', 'a', ErrorMessage('got "%s"', 1)), 'key "a", got "1"')
+        ok, msg = compile(List[int])([1, '2'])
+        self.assertEqual(str(msg), str(check_type([1, '2'], List[int])[1]))
+        self.assertIn('"2"', str(msg))
+
+    def test_nested_quotes(self):
+        self.assertEqual(str(ErrorMessage('"%s"', ['x', 'y'])), '"[\'x\', \'y\']"')
+        self.assertEqual(str(ErrorMessage('"%s" %s', 'x', {'k': ('v',)})), '"x" {\'k\': (\'v\',)}')
+        self.assertIn("['x', 'y']", str(check_type(['x', 'y'], int)[1]))
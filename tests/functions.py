@@ -0,0 +1,169 @@
+import asyncio
+import inspect
+from typing import AsyncGenerator, AsyncIterator, Dict, Generator, Iterator, List, Optional
+from unittest import TestCase
+
+from rtc import typechecked
+
+
+@typechecked
+def join(items: List[str], sep: str = ',', /, *, strip: bool = False) -> str:
+    """join items"""
+    result = sep.join(items)
+    return result.strip() if strip else result
+
+
+@typechecked
+def broken(value: int) -> str:
+    return value
+
+
+class Service:
+
+    @typechecked
+    def scale(self, value: float, *factors: int, **tags: str) -> float:
+        for factor in factors:
+            value *= factor
+        return value
+
+    @typechecked
+    @classmethod
+    def create(cls, name: str) -> 'Service':
+        return cls()
+
+
+class TestTypechecked(TestCase):
+
+    def test_arguments(self):
+        self.assertEqual(join(['a', 'b']), 'a,b')
+        self.assertEqual(join(['a ', 'b '], '', strip=True), 'a b')
+        with self.assertRaises(TypeError) as e:
+            join(['a', 1])
+        self.assertIn('arg "items"', str(e.exception))
+        self.assertRaises(TypeError, join, ['a'], 1)
+        self.assertRaises(TypeError, join, ['a'], strip='yes')
+        self.assertRaises(TypeError, join, items=['a'])
+        self.assertEqual(join.__name__, 'join')
+        self.assertEqual(join.__doc__, 'join items')
+        self.assertEqual(str(inspect.signature(join)), str(inspect.signature(join.__wrapped__)))
+
+    def test_return(self):
+        with self.assertRaises(TypeError) as e:
+            broken(1)
+        self.assertIn('return value', str(e.exception))
+
+    def test_defaults_not_checked(self):
+        @typechecked
+        def f(value: int = None) -> Optional[int]:
+            return value
+
+        self.assertIsNone(f())
+        self.assertEqual(f(1), 1)
+        self.assertRaises(TypeError, f, '1')
+
+    def test_methods(self):
+        service = Service.create('x')
+        self.assertEqual(service.scale(1.5, 2, 3, unit='m'), 9.0)
+        self.assertRaises(TypeError, service.scale, 1.5, 2.0)
+        self.assertRaises(TypeError, service.scale, 1.5, unit=1)
+        self.assertRaises(TypeError, Service.create, 1)
+
+    def test_async(self):
+        @typechecked
+        async def fetch(key: str) -> Dict[str, int]:
+            await asyncio.sleep(0)
+            return {key: 1} if key != 'bad' else {key: '1'}
+
+        self.assertTrue(inspect.iscoroutinefunction(fetch))
+        self.assertEqual(asyncio.run(fetch('a')), {'a': 1})
+        self.assertRaises(TypeError, asyncio.run, fetch('bad'))
+        self.assertRaises(TypeError, asyncio.run, fetch(1))
+
+    def test_generator(self):
+        @typechecked
+        def counter(limit: int) -> Generator[int, Optional[int], str]:
+            value = 0
+            while value < limit:
+                step = yield value
+                value += step or 1
+            return 'done' if limit > 0 else limit
+
+        self.assertTrue(inspect.isgeneratorfunction(counter))
+        self.assertEqual(list(counter(3)), [0, 1, 2])
+        gen = counter(10)
+        self.assertEqual(next(gen), 0)
+        self.assertEqual(gen.send(5), 5)
+        self.assertRaises(TypeError, gen.send, '1')
+        self.assertRaises(TypeError, list, counter(0))
+
+        @typechecked
+        def items(values: list) -> Iterator[int]:
+            yield from values
+
+        self.assertEqual(list(items([1, 2])), [1, 2])
+        self.assertRaises(TypeError, list, items([1, '2']))
+
+    def test_generator_iterated(self):
+        @typechecked
+        def echo(limit: int) -> Generator[int, str, None]:
+            for value in range(limit):
+                received = yield value
+                if received is not None:
+                    yield len(received)
+
+        result = []
+        for value in echo(3):
+            result.append(value)
+        self.assertEqual(result, [0, 1, 2])
+        gen = echo(3)
+        next(gen)
+        self.assertEqual(gen.send('abc'), 3)
+        self.assertRaises(TypeError, gen.send, 1)
+
+        @typechecked
+        async def stream(limit: int) -> AsyncGenerator[int, str]:
+            for value in range(limit):
+                yield value
+
+        async def collect():
+            return [value async for value in stream(3)]
+
+        self.assertEqual(asyncio.run(collect()), [0, 1, 2])
+
+    def test_async_generator(self):
+        @typechecked
+        async def stream(values: list) -> AsyncIterator[int]:
+            for value in values:
+                yield value
+
+        async def collect(values):
+            return [value async for value in stream(values)]
+
+        self.assertTrue(inspect.isasyncgenfunction(stream))
+        self.assertEqual(asyncio.run(collect([1, 2])), [1, 2])
+        self.assertRaises(TypeError, asyncio.run, collect([1, '2']))
+
+    def test_sample_rate(self):
+        @typechecked(sample_rate=0)
+        def never(value: int) -> int:
+            return value
+
+        @typechecked(sample_rate=1)
+        def always(value: int) -> int:
+            return value
+
+        self.assertEqual(never('1'), '1')
+        self.assertRaises(TypeError, always, '1')
+        self.assertRaises(ValueError, typechecked, sample_rate=2)
+
+        @typechecked(sample_rate=0.5)
+        def sometimes(value: int) -> int:
+            return value
+
+        failures = 0
+        for _ in range(1000):
+            try:
+                sometimes('1')
+            except TypeError:
+                failures += 1
+        self.assertTrue(300 < failures < 700)
@@ -14,10 +14,23 @@ from typing import (
     Coroutine,
     Generator,
     TypedDict,
+    Literal,
 )
-from unittest import TestCase
+import gc
+import sys
+from enum import Enum
+from functools import partial
+from unittest import TestCase, skipUnless
 
-from rtc import is_type
+from rtc import EnumValue, is_type
+from rtc.is_type import _callables, check_type
+from rtc.tools import typeddict_layout
+
+
+class Status(Enum):
+    OK = 'ok'
+    FAILED = 'failed'
+    CODE = 1
 
 
 async def f(x: int) -> str:
@@ -97,6 +110,48 @@ class TestIsType(TestCase):
         self.assertFalse(is_type(g, Callable[[Union[int, float], Dict[str, List[Optional[str]]]], Optional[bool]]))
         self.assertTrue(is_type(g, Callable[[Union[int, float], Dict[Any, List[Optional[str]]]], Optional[bool]]))
 
+    def test_callable_signature(self):
+        def f(x: int, y: str = '', *args: int, key: 'Optional[str]' = None) -> 'int':
+            ...
+
+        def g(x: int, *, key: str) -> None:
+            ...
+
+        class Handler:
+            def handle(self, x: int) -> None:
+                ...
+
+        self.assertTrue(is_type(f, Callable[[int], int]))
+        self.assertTrue(is_type(f, Callable[[int, str, int, int], int]))
+        self.assertFalse(is_type(f, Callable[[int, str, str], int]))
+        self.assertFalse(is_type(f, Callable[[], int]))
+        self.assertFalse(is_type(f, Callable[[int], str]))
+        self.assertTrue(is_type(f, Callable[..., int]))
+        self.assertFalse(is_type(f, Callable[..., str]))
+        self.assertFalse(is_type(g, Callable[[int], None]))
+        self.assertTrue(is_type(partial(g, key='a'), Callable[[int], None]))
+        self.assertTrue(is_type(partial(f, 1), Callable[[str], int]))
+        self.assertFalse(is_type(partial(f, 1, ''), Callable[[str], int]))
+        self.assertTrue(is_type(Handler().handle, Callable[[int], None]))
+        self.assertFalse(is_type(Handler().handle, Callable[[int, int], None]))
+        self.assertTrue(is_type(len, Callable[[Any], int]))
+        self.assertFalse(is_type(len, Callable[[Any, Any], int]))
+        self.assertTrue(is_type(print, Callable[[str], None]))
+        self.assertIn('does not accept 0 positional args', str(check_type(f, Callable[[], int])[1]))
+
+    def test_callable_cache(self):
+        def f(x: int) -> None:
+            ...
+
+        self.assertTrue(is_type(f, Callable[[int], None]))
+        self.assertFalse(is_type(f, Callable[[str], None]))
+        key = (id(f), False)
+        self.assertEqual(len(_callables[key][2]), 2)
+        self.assertIs(check_type(f, Callable[[str], None]), check_type(f, Callable[[str], None]))
+        del f
+        gc.collect()
+        self.assertNotIn(key, _callables)
+
     def test_sized(self):
         self.assertFalse(is_type(123, Sized))
         self.assertFalse(is_type(12.3, Sized))
@@ -282,3 +337,87 @@ class TestIsType(TestCase):
                 Response,
             )
         )
+
+    def test_literal(self):
+        codes = Literal[tuple(range(100, 600))]
+        self.assertTrue(is_type(404, codes))
+        self.assertFalse(is_type(99, codes))
+        self.assertFalse(is_type(404.0, codes))
+        self.assertFalse(is_type('404', codes))
+        self.assertFalse(is_type([404], codes))
+        self.assertTrue(is_type('b', Literal['a', 'b', None]))
+        self.assertTrue(is_type(None, Literal['a', 'b', None]))
+        self.assertFalse(is_type('c', Literal['a', 'b', None]))
+        self.assertFalse(is_type(True, Literal[7, 'seven']))
+        self.assertFalse(is_type(0, Literal[False, 'no']))
+        self.assertTrue(is_type(False, Literal[False, 'no']))
+        self.assertTrue(is_type(Status.OK, Literal[Status.OK]))
+        self.assertFalse(is_type('ok', Literal[Status.OK]))
+        self.assertEqual(check_type('c', Literal['a', 'b'])[0], False)
+        self.assertIn('"c"', str(check_type('c', Literal['a', 'b'])[1]))
+
+    def test_literal_typeddict(self):
+        class Event(TypedDict):
+            name: Literal['click', 'view']
+            status: EnumValue[Status]
+
+        self.assertTrue(is_type({'name': 'click', 'status': Status.OK}, Event))
+        self.assertTrue(is_type({'name': 'view', 'status': 'failed'}, Event))
+        self.assertTrue(is_type({'name': 'view', 'status': 1}, Event))
+        self.assertFalse(is_type({'name': 'view', 'status': True}, Event))
+        self.assertFalse(is_type({'name': 'view', 'status': 'unknown'}, Event))
+        self.assertFalse(is_type({'name': 'scroll', 'status': 'ok'}, Event))
+        self.assertFalse(check_type({'name': 'scroll', 'status': 'ok'}, Event)[0])
+        self.assertTrue(is_type({'name': 'view', 'status': 'failed'}, Event, engine='codegen'))
+        self.assertFalse(is_type({'name': 'scroll', 'status': 'ok'}, Event, engine='codegen'))
+
+    def test_enum(self):
+        self.assertTrue(is_type(Status.OK, Status))
+        self.assertFalse(is_type('ok', Status))
+        self.assertTrue(is_type('ok', EnumValue[Status]))
+        self.assertTrue(is_type(Status.CODE, EnumValue[Status]))
+        self.assertFalse(is_type('OK', EnumValue[Status]))
+
+    @skipUnless(sys.version_info >= (3, 9), 'python 3.8 does not keep "total" of TypedDict bases')
+    def test_typeddict_layout(self):
+        class Base(TypedDict, total=False):
+            note: str
+
+        class Event(Base):
+            name: str
+
+        layout = typeddict_layout(Event)
+        self.assertEqual(layout.required, {'name'})
+        self.assertEqual(layout.optional, {'note'})
+        self.assertTrue(layout.closed)
+        cases = [
+            ({'name': 'a'}, True),
+            ({'name': 'a', 'note': 'b'}, True),
+            ({'note': 'b'}, False),
+            ({'name': 'a', 'other': 1}, False),
+            ({'name': 'a', 'note': 1}, False),
+        ]
+        for value, expected in cases:
+            for engine in ('closure', 'codegen', 'iterative'):
+                self.assertEqual(is_type(value, Event, engine=engine), expected, (value, engine))
+            self.assertEqual(check_type(value, Event)[0], expected, value)
+        self.assertEqual(str(check_type({'note': 'b'}, Event)[1]), 'fields "name" missed in TypedDict')
+
+    @skipUnless(sys.version_info >= (3, 11), 'Required / NotRequired are added in python 3.11')
+    def test_required(self):
+        from typing import NotRequired, Required
+
+        class Query(TypedDict, total=False):
+            id: Required[int]
+            tags: List[str]
+
+        class Reply(TypedDict):
+            id: int
+            tags: NotRequired[List[str]]
+
+        for value_type in (Query, Reply):
+            self.assertEqual(typeddict_layout(value_type).required, {'id'})
+            self.assertEqual(typeddict_layout(value_type).fields['tags'], List[str])
+            self.assertTrue(is_type({'id': 1}, value_type))
+            self.assertFalse(is_type({'tags': []}, value_type))
+            self.assertFalse(is_type({'id': 1, 'tags': [1]}, value_type))
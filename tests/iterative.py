@@ -0,0 +1,72 @@
+from typing import Dict, List, Optional, Tuple, TypedDict, Union
+from unittest import TestCase
+
+from rtc import compile, is_type
+from rtc.is_type import check_type
+from rtc.iterative import FLAT, compile_iterative, plan
+
+from .compiler import CASES
+
+
+class Node(TypedDict):
+    name: str
+    children: List['Node']
+
+
+class Comment(TypedDict, total=False):
+    text: str
+    replies: Optional[List['Comment']]
+    meta: Dict[str, Union[int, 'Comment']]
+
+
+def tree(depth, leaf=None):
+    node = {'name': 'leaf', 'children': [] if leaf is None else [leaf]}
+    for i in range(depth):
+        node = {'name': str(i), 'children': [node]}
+    return node
+
+
+class TestIterative(TestCase):
+
+    def test_same_verdicts(self):
+        cases = [
+            *CASES,
+            (tree(10), Node),
+            (tree(10, {'name': 1, 'children': []}), Node),
+            (tree(10, {'name': 'x'}), Node),
+            (tree(10, {'name': 'x', 'children': [], 'extra': 1}), Node),
+            ({'text': 'a', 'replies': [{'replies': None}, {'meta': {'a': 1, 'b': {'text': 'c'}}}]}, Comment),
+            ({'text': 'a', 'replies': [{'meta': {'a': 1, 'b': {'text': 1}}}]}, Comment),
+            ({'text': 'a', 'replies': [{'meta': {'a': 1.5}}]}, Comment),
+            ({'a': [1], 'b': ['x']}, Dict[str, Union[List[int], List[str]]]),
+            ({'a': [1, 'x']}, Dict[str, Union[List[int], List[str]]]),
+            ((tree(3), [tree(2)]), Tuple[Node, List[Node]]),
+            ((tree(3), 1), Tuple[Node, List[Node]]),
+            ([tree(2), None, [tree(1)]], List[Union[Node, None, List[Node]]]),
+            ([tree(2), 'x'], List[Union[Node, None, List[Node]]]),
+        ]
+        for value, value_type in cases:
+            with self.subTest(value=value, type=value_type):
+                expected = check_type(value, value_type)[0]
+                self.assertEqual(is_type(value, value_type, engine='iterative'), expected)
+                self.assertEqual(compile_iterative(value_type)(value)[0], expected)
+                self.assertEqual(is_type(value, value_type), expected)
+
+    def test_deep(self):
+        self.assertTrue(is_type(tree(100000), Node, engine='iterative'))
+        self.assertTrue(is_type([[tree(5000)]], List[List[Node]], engine='iterative'))
+        ok, message = compile_iterative(Node)(tree(100000, {'name': 1, 'children': []}))
+        self.assertFalse(ok)
+        self.assertIn('"1"', str(message))
+        ok, message = compile_iterative(Node)(tree(100000, {'name': 'x'}))
+        self.assertIn('missed', str(message))
+        with self.assertRaises(RecursionError):
+            check_type(tree(100000), Node)
+
+    def test_plan(self):
+        self.assertEqual(plan(List[Dict[str, int]])[0], FLAT)
+        self.assertNotEqual(plan(Node)[0], FLAT)
+        self.assertIs(compile_iterative(Node), compile_iterative(Node))
+        self.assertTrue(compile(Node).test(tree(3)))
+        self.assertFalse(compile(Node).test(tree(3, {'name': None, 'children': []})))
+        self.assertFalse(is_type(tree(3, {'name': None, 'children': []}), Node, engine='codegen'))
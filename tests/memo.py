@@ -0,0 +1,47 @@
+from typing import FrozenSet, List, Optional, Tuple
+from unittest import TestCase
+
+from rtc import check_type_cached
+from rtc.memo import RESULT_CACHE, is_immutable
+
+
+class TestMemo(TestCase):
+
+    def setUp(self):
+        check_type_cached.cache_clear()
+
+    def test_immutable(self):
+        self.assertTrue(is_immutable((1, 'a', (None, 2.5, frozenset({b'x'})))))
+        self.assertTrue(is_immutable('a'))
+        self.assertFalse(is_immutable((1, [2])))
+        self.assertFalse(is_immutable([1]))
+        self.assertFalse(is_immutable(type('Str', (str,), {})('a')))
+
+    def test_hits(self):
+        config = tuple(('key-%d' % i, i) for i in range(100))
+        value_type = Tuple[Tuple[str, int], ...]
+        self.assertEqual(check_type_cached(config, value_type), (True, None))
+        self.assertEqual(check_type_cached(config, value_type), (True, None))
+        self.assertEqual(check_type_cached.cache_info().hits, 1)
+        self.assertEqual(check_type_cached.cache_info().currsize, 1)
+        ok, message = check_type_cached(config, Tuple[Tuple[str, str], ...])
+        self.assertFalse(ok)
+        self.assertIn('"0"', str(message))
+        self.assertIs(check_type_cached(config, Tuple[Tuple[str, str], ...])[1], message)
+        self.assertEqual(check_type_cached.cache_info().hits, 2)
+
+    def test_mutable_not_cached(self):
+        value = [1, 2]
+        self.assertTrue(check_type_cached(value, List[int])[0])
+        value.append('3')
+        self.assertFalse(check_type_cached(value, List[int])[0])
+        self.assertEqual(check_type_cached.cache_info().currsize, 0)
+
+    def test_no_stale_ids(self):
+        for i in range(1000):
+            value = (i, str(i))
+            self.assertEqual(check_type_cached(value, Tuple[int, str])[0], True)
+            self.assertEqual(check_type_cached((str(i), i), Tuple[int, str])[0], False)
+        self.assertLessEqual(len(RESULT_CACHE), RESULT_CACHE.maxsize)
+        self.assertTrue(check_type_cached(frozenset({1}), FrozenSet[int])[0])
+        self.assertTrue(check_type_cached(None, Optional[int])[0])
@@ -0,0 +1,81 @@
+from typing import Dict, List
+from unittest import TestCase
+
+from rtc import instrumentation, is_type, staticclass, stats
+from rtc.metrics import BUCKETS
+
+
+@staticclass
+class Point:
+    x: int
+    y: int
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.hooks.clear()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        self.assertTrue(is_type([1], List[int]))
+        Point(1, 2)
+        self.assertEqual(stats(), {})
+        self.assertNotIn('__wrapped__', Point.__init__.__dict__)
+
+    def test_counters(self):
+        instrumentation.enable()
+        self.assertTrue(is_type([1, 2, 3], List[int]))
+        self.assertFalse(is_type([1, '2'], List[int]))
+        self.assertTrue(is_type({'a': 1}, Dict[str, int], engine='codegen'))
+        row = stats()[List[int]]
+        self.assertEqual((row.calls, row.failures, row.elements), (2, 1, 5))
+        self.assertGreater(row.total, 0)
+        self.assertEqual(len(row.histogram), len(BUCKETS) + 1)
+        self.assertEqual(sum(row.histogram), 2)
+        self.assertEqual(stats()[Dict[str, int]].calls, 1)
+
+    def test_staticclass(self):
+        instrumentation.enable()
+        Point(1, y=2)
+        with self.assertRaises(TypeError):
+            Point(1, '2')
+        row = stats()[Point]
+        self.assertEqual((row.calls, row.failures, row.elements), (2, 1, 4))
+        instrumentation.disable()
+        Point(1, 2)
+        self.assertEqual(stats()[Point].calls, 2)
+
+        @staticclass
+        class Late:
+            x: int
+
+        instrumentation.enable()
+        Late(1)
+        self.assertEqual(stats()[Late].calls, 1)
+
+    def test_hooks(self):
+        events = []
+
+        def trace(value_type, value):
+            events.append(('start', value_type))
+            return lambda ok, elapsed: events.append(('end', value_type, ok))
+
+        instrumentation.add_hook(trace)
+        instrumentation.add_hook(lambda value_type, value: None)
+        is_type([1], List[int])
+        self.assertEqual(events, [])
+        instrumentation.enable()
+        is_type([1], List[int])
+        is_type(['1'], List[int])
+        self.assertEqual(
+            events,
+            [('start', List[int]), ('end', List[int], True), ('start', List[int]), ('end', List[int], False)],
+        )
+        instrumentation.remove_hook(trace)
+        is_type([1], List[int])
+        self.assertEqual(len(events), 4)
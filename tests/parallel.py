@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, TypedDict
+from unittest import TestCase
+
+from rtc import check_many, check_parallel, is_type, is_type_many, is_type_parallel
+from rtc.is_type import check_type
+from rtc.parallel import chunks, split
+
+
+class Record(TypedDict):
+    id: int
+    name: Optional[str]
+
+
+RECORDS = [{'id': i, 'name': None if i % 2 else str(i)} for i in range(1000)]
+BROKEN = RECORDS[:100] + [{'id': '100', 'name': None}] + RECORDS[101:700] + [[]] + RECORDS[701:]
+
+
+class TestParallel(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_split(self):
+        self.assertEqual(split([1], List[int]), ([1], int, False))
+        self.assertEqual(split((1,), Tuple[int, ...]), ((1,), int, False))
+        self.assertEqual(split({'a': 1}, Dict[str, int]), ([('a', 1)], Tuple[str, int], True))
+        self.assertIsNone(split((1, 'a'), Tuple[int, str]))
+        self.assertIsNone(split({'a': 1}, List[int]))
+        self.assertIsNone(split([1], List))
+        self.assertEqual([start for start, _ in chunks(list(range(10)), 1)], [0, 3, 6, 9])
+
+    def test_is_type(self):
+        options = {'executor': self.executor, 'min_size': 10}
+        self.assertTrue(is_type_parallel(RECORDS, List[Record], **options))
+        self.assertFalse(is_type_parallel(BROKEN, List[Record], **options))
+        self.assertTrue(is_type_parallel(tuple(RECORDS), Tuple[Record, ...], **options))
+        self.assertTrue(is_type_parallel({str(i): i for i in range(100)}, Dict[str, int], **options))
+        self.assertFalse(is_type_parallel({**{str(i): i for i in range(100)}, 5: 5}, Dict[str, int], **options))
+        self.assertFalse(is_type_parallel(RECORDS, Dict[str, int], **options))
+        self.assertTrue(is_type(RECORDS, List[Record], workers=2))
+        self.assertFalse(is_type(BROKEN, List[Record], workers=2))
+        with self.assertRaises(ValueError):
+            is_type(RECORDS, List[Record], engine='codegen', workers=2)
+
+    def test_check(self):
+        options = {'executor': self.executor, 'min_size': 10}
+        errors = check_parallel(BROKEN, List[Record], **options)
+        self.assertEqual([idx for idx, _ in errors], [100, 700])
+        self.assertEqual(str(errors[0][1]), str(check_type(BROKEN[100], Record)[1]))
+        self.assertEqual([idx for idx, _ in check_parallel(BROKEN, List[Record], limit=1, **options)], [100])
+        self.assertEqual(check_parallel(RECORDS, List[Record], **options), [])
+        errors = check_parallel({**{str(i): i for i in range(100)}, 5: 5, '7': '7'}, Dict[str, int], **options)
+        self.assertEqual([key for key, _ in errors], ['7', 5])
+        self.assertTrue(str(errors[0][1]).startswith('value for key "7"'))
+        self.assertTrue(str(errors[1][1]).startswith('key "5"'))
+        self.assertEqual([idx for idx, _ in check_parallel(1, List[int])], [None])
+
+    def test_batch(self):
+        mask = is_type_many(BROKEN, Record, workers=2)
+        self.assertEqual(mask, is_type_many(BROKEN, Record))
+        self.assertEqual(
+            [idx for idx, _ in check_many(iter(BROKEN), Record, workers=2)],
+            [idx for idx, _ in check_many(BROKEN, Record)],
+        )
+        self.assertEqual([idx for idx, _ in check_many(BROKEN, Record, workers=2, limit=1)], [100])
+        with self.assertRaises(ValueError):
+            is_type_many(BROKEN, Record, engine='codegen', workers=2)
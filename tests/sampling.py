@@ -0,0 +1,56 @@
+from typing import Dict, List, Tuple
+from unittest import TestCase
+
+from rtc import Sample, check_sample, compile, is_type
+
+
+class TestSampling(TestCase):
+
+    def test_head(self):
+        sample = Sample(10)
+        self.assertTrue(is_type(list(range(100)) + ['x'], List[int], sample=sample))
+        self.assertFalse(is_type(['x'] + list(range(100)), List[int], sample=sample))
+        self.assertFalse(is_type(tuple(range(100)), List[int], sample=sample))
+        self.assertFalse(is_type(list(range(100)) + ['x'], List[int]))
+
+    def test_exhaustive(self):
+        sample = Sample(10)
+        self.assertEqual(check_sample(list(range(10)), List[int], sample), (True, True))
+        self.assertEqual(check_sample(list(range(11)), List[int], sample), (True, False))
+        self.assertEqual(check_sample([list(range(11))], List[List[int]], sample), (True, False))
+        self.assertEqual(check_sample(['x'] * 11, List[int], sample), (False, False))
+
+    def test_random(self):
+        for strategy in ('random', 'stratified'):
+            sample = Sample(50, strategy, seed=1)
+            self.assertTrue(is_type(list(range(1000)), List[int], sample=sample))
+            self.assertFalse(is_type(['x'] * 1000, List[int], sample=sample))
+            self.assertTrue(is_type({str(i): i for i in range(1000)}, Dict[str, int], sample=sample))
+            self.assertFalse(is_type({i: i for i in range(1000)}, Dict[str, int], sample=sample))
+            self.assertTrue(is_type(tuple(range(1000)), Tuple[int, ...], sample=sample))
+            self.assertEqual(check_sample(list(range(1000)), List[int], sample), (True, False))
+
+    def test_seed(self):
+        value = list(range(1000))
+        for strategy in ('random', 'stratified'):
+            sample = Sample(10, strategy, seed=7)
+            picked = [sample.positions(1000) for _ in range(3)]
+            self.assertEqual(picked[0], picked[1])
+            self.assertEqual(picked[0], picked[2])
+            self.assertNotEqual(picked[0], Sample(10, strategy, seed=8).positions(1000))
+            for pos in range(0, 1000, 37):
+                invalid = value[:pos] + ['x'] + value[pos + 1:]
+                verdicts = {is_type(invalid, List[int], sample=Sample(10, strategy, seed=7)) for _ in range(3)}
+                self.assertEqual(len(verdicts), 1, pos)
+
+    def test_compiled(self):
+        sample = Sample(5)
+        self.assertIs(compile(List[int], sample), compile(List[int], Sample(5)))
+        self.assertIsNot(compile(List[int], sample), compile(List[int]))
+        self.assertTrue(compile(List[int], sample).test([1] * 10 + ['x']))
+        self.assertFalse(compile(Tuple[int, str], sample).test((1, 2)))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Sample, 10, 'middle')
+        self.assertRaises(ValueError, Sample, 0)
+        self.assertRaises(ValueError, is_type, [], List[int], 'codegen', Sample(10))
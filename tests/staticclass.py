@@ -199,3 +199,179 @@ class TestStaticClass(TestCase):
         self.assertTrue(bool(A(a=f)))
         self.assertTrue(bool(A(a=g)))
         self.assertRaises(TypeError, A, a=h)
+
+    def test_positional(self):
+        @staticclass
+        class A:
+            a: int
+            b: Optional[str]
+
+        obj = A(1, None)
+        self.assertEqual((obj.a, obj.b), (1, None))
+        obj = A(2, b='x')
+        self.assertEqual((obj.a, obj.b), (2, 'x'))
+        self.assertRaises(TypeError, A, '1', None)
+        self.assertRaises(TypeError, A, 1)
+        self.assertRaises(TypeError, A, 1, 'x', 3)
+        self.assertRaises(TypeError, A, 1, b='x', c=3)
+
+    def test_defaults(self):
+        @staticclass
+        class A:
+            a: int
+            b: List[str] = []
+            c: Optional[float] = None
+
+        obj = A(a=1)
+        self.assertEqual((obj.a, obj.b, obj.c), (1, [], None))
+        obj = A(1, ['x'], 1.5)
+        self.assertEqual((obj.a, obj.b, obj.c), (1, ['x'], 1.5))
+        self.assertRaises(TypeError, A)
+        self.assertRaises(TypeError, A, 1, [1])
+
+    def test_inheritance(self):
+        @staticclass
+        class A:
+            a: int
+
+        @staticclass
+        class B(A):
+            b: str = 'b'
+
+        obj = B(1)
+        self.assertEqual((obj.a, obj.b), (1, 'b'))
+        self.assertRaises(TypeError, B, 'a')
+
+    def test_slots(self):
+        @staticclass(slots=True)
+        class A:
+            a: int
+            b: Dict[str, int] = {}
+
+            def total(self):
+                return self.a + sum(self.b.values())
+
+        obj = A(1, {'x': 2})
+        self.assertEqual(obj.total(), 3)
+        self.assertEqual(A(5).b, {})
+        self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertEqual(A.__slots__, ('a', 'b'))
+        self.assertRaises(AttributeError, setattr, obj, 'c', 1)
+        self.assertRaises(TypeError, A, 1, {'x': '2'})
+
+        @staticclass(slots=True)
+        class B(A):
+            c: Tuple[int, str]
+
+        obj = B(1, {}, (1, '1'))
+        self.assertEqual(B.__slots__, ('c',))
+        self.assertEqual(obj.c, (1, '1'))
+
+    def test_slots_super(self):
+        class Base:
+            def describe(self):
+                return 'base'
+
+            @classmethod
+            def make(cls):
+                return 'made'
+
+            @property
+            def label(self):
+                return 'label'
+
+        @staticclass(slots=True)
+        class A(Base):
+            a: int
+
+            def describe(self):
+                return super().describe() + str(self.a)
+
+            def reset(self):
+                super().__init__()
+                return self
+
+            @classmethod
+            def make(cls):
+                return super().make() + '!'
+
+            @property
+            def label(self):
+                return super().label.upper()
+
+            @staticmethod
+            def kind():
+                return __class__
+
+        obj = A(1)
+        self.assertEqual(obj.describe(), 'base1')
+        self.assertIs(obj.reset(), obj)
+        self.assertEqual(A.make(), 'made!')
+        self.assertEqual(obj.label, 'LABEL')
+        self.assertIs(A.kind(), A)
+        self.assertTrue(A.__qualname__.endswith('test_slots_super.<locals>.A'))
+        self.assertEqual(A.__init__.__qualname__, A.__qualname__ + '.__init__')
+
+    def test_message(self):
+        @staticclass
+        class A:
+            a: List[int]
+
+        with self.assertRaises(TypeError) as ctx:
+            A([1, '2'])
+        self.assertIn('"2"', str(ctx.exception))
+        with self.assertRaises(TypeError) as ctx:
+            A()
+        self.assertEqual(str(ctx.exception), 'arg "a" not passed')
+
+    def test_reserved_names(self):
+        @staticclass
+        class A:
+            type: int
+            isinstance: List[str]
+            t0: Optional[str] = None
+
+        obj = A(1, ['x'])
+        self.assertEqual((obj.type, obj.isinstance, obj.t0), (1, ['x'], None))
+        self.assertRaises(TypeError, A, '1', ['x'])
+        self.assertRaises(TypeError, A, 1, [1])
+        self.assertRaises(TypeError, A, 1, ['x'], 1)
+
+    def test_mutable_defaults(self):
+        @staticclass
+        class A:
+            a: int
+            b: List[str] = []
+            c: Dict[str, List[int]] = {'x': []}
+
+        first, second = A(1), A(2)
+        self.assertIsNot(first.b, second.b)
+        self.assertIsNot(first.c['x'], second.c['x'])
+        first.b.append('x')
+        self.assertEqual((A.b, second.b), ([], []))
+
+    def test_generated_names(self):
+        @staticclass
+        class A:
+            self: int
+            TypeError: str = ''
+
+        obj = A(self=1, TypeError='x')
+        self.assertEqual((obj.self, obj.TypeError), (1, 'x'))
+        self.assertRaises(TypeError, A, '1')
+
+        @staticclass(slots=True)
+        class B:
+            _rtc_self: int
+            _rtc_missing: Optional[str] = None
+            b: List[int] = []
+
+        obj = B(1)
+        self.assertEqual((obj._rtc_self, obj._rtc_missing, obj.b), (1, None, []))
+        self.assertIsNot(B(1).b, obj.b)
+        self.assertEqual(B(1, _rtc_missing='x')._rtc_missing, 'x')
+        self.assertRaises(TypeError, B, '1')
+        self.assertRaises(TypeError, B)
+        self.assertRaises(TypeError, B, 1, None, [], 4)
+        self.assertRaises(TypeError, B, 1, _rtc_self=1)
+        self.assertRaises(TypeError, B, 1, c=1)
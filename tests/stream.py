@@ -0,0 +1,107 @@
+import io
+import json
+from typing import Any, Dict, List, Optional, Union, TypedDict
+from unittest import TestCase
+
+from rtc import is_type
+from rtc.stream import StreamError, check_stream, iter_stream, tokenize
+
+
+class Event(TypedDict):
+    name: str
+    time: float
+    tags: Optional[List[str]]
+
+
+class Partial(TypedDict, total=False):
+    name: str
+    meta: Dict[str, Union[int, str]]
+
+
+DOCS = [
+    ([{'name': 'a', 'time': 1.5, 'tags': None}, {'name': 'b', 'time': -2e10, 'tags': ['x', 'y\n"']}], List[Event]),
+    ([{'name': 'a', 'time': 1.5, 'tags': [1]}], List[Event]),
+    ([{'name': 'a', 'time': 1.5}], List[Event]),
+    ([{'name': 'a', 'time': 1.5, 'tags': None, 'x': 1}], List[Event]),
+    ([{'name': 'a', 'time': '1.5', 'tags': None}], List[Event]),
+    ({'name': 'x', 'meta': {'a': 1, 'b': 'ü', 'c': True}, 'other': [1, {'a': []}]}, Partial),
+    ({'meta': {'a': 1.5}}, Partial),
+    ({'meta': []}, Partial),
+    ({'a': [1, 2, None]}, Dict[str, List[Optional[int]]]),
+    ({'a': [1, 2, 'x']}, Dict[str, List[Optional[int]]]),
+    ([1, 'a', None, {}], List[Any]),
+    ([[1], [2, 3]], List[list]),
+    ([[1], {}], List[list]),
+    ([1, 2], dict),
+    ('string', str),
+    (None, Optional[Event]),
+    ({'events': [{'name': 'a', 'time': 1.0, 'tags': []}], 'partial': {'name': 'x'}}, Dict[str, Union[List[Event], Partial]]),
+]
+
+
+def stream(value: Any) -> io.BytesIO:
+    return io.BytesIO(json.dumps(value, ensure_ascii=False).encode())
+
+
+class TestStream(TestCase):
+
+    def test_same_verdicts(self):
+        for value, value_type in DOCS:
+            for chunk_size in (1, 3, 65536):
+                with self.subTest(value=value, type=value_type, chunk_size=chunk_size):
+                    self.assertEqual(
+                        check_stream(stream(value), value_type, chunk_size)[0],
+                        is_type(value, value_type),
+                    )
+
+    def test_tokens(self):
+        text = '{"a": [1, -2.5e3, true, false, null, "x\\u0041"]}'
+        for chunk_size in (1, 2, 100):
+            self.assertEqual(
+                [value for kind, value in tokenize(io.StringIO(text), chunk_size) if kind == 'value'],
+                ['a', 1, -2500.0, True, False, None, 'xA'],
+            )
+
+    def test_message(self):
+        ok, msg = check_stream(stream([{'name': 'a', 'time': 1.5, 'tags': ['x', 2]}]), List[Event])
+        self.assertFalse(ok)
+        self.assertIn('"/0/tags/1"', str(msg))
+        ok, msg = check_stream(stream({'a': 1}), List[Event])
+        self.assertFalse(ok)
+        self.assertTrue(str(msg).endswith(' at ""'), msg)
+        ok, msg = check_stream(stream({'a/b': {'~': 'x'}}), Dict[str, Dict[str, int]])
+        self.assertIn('"/a~1b/~0"', str(msg))
+
+    def test_early_stop(self):
+        text = '[{"name": 1}' + ', {"name": "b", "time": 1, "tags": null}' * 10000 + ']'
+        fp = io.StringIO(text)
+        self.assertFalse(check_stream(fp, List[Event], 64)[0])
+        self.assertLess(fp.tell(), 1000)
+
+    def test_malformed(self):
+        self.assertRaises(StreamError, check_stream, io.StringIO('[1, 2'), List[int])
+        self.assertRaises(StreamError, check_stream, io.StringIO('[1 2]'), List[int])
+        self.assertRaises(StreamError, check_stream, io.StringIO('[1] [2]'), List[int])
+        self.assertRaises(StreamError, check_stream, io.StringIO('{1: 2}'), Dict[str, int])
+        self.assertRaises(ValueError, check_stream, io.StringIO('[tru]'), List[bool])
+
+    def test_long_strings(self):
+        text = json.dumps({'k': 'é\U0001F600"\\' * 1000, 'v': 'x' * 100000})
+        for chunk_size in (1, 5, 7, 4096):
+            self.assertEqual(
+                [value for kind, value in tokenize(io.StringIO(text), chunk_size) if kind == 'value'],
+                ['k', json.loads(text)['k'], 'v', 'x' * 100000],
+            )
+        fp = io.BytesIO(b'["bad \\x escape' + b'y' * 1000000 + b'"]')
+        self.assertRaises(StreamError, check_stream, fp, List[str], 4096)
+        self.assertLess(fp.tell(), 10000)
+        self.assertRaises(StreamError, check_stream, io.StringIO('["' + 'y' * 100000), List[str], 16)
+
+    def test_iter(self):
+        events = [{'name': str(i), 'time': float(i), 'tags': None} for i in range(100)]
+        self.assertEqual(list(iter_stream(stream(events), List[Event], 7)), events)
+        items = iter_stream(stream([1, 2, 'x', 4]), List[int])
+        self.assertEqual(next(items), 1)
+        self.assertEqual(next(items), 2)
+        self.assertRaises(TypeError, next, items)
+        self.assertRaises(TypeError, list, iter_stream(stream({}), List[int]))
@@ -18,10 +18,13 @@ from typing import (
     Generic,
     TypeVar,
     TypedDict,
+    Literal,
 )
 from unittest import TestCase
 
-from rtc import is_subtype
+from rtc import SubtypeRegistry, is_subtype
+from rtc.subtype import SUBTYPE_CACHE
+from rtc.tools import LRUCache
 
 
 class TestSubType(TestCase):
@@ -317,3 +320,84 @@ class TestSubType(TestCase):
         self.assertTrue(is_subtype(Dict[str, Union[int, str]], A))
         self.assertTrue(is_subtype(Dict[str, Union[int, str]], B))
         self.assertFalse(is_subtype(Dict[str, Union[int, str, None]], B))
+
+    def test_literal(self):
+        self.assertTrue(is_subtype(Literal['a'], str))
+        self.assertTrue(is_subtype(Literal['a', 'b'], Optional[str]))
+        self.assertTrue(is_subtype(Literal['a', 7], Union[int, str]))
+        self.assertTrue(is_subtype(Literal['a', 7], Union[Literal['a'], int]))
+        self.assertTrue(is_subtype(Literal['a'], Literal['a', 'b']))
+        self.assertTrue(is_subtype(Literal['a'], Any))
+        self.assertTrue(is_subtype(Union[Literal['a'], Literal['b']], Literal['a', 'b']))
+        self.assertFalse(is_subtype(Literal['a', 'c'], Literal['a', 'b']))
+        self.assertFalse(is_subtype(Literal['a', 7], str))
+        self.assertFalse(is_subtype(Literal[7], Literal['7', 8]))
+        self.assertFalse(is_subtype(str, Literal['a']))
+        self.assertTrue(is_subtype(List[Literal['a']], List[str]))
+
+    def test_cache(self):
+        is_subtype.cache_clear()
+        self.assertTrue(is_subtype(List[bool], List[int]))
+        info = is_subtype.cache_info()
+        self.assertEqual(info.hits, 0)
+        self.assertGreater(info.misses, 0)
+        self.assertTrue(is_subtype(List[bool], List[int]))
+        self.assertEqual(is_subtype.cache_info().hits, 1)
+        is_subtype.cache_clear()
+        self.assertEqual(is_subtype.cache_info().currsize, 0)
+
+    def test_cache_unhashable(self):
+        self.assertFalse(is_subtype([int], [int, str]))
+        self.assertTrue(is_subtype([int], [int]))
+
+    def test_no_mutation(self):
+        args = Union[int, None].__args__
+        self.assertTrue(is_subtype(Optional[int], Union[int, None]))
+        self.assertIs(Union[int, None].__args__, args)
+
+    def test_lru(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.cache_info(), (2, 1, 2, 2))
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(SUBTYPE_CACHE.maxsize)
+
+
+class TestSubtypeRegistry(TestCase):
+
+    def test_relation(self):
+        class Event(TypedDict):
+            name: str
+
+        class Login(TypedDict):
+            name: str
+            user: str
+
+        registry = SubtypeRegistry([Event, Dict[str, str], bool])
+        registry.add(Login, int, bool)
+        self.assertEqual(list(registry), [Event, Dict[str, str], bool, Login, int])
+        self.assertEqual(len(registry), 5)
+        pairs = [(a, b) for a in registry for b in registry]
+        self.assertEqual([registry.is_subtype(a, b) for a, b in pairs], [is_subtype(a, b) for a, b in pairs])
+        self.assertTrue(registry.is_subtype(Login, Event))
+        self.assertFalse(registry.is_subtype(Event, Login))
+        self.assertEqual(registry.supertypes(bool), [int])
+        self.assertEqual(registry.subtypes(int), [bool])
+        self.assertIn(Event, registry.supertypes(Login))
+        self.assertNotIn(Login, registry.supertypes(Login))
+
+    def test_not_registered(self):
+        registry = SubtypeRegistry([List[int]])
+        self.assertIn(List[int], registry)
+        self.assertNotIn(List[str], registry)
+        self.assertNotIn([int], registry)
+        self.assertTrue(registry.is_subtype(List[bool], List[int]))
+        self.assertFalse(registry.is_subtype(List[int], List[str]))
+        with self.assertRaises(KeyError):
+            registry.supertypes(List[str])
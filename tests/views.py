@@ -0,0 +1,103 @@
+import copy
+import pickle
+from typing import Dict, List, Optional, TypedDict
+from unittest import TestCase
+
+from rtc import CheckedDict, CheckedList, checked, is_type
+
+
+class Session(TypedDict):
+    user: str
+    ttl: int
+
+
+class Extra(TypedDict, total=False):
+    note: Optional[str]
+
+
+class TestViews(TestCase):
+
+    def test_list(self):
+        ids = CheckedList(List[int], [1, 2])
+        ids.append(3)
+        ids.insert(0, 0)
+        ids.extend(i for i in range(4, 6))
+        ids += [6]
+        ids[0] = 10
+        ids[1:3] = [11, 12]
+        self.assertEqual(ids, [10, 11, 12, 3, 4, 5, 6])
+        self.assertTrue(is_type(ids, List[int]))
+        self.assertRaises(TypeError, ids.append, '7')
+        self.assertRaises(TypeError, ids.insert, 0, None)
+        self.assertRaises(TypeError, ids.extend, [7, '8'])
+        with self.assertRaises(TypeError):
+            ids += ['8']
+        with self.assertRaises(TypeError):
+            ids[0] = 1.5
+        with self.assertRaises(TypeError):
+            ids[0:1] = iter(['1'])
+        self.assertEqual(ids, [10, 11, 12, 3, 4, 5, 6])
+        self.assertRaises(TypeError, CheckedList, List[int], [1, '2'])
+        self.assertRaises(TypeError, CheckedList, Dict[str, int], [])
+        anything = CheckedList(List, [1])
+        anything.append('a')
+        self.assertEqual(anything, [1, 'a'])
+
+    def test_dict(self):
+        registry = checked({'a': [1]}, Dict[str, List[int]])
+        registry['b'] = [2]
+        registry.update({'c': []}, d=[4])
+        registry |= {'e': [5]}
+        registry.setdefault('f', [])
+        self.assertEqual(len(registry), 6)
+        del registry['a']
+        with self.assertRaises(TypeError):
+            registry[1] = [1]
+        with self.assertRaises(TypeError) as e:
+            registry['g'] = ['1']
+        self.assertIn('value for key "g"', str(e.exception))
+        self.assertRaises(TypeError, registry.update, {'h': [1], 'i': None})
+        self.assertNotIn('h', registry)
+        self.assertRaises(TypeError, registry.setdefault, 'j')
+        self.assertEqual(registry.setdefault('b'), [2])
+        self.assertRaises(TypeError, checked, {'a': 1}, Dict[str, str])
+
+    def test_typeddict(self):
+        state = CheckedDict(Session, user='root', ttl=60)
+        state['ttl'] = 120
+        self.assertTrue(is_type(state, Session))
+        with self.assertRaises(TypeError) as e:
+            state['ttl'] = '120'
+        self.assertIn('TypedDict["ttl"]', str(e.exception))
+        self.assertRaises(TypeError, state.__setitem__, 'other', 1)
+        self.assertRaises(TypeError, state.pop, 'ttl')
+        self.assertRaises(TypeError, state.__delitem__, 'user')
+        self.assertRaises(TypeError, state.popitem)
+        self.assertRaises(TypeError, state.clear)
+        self.assertEqual(state.pop('other', None), None)
+        self.assertEqual(state, {'user': 'root', 'ttl': 120})
+        self.assertRaises(TypeError, CheckedDict, Session, user='root')
+
+        extra = CheckedDict(Extra)
+        extra['note'] = None
+        extra['unknown'] = object()
+        self.assertRaises(TypeError, extra.__setitem__, 'note', 1)
+        extra.clear()
+        self.assertEqual(extra, {})
+
+    def test_pickle(self):
+        ids = CheckedList(List[int], [1, 2])
+        state = CheckedDict(Session, user='root', ttl=60)
+        registry = CheckedDict(Dict[str, List[int]], {'a': [1]})
+        for value in (ids, state, registry):
+            for restored in (pickle.loads(pickle.dumps(value)), copy.deepcopy(value), copy.copy(value)):
+                self.assertIs(type(restored), type(value))
+                self.assertEqual(restored, value)
+                self.assertEqual(restored.type, value.type)
+        restored = pickle.loads(pickle.dumps(ids))
+        restored.append(3)
+        self.assertRaises(TypeError, restored.append, '4')
+        restored = copy.deepcopy(state)
+        self.assertRaises(TypeError, restored.__setitem__, 'ttl', '1')
+        self.assertRaises(TypeError, restored.pop, 'user')
+        self.assertIsNot(copy.deepcopy(registry)['a'], registry['a'])